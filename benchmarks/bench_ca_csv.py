@@ -0,0 +1,93 @@
+import argparse
+import csv
+import functools
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "executiveOrderScrapers"))
+
+COLUMNS = ["Executive Order Number", "Last Name", "Type", "Date Signed", "Date Filed", "Link"] + [f"Tag {i}" for i in range(1, 15)]
+
+"""
+writes a synthetic export shaped like the CA library CSV, with a mix of order types and tag counts
+"""
+def write_synthetic_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            tags = [f"Topic {(i + j) % 250}" for j in range(i % 15)]
+            writer.writerow([
+                f"{i // 1000}-{i % 1000}", "Newsom", "Executive Order" if i % 5 else "Proclamation",
+                "1/1/2020", "1/2/2020", f"https://www.library.ca.gov/wp-content/uploads/eo/{i}.pdf",
+            ] + tags + [""] * (14 - len(tags)))
+
+"""
+child process: runs one pipeline variant against csv_url and prints elapsed time and peak RSS
+"""
+def run_mode(mode, csv_url, output_file):
+    import ca_EOs
+
+    start = time.perf_counter()
+    if mode == "stream":
+        sink = ca_EOs.JsonLinesSink(f"{output_file}l", resume=False)
+        for order in ca_EOs.stream_executive_orders(csv_url):
+            sink.write(order)
+        sink.finish(output_file)
+    else: # the original path: whole body in memory, full list, one json.dump
+        ca_EOs.save_to_json(ca_EOs.extract_executive_orders(ca_EOs.download_csv(csv_url)), output_file)
+    elapsed = time.perf_counter() - start
+
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # ru_maxrss is in KB on Linux
+    print(json.dumps({"seconds": elapsed, "max_rss_mb": max_rss_mb}))
+
+def measure(mode, csv_url, output_file):
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", mode, csv_url, output_file],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+"""
+compares peak memory of the in-memory CA pipeline with the streaming one on growing
+synthetic exports; the streaming path should stay flat as the row count grows
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CA CSV ingestion memory use")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-baseline", action="store_true", help="only run the streaming path")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_mode(*args.child)
+        return
+
+    workdir = tempfile.mkdtemp()
+    handler = type("QuietHandler", (SimpleHTTPRequestHandler,), {"log_message": lambda *args: None})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(handler, directory=workdir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    modes = ["stream"] if args.skip_baseline else ["in-memory", "stream"]
+    print(f"{'rows':>10}{'csv MB':>9}  {'mode':<10}{'secs':>8}{'peak RSS MB':>13}")
+    try:
+        for rows in args.rows:
+            csv_name = f"eo_{rows}.csv"
+            write_synthetic_csv(os.path.join(workdir, csv_name), rows)
+            csv_mb = os.path.getsize(os.path.join(workdir, csv_name)) / 1e6
+            csv_url = f"http://127.0.0.1:{server.server_address[1]}/{csv_name}"
+            for mode in modes:
+                result = measure(mode, csv_url, os.path.join(workdir, f"out_{mode}_{rows}.json"))
+                print(f"{rows:>10}{csv_mb:>9.1f}  {mode:<10}{result['seconds']:>8.2f}{result['max_rss_mb']:>13.1f}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
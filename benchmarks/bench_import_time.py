@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENT_SCRAPER = os.path.join(REPO_ROOT, "documentScraper")
+RUNS = 5  # fresh interpreters per module; the median is reported
+
+# module -> (heavy modules it must not load at import time, import budget in ms)
+# budgets are a few times today's timings, so only real regressions trip them
+CHECKS = {
+    "main": (("openai", "dotenv", "playwright", "requests"), 60),
+    "search": (("openai", "dotenv", "playwright"), 400),
+    "downloader": (("openai", "dotenv", "playwright"), 400),
+    "render_service": (("playwright",), 250),
+    "classify_documents": (("pypdf", "openai", "playwright"), 250),
+    "url_validator": (("openai", "dotenv", "playwright"), 400),
+}
+
+"""
+imports one module in a fresh interpreter with -X importtime; returns its cumulative
+import time in ms and which of the heavy modules ended up loaded
+"""
+def measure_import(module, heavy):
+    # the module goes first, so modules it shares with the check itself count towards it
+    code = f"import {module}, json, sys; print(json.dumps([name for name in sys.argv[1:] if name in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *heavy],
+        cwd=DOCUMENT_SCRAPER, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"import {module} failed: {(result.stderr.strip().splitlines() or ['no output'])[-1]}")
+    cumulative_us = next(
+        int(line.split("|")[1]) for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[-1].strip() == module
+    )
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return cumulative_us / 1000, loaded
+
+"""
+guards documentScraper's startup cost: imports every entry point module in fresh
+interpreters, reports the median import time, and fails (exit 1) when a module
+pulls in a heavy dependency (openai, Playwright, ...) at import time or takes
+longer than its budget
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Check documentScraper import times and lazy imports")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply every budget, e.g. on slow machines")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<22}{'median ms':>10}{'budget ms':>11}  heavy modules loaded")
+    for module, (heavy, budget_ms) in CHECKS.items():
+        timings = []
+        loaded = []
+        for _ in range(args.runs):
+            milliseconds, loaded = measure_import(module, heavy)
+            timings.append(milliseconds)
+        median_ms = statistics.median(timings)
+        budget_ms *= args.budget_scale
+        print(f"{module:<22}{median_ms:>10.1f}{budget_ms:>11.0f}  {', '.join(loaded) or '-'}")
+        if loaded:
+            failures.append(f"{module} imports {', '.join(loaded)} at import time")
+        if median_ms > budget_ms:
+            failures.append(f"{module} took {median_ms:.0f} ms to import (budget {budget_ms:.0f} ms)")
+
+    if failures:
+        print("\nImport-time regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll imports within budget.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "legiscanScraper"))
+
+import legiscan_scraper
+from mock_legiscan import build_fixture, start_server
+
+"""
+runs collect_bills against the mock server and returns elapsed wall-clock seconds
+"""
+def time_collect(workers, requests_per_second):
+    start = time.perf_counter()
+    legiscan_scraper.collect_bills("WA", 2025, workers=workers, requests_per_second=requests_per_second)
+    return time.perf_counter() - start
+
+"""
+compares the serial getBill loop with the concurrent token-bucket fetcher
+both modes get the same API budget: the serial loop sleeps 1/rate between calls
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs concurrent LegiScan bill fetching")
+    parser.add_argument("--bills", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server latency per request, seconds")
+    parser.add_argument("--rate", type=float, default=50, help="API budget, requests per second")
+    parser.add_argument("--workers", type=int, default=legiscan_scraper.MAX_WORKERS)
+    args = parser.parse_args()
+
+    server, base_url = start_server(build_fixture(bill_count=args.bills), latency=args.latency)
+    legiscan_scraper.BASE_URL = base_url
+    legiscan_scraper.REQUEST_DELAY = 1 / args.rate
+
+    os.chdir(tempfile.mkdtemp()) # collect_bills writes its output to the working directory
+    try:
+        serial = time_collect(1, args.rate)
+        concurrent = time_collect(args.workers, args.rate)
+    finally:
+        server.shutdown()
+
+    print(f"\n{args.bills} bills, {args.latency * 1000:.0f} ms latency, {args.rate:g} req/s budget")
+    print(f"  serial:              {serial:.2f} s")
+    print(f"  concurrent ({args.workers} workers): {concurrent:.2f} s")
+    print(f"  speedup:             {serial / concurrent:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from scraperCommon.columnar import export_file, import_pyarrow, read_table
+from scraperCommon.policy_index import identify_source
+
+DEFAULT_OUTPUTS = (
+    os.path.join(REPO_ROOT, "executiveOrderScrapers", "downloads", "*.json"),
+    os.path.join(REPO_ROOT, "legiscanScraper", "downloads", "*.json"),
+)
+RUNS = 5  # timed repetitions per measurement; the median is reported
+
+def median_seconds(fn, runs=RUNS):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+def tree_size(path):
+    return sum(os.path.getsize(file) for file in glob.glob(os.path.join(path, "**", "*"), recursive=True) if os.path.isfile(file))
+
+# the question from the analytics jobs: passed bills with amendments in one state. older
+# outputs have no passed field because they only ever held passed bills, so a missing value counts
+def json_query(outputs, state):
+    count = 0
+    for path in outputs:
+        source, path_state = identify_source(path)
+        if source != "legiscan" or path_state != state:
+            continue
+        with open(path) as f:
+            count += sum(1 for bill in json.load(f) if bill.get("passed") is not False and bill.get("amendments"))
+    return count
+
+def columnar_query(dataset_dir, format, state):
+    pc = import_pyarrow().compute
+    table = read_table(dataset_dir, format, columns=["passed", "amendments"], state=state, source="legiscan")
+    matches = pc.and_(pc.fill_null(table["passed"], True), pc.greater(pc.list_value_length(table["amendments"]), 0))
+    return pc.sum(matches).as_py() or 0
+
+def json_load(outputs):
+    rows = 0
+    for path in outputs:
+        with open(path) as f:
+            rows += len(json.load(f))
+    return rows
+
+"""
+compares the scraper outputs as JSON against the same records exported to Parquet
+and Arrow IPC datasets: size on disk, time to load everything, and time to answer
+"how many passed bills have amendments" for one state (a projected, partition-pruned
+read for the columnar formats, a full parse for JSON)
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Parquet/Arrow export against the JSON outputs")
+    parser.add_argument("outputs", nargs="*", help="scraper output JSON files (default: the outputs checked into the repo)")
+    parser.add_argument("--state", default="WA", help="state for the amendments query")
+    args = parser.parse_args()
+
+    outputs = args.outputs or [path for pattern in DEFAULT_OUTPUTS for path in sorted(glob.glob(pattern))]
+    outputs = [path for path in outputs if identify_source(path)[0]]
+    if not outputs:
+        sys.exit("No scraper outputs to benchmark")
+
+    started = time.perf_counter()
+    import_pyarrow()
+    print(f"pyarrow import: {(time.perf_counter() - started) * 1000:.0f} ms (paid once per process)")
+
+    json_size = sum(os.path.getsize(path) for path in outputs)
+    load_seconds, rows = median_seconds(lambda: json_load(outputs))
+    query_seconds, answer = median_seconds(lambda: json_query(outputs, args.state))
+    results = [("json", json_size, load_seconds, rows, query_seconds, answer, None)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for format in ("parquet", "arrow"):
+            dataset_dir = os.path.join(workdir, format)
+            export_seconds, _ = median_seconds(lambda: [export_file(path, dataset_dir, format) for path in outputs], runs=1)
+            load_seconds, table = median_seconds(lambda: read_table(dataset_dir, format))
+            query_seconds, answer = median_seconds(lambda: columnar_query(dataset_dir, format, args.state))
+            results.append((format, tree_size(dataset_dir), load_seconds, table.num_rows, query_seconds, answer, export_seconds))
+
+    print(f"\n{len(outputs)} outputs; query: passed {args.state} bills with amendments\n")
+    print(f"{'format':<10}{'size MB':>9}{'vs JSON':>9}{'load ms':>10}{'rows':>8}{'query ms':>10}{'answer':>8}{'export ms':>11}")
+    for format, size, load_seconds, rows, query_seconds, answer, export_seconds in results:
+        export = f"{export_seconds * 1000:>11.0f}" if export_seconds is not None else f"{'-':>11}"
+        print(
+            f"{format:<10}{size / 1e6:>9.2f}{size / json_size:>8.0%} {load_seconds * 1000:>9.1f}{rows:>8}"
+            f"{query_seconds * 1000:>10.1f}{answer:>8}{export}"
+        )
+
+if __name__ == "__main__":
+    main()
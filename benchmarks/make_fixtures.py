@@ -0,0 +1,165 @@
+import csv
+import html
+import json
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(REPO_ROOT, "benchmarks", "fixtures")
+EO_DOWNLOADS = os.path.join(REPO_ROOT, "executiveOrderScrapers", "downloads")
+LEGISCAN_DOWNLOADS = os.path.join(REPO_ROOT, "legiscanScraper", "downloads")
+
+NY_PAGE_SIZE = 10  # orders per listing page, as on the live site
+LEGISCAN_BILLS = 300  # bills kept from the WA output
+LEGISCAN_SESSION_ID = 2100
+# TX governors on the search form; only the sitting governor has saved orders to rebuild
+TX_GOVERNORS = [("45", "Greg Abbott"), ("44", "Rick Perry"), ("43", "George W. Bush")]
+CA_COLUMNS = ["Type", "Executive Order Number", "Last Name", "Date Signed", "Date Filed", "Link"] + [f"Tag {i}" for i in range(1, 15)]
+SAMPLE_PDF_PAGES = {"small.pdf": 1, "medium.pdf": 10, "large.pdf": 50}
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+def ny_listing_page(orders, page, last_page):
+    rows = []
+    for order in orders:
+        document = f'<div class="content-document"><a href="{html.escape(order["pdf_link"])}">Download</a></div>' if order["pdf_link"] else ""
+        date = f'<div class="date">{html.escape(order["date"])}</div>' if order["date"] else ""
+        rows.append(
+            f'<div class="views-row"><h3 class="content-title"><a href="/news/order-{page}">{html.escape(order["title"])}</a></h3>'
+            f"{document}{date}</div>"
+        )
+    pager = f'<ul class="pager"><li class="pager__item pager__item--last"><a href="?page={last_page}">Last</a></li></ul>'
+    return f'<html><body><div class="view-content">{"".join(rows)}</div>{pager}</body></html>\n'
+
+def build_ny():
+    orders = load(os.path.join(EO_DOWNLOADS, "ny_executive_orders.json"))
+    pages = [orders[i:i + NY_PAGE_SIZE] for i in range(0, len(orders), NY_PAGE_SIZE)]
+    for page, page_orders in enumerate(pages):
+        write(os.path.join(FIXTURES_DIR, "ny", f"page_{page}.html"), ny_listing_page(page_orders, page, len(pages) - 1))
+    write(os.path.join(FIXTURES_DIR, "ny", "empty.html"), ny_listing_page([], 0, len(pages) - 1))
+    return len(orders)
+
+def tx_result_page(orders):
+    rows = []
+    for order in orders:
+        date, _, session = order["date"].partition("(")
+        href = order["pdf_url"].replace("https://lrl.texas.gov", "")
+        rows.append(
+            f"<tr><td>{html.escape(date)}<br/>({html.escape(session)}</td><td>{html.escape(order['session'])}</td>"
+            f'<td><a href="{html.escape(href)}">{html.escape(order["title"])}</a></td><td>{html.escape(order["author"])}</td>'
+            f"<td>{html.escape(order['type'])}</td><td>{html.escape(order['document_number'])}</td></tr>"
+        )
+    header = "<tr><th>Date</th><th>Session</th><th>Title</th><th>Author</th><th>Type</th><th>Number</th></tr>"
+    return f"<html><body><table>{header}{''.join(rows)}</table></body></html>\n"
+
+def build_tx():
+    orders = load(os.path.join(EO_DOWNLOADS, "tx_executive_orders.json"))
+    options = "".join(f'<option value="{governor_id}">{name}</option>' for governor_id, name in TX_GOVERNORS)
+    write(os.path.join(FIXTURES_DIR, "tx", "search.html"),
+          f'<html><body><form><select name="governorID"><option value="">Any</option>{options}</select></form></body></html>\n')
+    for governor_id, name in TX_GOVERNORS:
+        governor_orders = [order for order in orders if order["author"] == name]
+        page = tx_result_page(governor_orders) if governor_orders else "<html><body><p>No documents found.</p></body></html>\n"
+        write(os.path.join(FIXTURES_DIR, "tx", f"governor_{governor_id}.html"), page)
+    return len(orders)
+
+def build_ca():
+    orders = load(os.path.join(EO_DOWNLOADS, "ca_executive_orders.json"))
+    path = os.path.join(FIXTURES_DIR, "ca", "executive_orders.csv")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CA_COLUMNS)
+        for order in orders:
+            tags = [tag for tag in order["tags"].split(", ") if tag][:14]
+            writer.writerow(
+                ["Executive Order", order["executive_order_number"], order["governor"], order["date_signed"],
+                 order["date_filed"], order["pdf_link"]] + tags + [""] * (14 - len(tags))
+            )
+    write(os.path.join(FIXTURES_DIR, "ca", "page.html"),
+          '<html><body><a href="/ca/download-csv-executive-order.php">Download CSV</a></body></html>\n')
+    return len(orders)
+
+def build_legiscan():
+    records = load(os.path.join(LEGISCAN_DOWNLOADS, "WA_legiscan_documents.json"))[:LEGISCAN_BILLS]
+    session_name = records[0]["session"]
+    bills = {}
+    for i, record in enumerate(records):
+        bill_id = 1_000_000 + i
+        bills[str(bill_id)] = {
+            "bill_id": bill_id,
+            "bill_number": record["bill_number"],
+            "change_hash": f"{bill_id:x}",
+            "session": {"session_id": LEGISCAN_SESSION_ID, "session_name": session_name},
+            "passed": 1, # the outputs only ever held passed bills (and have no "passed" field to copy)
+            "texts": [{"url": url} for url in record["texts"]],
+            "amendments": [{"url": url} for url in record["amendments"]],
+            "supplements": [{"url": url} for url in record["supplements"]],
+        }
+    fixture = {
+        "state": "WA",
+        "sessions": [{"session_id": LEGISCAN_SESSION_ID, "session_name": session_name, "year_start": 2025}],
+        "bills": bills,
+    }
+    write(os.path.join(FIXTURES_DIR, "legiscan", "WA.json"), json.dumps(fixture, indent=1) + "\n")
+    return len(bills)
+
+"""
+writes a minimal valid PDF with one line of text per page
+"""
+def sample_pdf(pages):
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>", 3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for page in range(pages):
+        page_id, content_id = 4 + page * 2, 5 + page * 2
+        text = f"Sample policy document page {page + 1}: artificial intelligence, data privacy and cloud computing."
+        stream = f"BT /F1 11 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R /Resources << /Font << /F1 3 0 R >> >> >>" % content_id
+        )
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        kids.append(b"%d 0 R" % page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offsets[object_id] for object_id in sorted(objects))
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return out
+
+def build_pdfs():
+    os.makedirs(os.path.join(FIXTURES_DIR, "pdfs"), exist_ok=True)
+    for name, pages in SAMPLE_PDF_PAGES.items():
+        with open(os.path.join(FIXTURES_DIR, "pdfs", name), "wb") as f:
+            f.write(sample_pdf(pages))
+    return len(SAMPLE_PDF_PAGES)
+
+"""
+rebuilds the benchmark fixtures from the scraper outputs checked into the repo
+
+each site's pages are regenerated in the markup the scrapers parse (NY listing
+pages, the TX search form and result table, the CA page and CSV export), the
+LegiScan responses come from the saved WA bills, and the sample PDFs are small
+generated documents; run it again after refreshing the outputs
+"""
+def main():
+    print(f"NY: {build_ny()} orders")
+    print(f"TX: {build_tx()} orders")
+    print(f"CA: {build_ca()} orders")
+    print(f"LegiScan: {build_legiscan()} bills")
+    print(f"PDFs: {build_pdfs()} samples")
+    print(f"Fixtures written to {FIXTURES_DIR}")
+
+if __name__ == "__main__":
+    main()
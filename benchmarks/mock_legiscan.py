@@ -0,0 +1,108 @@
+import base64
+import io
+import json
+import threading
+import zipfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+"""
+builds a fake LegiScan state with one session and `bill_count` bills,
+every other bill marked as passed
+"""
+def build_fixture(state="WA", bill_count=200, session_id=2100):
+    session = {"session_id": session_id, "session_name": "2025-2026 Regular Session", "year_start": 2025}
+    bills = {}
+    for i in range(bill_count):
+        bill_id = 1_000_000 + i
+        bill_number = f"HB{1000 + i}"
+        bills[bill_id] = {
+            "bill_id": bill_id,
+            "bill_number": bill_number,
+            "change_hash": f"{bill_id:x}",
+            "session": {"session_id": session_id, "session_name": session["session_name"]},
+            "passed": 1 if i % 2 == 0 else 0,
+            "texts": [{"url": f"https://legiscan.com/{state}/text/{bill_number}/id/{3_000_000 + i}"}],
+            "amendments": [],
+            "supplements": [],
+        }
+    return {"state": state, "sessions": [session], "bills": bills}
+
+"""
+packs the fixture bills into a LegiScan-style dataset ZIP (<STATE>/<session>/bill/<number>.json)
+"""
+def build_dataset_archive(fixture):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for bill in fixture["bills"].values():
+            folder = bill["session"]["session_name"].replace(" ", "_")
+            archive.writestr(f"{fixture['state']}/{folder}/bill/{bill['bill_number']}.json", json.dumps({"bill": bill}))
+    return buffer.getvalue()
+
+"""
+reads a recorded fixture (e.g. benchmarks/fixtures/legiscan/WA.json); JSON object keys are
+strings, so bill ids are turned back into ints
+"""
+def load_fixture(path):
+    with open(path) as f:
+        fixture = json.load(f)
+    fixture["bills"] = {int(bill_id): bill for bill_id, bill in fixture["bills"].items()}
+    return fixture
+
+"""
+answers one getSessionList / getMasterList / getBill / getDatasetList / getDataset call from the fixture
+"""
+def legiscan_response(fixture, params):
+    op = params.get("op")
+    if op == "getSessionList":
+        return {"status": "OK", "sessions": fixture["sessions"]}
+    if op == "getMasterList":
+        masterlist = {"session": fixture["sessions"][0]}
+        for i, bill in enumerate(fixture["bills"].values()):
+            masterlist[str(i)] = {
+                "bill_id": bill["bill_id"],
+                "number": bill["bill_number"],
+                "change_hash": bill["change_hash"],
+            }
+        return {"status": "OK", "masterlist": masterlist}
+    if op == "getBill":
+        bill = fixture["bills"].get(int(params.get("id", 0)))
+        return {"status": "OK", "bill": bill} if bill else {"status": "ERROR", "alert": {"message": "Unknown bill"}}
+    if op == "getDatasetList":
+        datasets = [dict(s, dataset_hash="fixture", access_key="fixture") for s in fixture["sessions"]]
+        return {"status": "OK", "datasetlist": datasets}
+    if op == "getDataset":
+        archive = base64.b64encode(build_dataset_archive(fixture)).decode()
+        return {"status": "OK", "dataset": {"session_id": int(params.get("id", 0)), "mime_type": "application/zip", "zip": archive}}
+    return {"status": "ERROR", "alert": {"message": f"Unknown op {op}"}}
+
+"""
+serves legiscan_response over HTTP, sleeping `latency` seconds per request
+to stand in for network round trips
+"""
+def make_handler(fixture, latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            time.sleep(latency)
+
+            payload = json.dumps(legiscan_response(fixture, params)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass # keep benchmark output readable
+
+    return Handler
+
+"""
+starts the mock server on a background thread and returns (server, base_url)
+"""
+def start_server(fixture, latency=0.05):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(fixture, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
@@ -0,0 +1,134 @@
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from mock_legiscan import legiscan_response, load_fixture
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def read_fixture(*parts):
+    with open(os.path.join(FIXTURES_DIR, *parts), "rb") as f:
+        return f.read()
+
+"""
+builds the route table serving every recorded fixture:
+  /legiscan/?op=...                         LegiScan API (fixtures/legiscan/WA.json)
+  /ny/executiveorders?page=N                NY listing pages, an empty listing past the last one
+  /tx/search.cfm, /tx/searchproc.cfm?...    TX search form and per-governor result tables
+  /ca/page.html, /ca/download-csv-...       CA executive orders page and CSV export
+  /pdfs/<name>-<n>.pdf                      sample PDFs, any <n>, so download URLs are unique
+returns [(path prefix, handler(path, params) -> (status, content type, body))]
+"""
+def fixture_routes():
+    legiscan = load_fixture(os.path.join(FIXTURES_DIR, "legiscan", "WA.json"))
+    pdf_names = sorted(os.listdir(os.path.join(FIXTURES_DIR, "pdfs")))
+
+    def legiscan_route(path, params):
+        return 200, "application/json", json.dumps(legiscan_response(legiscan, params)).encode()
+
+    def ny_route(path, params):
+        page_name = f"page_{int(params.get('page', 0))}.html"
+        if not os.path.exists(os.path.join(FIXTURES_DIR, "ny", page_name)):
+            page_name = "empty.html"
+        return 200, "text/html", read_fixture("ny", page_name)
+
+    def tx_route(path, params):
+        if path.endswith("search.cfm"):
+            return 200, "text/html", read_fixture("tx", "search.html")
+        governor_page = f"governor_{params.get('governorID')}.html"
+        if not os.path.exists(os.path.join(FIXTURES_DIR, "tx", governor_page)):
+            return 404, "text/html", b"not found"
+        return 200, "text/html", read_fixture("tx", governor_page)
+
+    def ca_route(path, params):
+        if path.endswith(".php"):
+            return 200, "text/csv", read_fixture("ca", "executive_orders.csv")
+        return 200, "text/html", read_fixture("ca", "page.html")
+
+    def pdf_route(path, params):
+        name = os.path.basename(path)
+        sample = next((pdf for pdf in pdf_names if name.startswith(pdf[:-len(".pdf")] + "-")), None)
+        if not sample:
+            return 404, "text/plain", b"not found"
+        return 200, "application/pdf", read_fixture("pdfs", sample)
+
+    return [
+        ("/legiscan/", legiscan_route),
+        ("/ny/", ny_route),
+        ("/tx/", tx_route),
+        ("/ca/", ca_route),
+        ("/pdfs/", pdf_route),
+    ]
+
+"""
+local HTTP server for benchmarks: serves a route table with a configurable per-request
+latency (plus uniform jitter) and injects errors into a share of requests, either an
+HTTP error status or a dropped connection; seeded, so runs are repeatable
+"""
+class MockServer:
+    def __init__(self, routes, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=0):
+        self.routes = routes
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def _plan(self):
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            fail = self.random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        return delay, fail
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # keep-alive, like the real sites
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                delay, fail = server._plan()
+                time.sleep(delay)
+
+                if fail and server.error_status is None: # drop the connection without answering
+                    self.close_connection = True
+                    return
+                if fail:
+                    status, content_type, body = server.error_status, "text/plain", b"injected error"
+                else:
+                    route = next((handler for prefix, handler in server.routes if url.path.startswith(prefix)), None)
+                    status, content_type, body = route(url.path, params) if route else (404, "text/plain", b"not found")
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # keep benchmark output readable
+
+        return Handler
+
+    # starts serving on a background thread and returns the base URL
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.make_handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
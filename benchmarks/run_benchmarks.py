@@ -0,0 +1,225 @@
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+SCENARIOS = ("legiscan", "ny_eos", "tx_eos", "ca_eos", "download_pdfs")
+DOWNLOAD_URLS = 120  # distinct PDF URLs in the download_pdfs scenario
+
+for folder in ("legiscanScraper", "executiveOrderScrapers", "documentScraper"):
+    sys.path.insert(0, os.path.join(REPO_ROOT, folder))
+
+"""
+times every HTTP request any requests.Session sends in this process (to the
+response headers, so streamed bodies aren't included) and counts the outcomes
+"""
+def instrument_requests():
+    import requests
+
+    latencies = []
+    outcomes = Counter()
+    send = requests.Session.send
+
+    def timed_send(self, request, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = send(self, request, **kwargs)
+        except requests.RequestException:
+            outcomes["connection error"] += 1
+            raise
+        latencies.append(time.perf_counter() - start)
+        outcomes[response.status_code] += 1
+        return response
+
+    requests.Session.send = timed_send
+    return latencies, outcomes
+
+# each scenario points its scraper at the mock server, runs it in the working directory
+# and returns the number of items (bills, orders, files) it produced
+def bench_legiscan(base_url):
+    import legiscan_scraper
+
+    legiscan_scraper.BASE_URL = f"{base_url}/legiscan/"
+    summary = legiscan_scraper.collect_bills("WA", 2025, workers=legiscan_scraper.MAX_WORKERS, requests_per_second=1000)
+    if not summary["documents"]: # bills that aren't passed are dropped, which would leave extraction unmeasured
+        raise RuntimeError("no documents saved; are the fixture bills marked passed?")
+    return summary["bills_fetched"]
+
+def bench_ny_eos(base_url):
+    import ny_EOs
+
+    ny_EOs.CURRENT_PAGE = f"{base_url}/ny/executiveorders"
+    ny_EOs.scrape_current_orders_http("ny_executive_orders.json", full_refresh=True)
+    return count_records("ny_executive_orders.json")
+
+def bench_tx_eos(base_url):
+    import tx_EOs
+
+    tx_EOs.SEARCH_FORM_URL = f"{base_url}/tx/search.cfm"
+    tx_EOs.SEARCH_URL = f"{base_url}/tx/searchproc.cfm?govdoctypeID=5&governorID={{governor_id}}"
+    tx_EOs.run("tx_executive_orders.json", full_refresh=True)
+    return count_records("tx_executive_orders.json")
+
+def bench_ca_eos(base_url):
+    import ca_EOs
+
+    ca_EOs.BASE_URL = base_url
+    ca_EOs.PAGE_URL = f"{base_url}/ca/page.html"
+    ca_EOs.run_pipeline(output_file="ca_executive_orders.json", full_refresh=True)
+    return count_records("ca_executive_orders.json")
+
+def bench_download_pdfs(base_url):
+    import downloader
+
+    samples = ("small", "medium", "large")
+    urls = [f"{base_url}/pdfs/{samples[i % len(samples)]}-{i}.pdf" for i in range(DOWNLOAD_URLS)]
+    downloader.download_pdfs(urls, output_dir="downloads")
+    return len(glob.glob(os.path.join("downloads", "*.pdf")))
+
+def count_records(path):
+    with open(path) as f:
+        return len(json.load(f))
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+"""
+child process: runs one scenario against the mock server and prints its metrics as
+the last line of output; a fresh process per scenario keeps peak RSS honest
+"""
+def run_child(scenario, base_url):
+    latencies, outcomes = instrument_requests()
+    os.chdir(tempfile.mkdtemp())
+
+    start = time.perf_counter()
+    error = None
+    try:
+        items = globals()[f"bench_{scenario}"](base_url)
+    except Exception as e:
+        items = 0
+        error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "seconds": round(elapsed, 4),
+        "items": items,
+        "items_per_second": round(items / elapsed, 2) if elapsed else None,
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "responses": {str(status): count for status, count in outcomes.items()},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1), # KB on Linux
+        "error": error,
+    }))
+
+def measure(scenario, base_url):
+    env = dict(os.environ)
+    for name in ("SCRAPER_CACHE_DIR", "SCRAPER_CACHE_MODE"): # always measure the network path
+        env.pop(name, None)
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", scenario, base_url],
+        capture_output=True, text=True, env=env,
+    )
+    lines = result.stdout.strip().splitlines()
+    try:
+        return json.loads(lines[-1])
+    except (IndexError, ValueError):
+        return {"error": (result.stderr.strip().splitlines() or ["no output"])[-1]}
+
+# the most recent stored run, to compare against
+def latest_results():
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    if not paths:
+        return None, None
+    with open(paths[-1]) as f:
+        return paths[-1], json.load(f)
+
+def change(current, previous):
+    if current is None or not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+def print_report(results, previous):
+    print(f"\n{'scenario':<15}{'secs':>8}{'items/s':>10}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'RSS MB':>9}  vs last (secs / RSS)")
+    for scenario, metrics in results.items():
+        if metrics.get("error") and not metrics.get("items"):
+            print(f"{scenario:<15}  failed: {metrics['error']}")
+            continue
+        before = (previous or {}).get(scenario) or {}
+        p50 = metrics["p50_ms"] if metrics["p50_ms"] is not None else float("nan")
+        p95 = metrics["p95_ms"] if metrics["p95_ms"] is not None else float("nan")
+        print(
+            f"{scenario:<15}{metrics['seconds']:>8.2f}{metrics['items_per_second']:>10.1f}{metrics['requests_per_second']:>9.1f}"
+            f"{p50:>9.1f}{p95:>9.1f}{metrics['peak_rss_mb']:>9.1f}"
+            f"  {change(metrics['seconds'], before.get('seconds')):>5} / {change(metrics['peak_rss_mb'], before.get('peak_rss_mb'))}"
+        )
+        errors = {status: count for status, count in metrics["responses"].items() if not status.startswith("2")}
+        if errors or metrics.get("error"):
+            print(f"{'':<15}errors: {errors} {metrics.get('error') or ''}")
+
+"""
+benchmarks the LegiScan collector, the NY/TX/CA executive order scrapers and
+download_pdfs against a local mock server replaying the recorded fixtures, with
+configurable latency and error injection; reports wall time, throughput, p50/p95
+request latency and peak RSS per scenario, stores the run under benchmarks/results
+and compares it with the previous stored run
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every scraper against local mock servers")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help=f"any of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock latency per request, seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra uniform random latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=503, help="status for injected errors; 0 drops the connection")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-save", action="store_true", help="don't store this run under benchmarks/results")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    from mock_server import MockServer, fixture_routes
+
+    server = MockServer(fixture_routes(), args.latency, args.jitter, args.error_rate, args.error_status or None, args.seed)
+    base_url = server.start()
+    config = {key: getattr(args, key) for key in ("latency", "jitter", "error_rate", "error_status", "seed")}
+    print(f"Mock server at {base_url} ({config})")
+
+    results = {}
+    try:
+        for scenario in args.scenarios:
+            print(f"Running {scenario}...")
+            results[scenario] = measure(scenario, base_url)
+    finally:
+        server.stop()
+
+    previous_path, previous = latest_results()
+    print_report(results, previous["results"] if previous and previous["config"] == config else None)
+    if previous and previous["config"] != config:
+        print(f"\n(last stored run {os.path.basename(previous_path)} used a different configuration; not compared)")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w") as f:
+            json.dump({"timestamp": datetime.now().isoformat(timespec="seconds"), "config": config, "results": results}, f, indent=2)
+        print(f"\nSaved results to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# keyword mapping for each category, used to guide document search prompts
+# and to classify downloaded documents locally
+KEYWORD_CATEGORIES = {
+    "Infrastructure": [
+        "Artificial Intelligence", "GenAI", "AI infrastructure", "cloud computing", "data centers",
+        "edge computing", "AI accelerators", "GPU", "high-performance computing", "storage infrastructure",
+        "distributed systems", "scalability", "cybersecurity", "data privacy",
+        "Secure Identity and Access Management", "Data Governance", "Wireless infrastructure",
+        "modernization", "energy infrastructure", "critical infrastructure"
+    ],
+    "Environment": [
+        "Artificial Intelligence", "AI", "sustainable AI", "environmental impact", "green computing",
+        "GHG emissions", "carbon footprint", "greenhouse gas emissions", "public disclosure",
+        "transparency", "reporting requirements", "protocol standards", "verification", "responsible AI",
+        "algorithm transparency", "digital sustainability", "corporate emissions", "measurement"
+    ],
+    "Perception": [
+        "Perception", "Artificial Intelligence", "AI", "trust", "fear", "expectations", "attitudes",
+        "acceptance", "public opinion", "ethics", "transparency", "misconceptions"
+    ],
+    "Security": [
+        "Artificial Intelligence", "AI", "Cybersecurity", "Security", "Privacy", "Data privacy",
+        "Risk Assessment", "Risk Management", "Data protection", "Data breach", "Authentication",
+        "Encryption", "Access control", "Anomaly detection", "Malware detection", "Intrusion detection",
+        "Threat intelligence", "Unauthorized access", "Information safeguarding", "Human oversight"
+    ],
+    "Education": [
+        "Artificial Intelligence", "AI", "Education", "AI education", "AI literacy",
+        "professional development", "workforce", "curriculum", "personalized learning",
+        "adaptive learning", "instructional resources", "critical thinking", "STEM",
+        "educational outcomes", "grant programs", "learning pathways", "postsecondary education",
+        "machine learning"
+    ],
+    "Accessibility": [
+        "Artificial Intelligence", "Accessibility", "AI Protections", "Safeguards",
+        "Accountability", "Underrepresented students", "accessibility", "standards",
+        "Web Content Accessibility Guidelines", "compliance", "Digital Divide", "Digital Inclusion",
+        "Equitable AI", "Universal Access", "Affordability", "Technological Literacy",
+        "Broadband access", "Internet connectivity", "Remote regions"
+    ],
+    "Equity and Diversity": [
+        "Artificial Intelligence", "AI", "Equity", "Diversity", "Bias", "Anti-bias Testing",
+        "Algorithmic Fairness", "Inclusion", "Discrimination", "Fairness", "Ethics",
+        "Algorithmic Bias", "Equity in AI", "Diversity and Inclusion", "Protected Characteristic",
+        "Unlawful Discrimination", "Underrepresented Communities", "Bias Mitigation",
+        "Algorithmic Transparency", "Disparate Impact", "Inclusive Design",
+        "Equitable Outcomes", "Ethical AI"
+    ],
+    "Data": [
+        "Artificial Intelligence", "AI", "Data", "Generative AI", "Training Data", "Datasets",
+        "Synthetic Data", "Data Collection", "Data Processing", "Data Quality", "Data Governance",
+        "Data Privacy", "Data Ownership", "Data Sources", "Transparency", "Compliance",
+        "Machine Learning", "Data Accessibility"
+    ]
+}
+
+# plain-English definitions of each category to help GPT understand the prompt context
+CATEGORY_DEFINITIONS = {
+    "Infrastructure": "Infrastructure refers to the physical and digital systems—such as computing power, data centers, broadband networks, and cloud platforms—required to develop, deploy, and scale AI technologies.",
+    "Environment": "Environment includes the ecological and sustainability impacts of AI development and deployment, including emissions, green computing practices, and regulatory transparency.",
+    "Perception": "Perception refers to how the public and stakeholders view and understand AI, including ethical concerns, transparency, and trust.",
+    "Security": "Security addresses the risks and protections related to AI systems, including cybersecurity, data protection, and risk management.",
+    "Education": "Education concerns the development of AI literacy, educational infrastructure, and workforce readiness in AI-related fields.",
+    "Accessibility": "Accessibility addresses ensuring equitable access to AI benefits, compliance with accessibility standards, and inclusion of underrepresented populations.",
+    "Equity and Diversity": "Equity and Diversity involves ensuring that AI systems are fair, inclusive, and free from bias or discrimination.",
+    "Data": "Data refers to the foundations of AI development, including data collection, processing, governance, and transparency."
+}
@@ -0,0 +1,174 @@
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from categories import KEYWORD_CATEGORIES
+from keyword_matcher import CategoryScorer, normalize_text
+from pdf_text import TEXT_CACHE_DIR, cached_text
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.output import write_json_atomic
+
+WORKERS = os.cpu_count() or 1  # extraction is CPU-bound, so one process per core
+INDEX_DB = "text_index.sqlite"
+OUTPUT_FILE = "document_categories.json"
+MIN_SCORE = 0.1  # share of a category's keywords a document needs to be labelled with it
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+# built once per worker process, on its first document
+_scorer = None
+
+"""
+collects the PDFs under the given files / directories (e.g. a download folder or a
+document store root), sorted so runs are repeatable
+"""
+def find_pdfs(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+        else:
+            paths.append(item)
+    return sorted(paths)
+
+"""
+worker: extracts (or loads cached) text for one PDF, scores it against every
+category and counts its terms for the inverted index
+"""
+def analyze(path, cache_dir=TEXT_CACHE_DIR):
+    global _scorer
+    if _scorer is None:
+        _scorer = CategoryScorer(KEYWORD_CATEGORIES)
+    try:
+        sha256, text = cached_text(path, cache_dir)
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+    return {
+        "path": path,
+        "sha256": sha256,
+        "chars": len(text),
+        "categories": _scorer.score(text),
+        "terms": Counter(TOKEN.findall(normalize_text(text))),
+    }
+
+"""
+inverted index over extracted document text, stored in SQLite: one posting per
+(term, document) with the term's frequency; documents are keyed by content hash
+so a document already indexed is skipped on later runs
+"""
+class TextIndex:
+    def __init__(self, path=INDEX_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                sha256 TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                chars INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, sha256)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def has(self, sha256):
+        return self.conn.execute("SELECT 1 FROM documents WHERE sha256 = ?", (sha256,)).fetchone() is not None
+
+    def add(self, sha256, path, chars, terms):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO documents (sha256, path, chars) VALUES (?, ?, ?)", (sha256, path, chars))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO postings (term, sha256, tf) VALUES (?, ?, ?)",
+                ((term, sha256, tf) for term, tf in terms.items()),
+            )
+
+    """
+    returns (sha256, path, total term frequency) for documents containing every word
+    of the query, most frequent first
+    """
+    def search(self, query, limit=20):
+        terms = sorted(set(TOKEN.findall(normalize_text(query))))
+        if not terms:
+            return []
+        placeholders = ", ".join("?" for _ in terms)
+        return self.conn.execute(
+            f"""
+            SELECT d.sha256, d.path, SUM(p.tf) AS tf
+            FROM postings p JOIN documents d ON d.sha256 = p.sha256
+            WHERE p.term IN ({placeholders})
+            GROUP BY p.sha256
+            HAVING COUNT(*) = ?
+            ORDER BY tf DESC
+            LIMIT ?
+            """,
+            (*terms, len(terms), limit),
+        ).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+"""
+extracts text from every PDF on a process pool, indexes it and classifies it against
+all keyword categories; writes one record per document (scores, keyword hits, labels)
+"""
+def classify(inputs, workers=WORKERS, cache_dir=TEXT_CACHE_DIR, index_path=INDEX_DB, output_file=OUTPUT_FILE,
+             min_score=MIN_SCORE):
+    paths = find_pdfs(inputs)
+    print(f"Classifying {len(paths)} PDFs on {workers} processes.")
+
+    index = TextIndex(index_path)
+    results = []
+    failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(paths) // (workers * 8))
+            for result in executor.map(analyze, paths, [cache_dir] * len(paths), chunksize=chunksize):
+                if "error" in result:
+                    failed += 1
+                    print(f"Could not extract text from {result['path']}: {result['error']}")
+                    continue
+                terms = result.pop("terms")
+                if not index.has(result["sha256"]):
+                    index.add(result["sha256"], result["path"], result["chars"], terms)
+                ranked = sorted(result["categories"].items(), key=lambda item: item[1]["score"], reverse=True)
+                result["labels"] = [category for category, scored in ranked if scored["score"] >= min_score]
+                results.append(result)
+    finally:
+        index.close()
+
+    write_json_atomic(output_file, results)
+    print(f"Saved {len(results)} classified documents to {output_file} ({failed} failed)")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract, index and classify downloaded PDFs by keyword category.")
+    parser.add_argument("inputs", nargs="*", help="PDF files or directories, e.g. downloads or document_store")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="extraction processes")
+    parser.add_argument("--cache", default=TEXT_CACHE_DIR, help="extracted text cache directory")
+    parser.add_argument("--index", default=INDEX_DB, help="inverted index database")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="classification output JSON")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE, help="label threshold (share of keywords found)")
+    parser.add_argument("--search", help="print the documents containing every word of this query and exit")
+    args = parser.parse_args()
+
+    if args.search:
+        index = TextIndex(args.index)
+        for sha256, path, tf in index.search(args.search):
+            print(f"{tf:6d}  {sha256[:12]}  {path}")
+        index.close()
+        return
+
+    classify(args.inputs, args.workers, args.cache, args.index, args.output, args.min_score)
+
+if __name__ == "__main__":
+    main()
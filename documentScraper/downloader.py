@@ -1,69 +1,185 @@
+import hashlib
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from playwright.sync_api import sync_playwright
+
+import render_service
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.http import make_session, HostLimiter, BROWSER_HEADERS
+from scraperCommon.metrics import count, host_of, timed
 
 # headers used for HTTP requests to mimic a browser and avoid bot blocking
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                  "AppleWebKit/537.36 (KHTML, like Gecko) "
-                  "Chrome/115.0.0.0 Safari/537.36",
-    "Accept-Language": "en-US,en;q=0.9",
-    "Accept": "text/html,application/pdf,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-    "Referer": "https://www.google.com/"
-}
+HEADERS = BROWSER_HEADERS
+
+MAX_WORKERS = 8  # concurrent direct downloads
+PER_HOST_LIMIT = 2  # concurrent downloads against any single host
+CHUNK_SIZE = 64 * 1024  # bytes written to disk per chunk
+MAX_RETRIES = 3  # attempts per file, each resuming from the partial download
+REQUEST_TIMEOUT = 30  # seconds to wait for connect / between bytes
 
 """
-renders a webpage using a headless browser and saves it as a PDF 
-used when the URL points to a webpage, not a direct PDF
+streams a file to disk in chunks through a .part file, resuming a partial
+download with an HTTP Range request; returns True once the file is complete
+with a document store, the GET is conditional on the stored ETag / Last-Modified
+and the finished file is moved into the store instead of output_path
+call collects the metrics fields: bytes received, retries and the outcome
 """
-def save_page_as_pdf(playwright, url, output_path):
-    browser = playwright.chromium.launch(headless=True)
-    page = browser.new_page()
-    try:
-        print(f"Loading page for PDF rendering: {url}")
-        page.goto(url, wait_until='networkidle')
-        page.pdf(path=output_path, format="A4")
-        print(f"Saved PDF: {output_path}")
-    except Exception as e:
-        print(f"Failed to save PDF for {url}: {e}")
-    finally:
-        browser.close()
+def fetch_file(session, host_limiter, url, output_path, store, call):
+    part_path = store.partial_path(url) if store else f"{output_path}.part"
+    conditional = store.conditional_headers(url) if store else {}
+    validators = {}
+    call.update(bytes=0, retries=0)
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else conditional
+        try:
+            with host_limiter.limit(url):
+                with session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    if response.status_code == 304: # the stored copy is still current
+                        call["result"] = "unchanged"
+                        store.mark_unchanged(url)
+                        print(f"Unchanged: {url}")
+                        return True
+                    if response.status_code == 416: # the partial file already holds every byte
+                        break
+                    if response.status_code not in (200, 206):
+                        call["status"] = response.status_code
+                        print(f"Failed to download {url} - Status code: {response.status_code}")
+                        return False
+
+                    validators = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "content_type": response.headers.get("Content-Type"),
+                    }
+                    # servers that ignore Range answer 200 with the full body, so start over
+                    mode = "ab" if response.status_code == 206 else "wb"
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+                            call["bytes"] += len(chunk)
+            break
+        except requests.RequestException as e:
+            print(f"Error downloading {url} (attempt {attempt}/{MAX_RETRIES}): {e}")
+            call["error"] = type(e).__name__
+            if attempt == MAX_RETRIES:
+                return False
+            call["retries"] += 1
+            time.sleep(attempt) # brief backoff before resuming
+
+    if store:
+        sha256 = store.add_file(url, part_path, **validators)
+        print(f"Stored: {url} -> {sha256[:12]}")
+        return True
+
+    os.replace(part_path, output_path)
+    print(f"Downloaded: {output_path}")
+    return True
+
+"""
+downloads one file with fetch_file, timing it and recording bytes, retries and the outcome
+"""
+def download_file(session, host_limiter, url, output_path, store=None):
+    host = host_of(url)
+    with timed("document_download", host=host) as call:
+        ok = fetch_file(session, host_limiter, url, output_path, store, call)
+        call.setdefault("result", "ok" if ok else "failed")
+    count("document_download_bytes_total", call["bytes"], host=host)
+    if call["retries"]:
+        count("document_download_retries_total", call["retries"], host=host)
+    return ok
+
+"""
+renders (url, output_path, source_url) jobs as PDFs on the pooled render service
+used when the URL points to a webpage, not a direct PDF; with a document store the
+render goes to a temporary file that is then stored under source_url
+"""
+def render_pages(render_jobs, store=None, pool_size=render_service.RENDER_POOL_SIZE):
+    jobs = [(url, store.partial_path(source_url) if store else output_path) for url, output_path, source_url in render_jobs]
+    results = render_service.render_pages(jobs, pool_size=pool_size)
+
+    if store:
+        for (_, _, source_url), (_, tmp_path), ok in zip(render_jobs, jobs, results):
+            if ok and os.path.exists(tmp_path):
+                store.add_file(source_url, tmp_path, content_type="application/pdf")
+
+"""
+renders one document page with a long-lived render_service.BackgroundRenderer, for
+callers that handle one URL at a time; stores it like render_pages; returns True on success
+"""
+def render_document(renderer, url, output_path, store=None):
+    target_path = store.partial_path(url) if store else output_path
+    ok = renderer.render(page_url(url), target_path)
+    if ok and store and os.path.exists(target_path):
+        store.add_file(url, target_path, content_type="application/pdf")
+    return ok
+
+# the page to render for a document URL: NY Senate adds /download to URLs that should be rendered instead
+def page_url(url):
+    if "nysenate.gov" in url and url.endswith("/download"):
+        return url[:-len("/download")]
+    return url
+
+# local file name for a URL: the last part of its path plus a short hash of the whole URL,
+# as a .pdf; basenames like EO.pdf or download repeat across sites, so they alone would collide
+def output_filename(url):
+    filename = url.rstrip('/').split('/')[-1]
+    if filename.lower().endswith(".pdf"):
+        filename = filename[:-len(".pdf")]
+    return f"{filename}_{hashlib.sha1(url.encode()).hexdigest()[:10]}.pdf"
 
 """
 downloads a list of URLs to the specified output directory
 handles direct PDF links, NY Senate workaround, and HTML pages to be rendered as PDFs
+direct PDFs are streamed on a bounded worker pool (with a per-host limit) while the
+main thread renders HTML pages concurrently on a warm browser pool; files already on disk are skipped
+(each URL has its own file name, see output_filename, so same-named documents never collide)
+with a DocumentStore, files are kept by content hash instead of by URL filename: direct
+PDFs are re-fetched with conditional GETs and pages already rendered are not rendered again
+kinds ({url: "pdf" | "html"}, e.g. from url_validator.route) overrides guessing from the
+URL, so PDFs served without a .pdf suffix are streamed and .pdf links to web pages rendered
 """
-def download_pdfs(urls, output_dir="downloads"):
+def download_pdfs(urls, output_dir="downloads", workers=MAX_WORKERS, per_host=PER_HOST_LIMIT, store=None,
+                  render_pool_size=render_service.RENDER_POOL_SIZE, kinds=None):
     os.makedirs(output_dir, exist_ok=True) # ensures the output folder exists
 
-    with sync_playwright() as playwright:
-        for url in urls:
-            print(f"Processing: {url}")
-            filename = url.rstrip('/').split('/')[-1] # extract last part of the URL path
-            if not filename.lower().endswith(".pdf"):
-                filename += ".pdf"
-            output_path = os.path.join(output_dir, filename)
-
-            # special case: NY Senate adds /download to URLs that should be rendered instead
-            if "nysenate.gov" in url and url.endswith("/download"):
-                fixed_url = url[:-len("/download")]
-                print(f"Detected NY Senate /download URL, fixing to: {fixed_url}")
-                save_page_as_pdf(playwright, fixed_url, output_path)
-                continue
-
-            # if it's already a direct PDF link, use requests to download it
-            if url.lower().endswith(".pdf"):
-                try:
-                    response = requests.get(url, headers=HEADERS)
-                    if response.status_code == 200:
-                        with open(output_path, "wb") as f:
-                            f.write(response.content)
-                        print(f"Downloaded: {output_path}")
-                    else:
-                        print(f"Failed to download {url} - Status code: {response.status_code}")
-                except Exception as e:
-                    print(f"Error downloading {url}: {e}")
-                continue
+    direct_jobs = []
+    render_jobs = []
+    for url in dict.fromkeys(urls): # the same URL twice would race on one .part file
+        print(f"Processing: {url}")
+        output_path = os.path.join(output_dir, output_filename(url))
+        kind = (kinds or {}).get(url)
+        is_pdf = kind == "pdf" if kind else url.lower().endswith(".pdf")
+
+        if not store and os.path.exists(output_path):
+            print(f"Already downloaded: {output_path}")
+            continue
+        if store and not is_pdf and store.path_for(url):
+            print(f"Already rendered: {url}")
+            continue
+
+        if is_pdf: # direct PDF link, streamed with requests
+            direct_jobs.append((url, output_path))
+        # special case: NY Senate adds /download to URLs that should be rendered instead
+        elif page_url(url) != url:
+            print(f"Detected NY Senate /download URL, fixing to: {page_url(url)}")
+            render_jobs.append((page_url(url), output_path, url))
+        else: # fallback: render the webpage and save it as a PDF
+            render_jobs.append((url, output_path, url))
+
+    session = make_session(workers, HEADERS)
+    host_limiter = HostLimiter(per_host)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(download_file, session, host_limiter, url, path, store) for url, path in direct_jobs
+        ]
+
+        if render_jobs:
+            render_pages(render_jobs, store, render_pool_size)
 
-            # fallback: render the webpage and save it as a PDF
-            save_page_as_pdf(playwright, url, output_path)
+        for future in futures:
+            future.result()
@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+from downloader import download_pdfs
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.doc_store import DocumentStore
+from scraperCommon.sources import load_document_urls
+
+"""
+downloads every document referenced by scraper outputs (LegiScan text, amendment and
+supplement URLs, executive order pdf_link / pdf_url fields) into the shared document store
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Fetch documents referenced by scraper outputs into the document store")
+    parser.add_argument("outputs", nargs="+", help="scraper output JSON files")
+    parser.add_argument("--store", default="document_store", help="document store directory")
+    args = parser.parse_args()
+
+    urls = load_document_urls(args.outputs)
+    print(f"Found {len(urls)} unique document URLs in {len(args.outputs)} file(s).")
+
+    store = DocumentStore(args.store)
+    try:
+        download_pdfs(urls, store=store)
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from collections import Counter, deque
+
+try:
+    import ahocorasick # pyahocorasick, a C automaton; the pure-Python one below is used without it
+except ImportError:
+    ahocorasick = None
+
+"""
+collapses whitespace and lowercases text so phrases broken across PDF lines still match
+"""
+def normalize_text(text):
+    return " ".join(text.split()).lower()
+
+# a match only counts when it isn't part of a longer word ("AI" must not match inside "said")
+def is_whole_word(text, start, end):
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+"""
+multi-pattern keyword counter built on an Aho-Corasick automaton
+
+every keyword is found in a single pass over the text no matter how many keywords
+there are, so all categories are scored at once. matching is case-insensitive and
+on whole words; count() returns a Counter of keyword -> occurrences
+"""
+class KeywordMatcher:
+    def __init__(self, keywords):
+        # keywords differing only in case are one pattern, reported under the first spelling
+        self.patterns = {}
+        for keyword in keywords:
+            self.patterns.setdefault(normalize_text(keyword), keyword)
+
+        if ahocorasick:
+            self.automaton = ahocorasick.Automaton()
+            for pattern in self.patterns:
+                self.automaton.add_word(pattern, pattern)
+            self.automaton.make_automaton()
+        else:
+            self._build()
+
+    # goto / fail / output tables of the automaton, states numbered from the root (0)
+    def _build(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(pattern)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    # yields (end index, pattern) for every occurrence, overlapping ones included
+    def _iter_matches(self, text):
+        if ahocorasick:
+            yield from self.automaton.iter(text)
+            return
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for pattern in self.output[state]:
+                yield index, pattern
+
+    # occurrences keyed by normalized pattern
+    def count_patterns(self, text):
+        text = normalize_text(text)
+        counts = Counter()
+        for end, pattern in self._iter_matches(text):
+            if is_whole_word(text, end - len(pattern) + 1, end + 1):
+                counts[pattern] += 1
+        return counts
+
+    def count(self, text):
+        return Counter({self.patterns[pattern]: n for pattern, n in self.count_patterns(text).items()})
+
+"""
+scores documents against keyword categories with one shared matcher
+
+a category's score is the share of its keywords that appear in the document,
+so categories with long keyword lists aren't favoured; hits keeps the raw counts
+"""
+class CategoryScorer:
+    def __init__(self, categories):
+        # category -> {normalized pattern: keyword as first written in the category list}
+        self.categories = {}
+        for category, keywords in categories.items():
+            patterns = self.categories[category] = {}
+            for keyword in keywords:
+                patterns.setdefault(normalize_text(keyword), keyword)
+        self.matcher = KeywordMatcher(keyword for keywords in categories.values() for keyword in keywords)
+
+    def score(self, text):
+        counts = self.matcher.count_patterns(text)
+        scores = {}
+        for category, patterns in self.categories.items():
+            hits = {keyword: counts[pattern] for pattern, keyword in patterns.items() if counts[pattern]}
+            scores[category] = {"score": round(len(hits) / len(patterns), 4), "hits": hits}
+        return scores
@@ -1,12 +1,122 @@
-from search import search_policy_links
-from downloader import download_pdfs
+import argparse
+import os
 
-if __name__ == "__main__":
-    category = "Data"
-    state = "New York"
+from categories import KEYWORD_CATEGORIES
+
+# subcommands import their modules when they run, so searching never loads Playwright
+# and downloading never loads openai
+
+# keyword arguments for the options given on the command line; the rest keep the defaults
+# of the function they are passed to
+def given(**options):
+    return {name: value for name, value in options.items() if value is not None}
+
+def read_urls(args):
+    urls = list(args.urls)
+    if args.url_file:
+        with open(args.url_file) as f:
+            urls += [line.strip() for line in f if line.strip()]
+    return list(dict.fromkeys(urls))
+
+def run_search(args):
+    from search import batch_search
+
+    categories = list(KEYWORD_CATEGORIES) if args.categories == ["ALL"] else args.categories
+    pairs = [(category, state) for category in categories for state in args.states]
+
+    print(f"Searching for policy PDFs in {len(args.states)} state(s) under {len(categories)} categories...")
+    results = batch_search(pairs, keyword_mode=args.keywords, **given(concurrency=args.concurrency, requests_per_minute=args.rpm))
+    pdf_links = list(dict.fromkeys(url for urls in results.values() for url in urls))
+    print(f"Found {len(pdf_links)} PDF(s).")
+
+    kinds = None
+    if args.validate: # model answers include dead and made-up links; probing them is far cheaper than fetching
+        from url_validator import route, validate_urls
+
+        pdf_links, kinds = route(validate_urls(pdf_links))
+    if args.output:
+        with open(args.output, "w") as f:
+            f.writelines(f"{url}\n" for url in pdf_links)
+        print(f"Saved the links to {args.output}")
+    if args.download:
+        from downloader import download_pdfs
+
+        print("Starting download...")
+        download_pdfs(pdf_links, output_dir=args.output_dir, kinds=kinds)
+
+def run_download(args):
+    from downloader import download_pdfs
+
+    urls = read_urls(args)
+    kinds = None
+    if args.validate:
+        from url_validator import route, validate_urls
 
-    print(f"Searching for policy PDFs in {state} under the {category} category...")
-    pdf_links = search_policy_links(category, state)
+        urls, kinds = route(validate_urls(urls))
+    download_pdfs(urls, output_dir=args.output_dir, kinds=kinds, **given(workers=args.workers, render_pool_size=args.pool_size))
 
-    print(f"Found {len(pdf_links)} PDF(s). Starting download...")
-    download_pdfs(pdf_links)
\ No newline at end of file
+def run_validate(args):
+    from url_validator import validate_urls
+
+    for verdict in validate_urls(read_urls(args)):
+        print(f"{verdict['kind']:<6}{verdict['status'] or '-':>5}  {verdict['url']}  {verdict['reason'] or ''}")
+
+def run_render(args):
+    import render_service
+    from downloader import output_filename
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = [(url, os.path.join(args.output_dir, output_filename(url))) for url in read_urls(args)]
+    results = render_service.render_pages(jobs, **given(pool_size=args.pool_size, wait_until=args.wait_until))
+    print(f"Rendered {sum(results)} of {len(jobs)} page(s) to {args.output_dir}")
+
+"""
+search for state AI policy PDFs, check and download them, or render web pages as PDFs:
+  python main.py search --categories ALL --states "New York" --download
+  python main.py download --url-file links.txt
+  python main.py validate --url-file links.txt
+  python main.py render https://example.gov/policy
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Search for state AI policy PDFs and download them")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search = subparsers.add_parser("search", help="find policy PDFs with OpenAI web search")
+    search.add_argument("--categories", nargs="+", default=["Data"], help=f"any of: {', '.join(KEYWORD_CATEGORIES)}, or ALL")
+    search.add_argument("--states", nargs="+", default=["New York"], help="full state names")
+    search.add_argument("--keywords", choices=["first", "rotate", "all"], default="first",
+                        help="which category keywords to search with")
+    search.add_argument("--concurrency", type=int, help="searches in flight at once")
+    search.add_argument("--rpm", type=float, help="search requests per minute")
+    search.add_argument("--output", help="save the links found, one per line")
+    search.add_argument("--download", action="store_true", help="download the links found")
+    search.add_argument("--no-validate", dest="validate", action="store_false",
+                        help="keep every link instead of dropping dead and non-PDF ones")
+    search.set_defaults(run=run_search)
+
+    download = subparsers.add_parser("download", help="download PDFs (rendering any HTML pages among them)")
+    download.add_argument("--workers", type=int, help="concurrent direct downloads")
+    download.add_argument("--validate", action="store_true", help="probe the URLs first and skip dead ones")
+    download.set_defaults(run=run_download)
+
+    validate = subparsers.add_parser("validate", help="classify URLs as PDF, page to render or dead")
+    validate.set_defaults(run=run_validate)
+
+    render = subparsers.add_parser("render", help="render web pages as PDFs with Playwright")
+    render.add_argument("--wait-until", choices=["commit", "domcontentloaded", "load", "networkidle"],
+                        help="page load state to wait for before printing")
+    render.set_defaults(run=run_render)
+
+    for subparser in (download, validate, render):
+        subparser.add_argument("urls", nargs="*", help="URLs to fetch")
+        subparser.add_argument("--url-file", help="file with one URL per line")
+    for subparser in (download, render):
+        subparser.add_argument("--pool-size", type=int, help="browser contexts rendering pages at once")
+    for subparser in (search, download, render):
+        subparser.add_argument("--output-dir", default="downloads")
+
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import hashlib
+import os
+
+TEXT_CACHE_DIR = "text_cache"  # extracted text, one file per PDF content hash
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def text_cache_path(cache_dir, sha256):
+    return os.path.join(cache_dir, sha256[:2], f"{sha256}.txt")
+
+"""
+extracts the text layer of every page of a PDF (scanned pages without one come back empty)
+"""
+def extract_pdf_text(path):
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+"""
+returns (sha256, text) for a PDF, extracting only on the first sight of its content:
+text is cached by content hash, so renamed, re-downloaded or duplicate files are free
+"""
+def cached_text(path, cache_dir=TEXT_CACHE_DIR):
+    sha256 = file_sha256(path)
+    cache_path = text_cache_path(cache_dir, sha256)
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            return sha256, f.read()
+
+    text = extract_pdf_text(path)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp" # worker processes may race on identical files
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, cache_path)
+    return sha256, text
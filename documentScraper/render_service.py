@@ -0,0 +1,178 @@
+import asyncio
+import os
+import sys
+import threading
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.metrics import host_of, timed
+
+RENDER_POOL_SIZE = 4  # browser contexts rendering at once
+WAIT_UNTIL = "load"  # playwright load state to wait for: "commit", "domcontentloaded", "load" or "networkidle"
+WAIT_TIMEOUT = 20  # seconds to wait for that load state before printing whatever has loaded
+HARD_TIMEOUT = 45  # seconds after which a render is abandoned outright
+
+# a PDF of a policy page needs none of these
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "hotjar.com", "nr-data.net", "newrelic.com", "siteimproveanalytics.com",
+    "segment.io", "clarity.ms", "addthis.com", "sharethis.com",
+)
+
+"""
+reusable HTML-to-PDF renderer built on Playwright's async API
+
+one browser is launched for the life of the service and a pool of browser contexts
+is kept warm, so each render only opens a page. requests for images, fonts, media
+and known analytics hosts are aborted. every render waits for the configured load
+state up to wait_timeout (then prints what has loaded) and is abandoned after
+hard_timeout. use as `async with RenderService() as service: await service.render_many(jobs)`
+"""
+class RenderService:
+    def __init__(self, pool_size=RENDER_POOL_SIZE, wait_until=WAIT_UNTIL, wait_timeout=WAIT_TIMEOUT,
+                 hard_timeout=HARD_TIMEOUT, block_resources=True):
+        self.pool_size = pool_size
+        self.wait_until = wait_until
+        self.wait_timeout = wait_timeout
+        self.hard_timeout = hard_timeout
+        self.block_resources = block_resources
+
+    async def __aenter__(self):
+        from playwright.async_api import async_playwright
+
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.all_contexts = []
+        self.contexts = asyncio.Queue()
+        for _ in range(self.pool_size):
+            context = await self.browser.new_context()
+            if self.block_resources:
+                await context.route("**/*", self._filter_request)
+            self.all_contexts.append(context)
+            self.contexts.put_nowait(context)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        for context in self.all_contexts:
+            await context.close()
+        await self.browser.close()
+        await self.playwright.stop()
+
+    # aborts requests the PDF doesn't need and lets everything else through
+    async def _filter_request(self, route):
+        request = route.request
+        host = urlparse(request.url).hostname or ""
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(BLOCKED_HOSTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render(self, context, url, output_path):
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        page = await context.new_page()
+        try:
+            try:
+                await page.goto(url, wait_until=self.wait_until, timeout=self.wait_timeout * 1000)
+            except PlaywrightTimeoutError:
+                print(f"Timed out waiting for '{self.wait_until}' on {url}, rendering what has loaded")
+            await page.pdf(path=output_path, format="A4")
+        finally:
+            await page.close()
+
+    """
+    renders one page to output_path on a pooled context; returns True on success
+    the render (not the wait for a free context) is timed in the page_render metrics
+    """
+    async def render(self, url, output_path):
+        context = await self.contexts.get()
+        try:
+            with timed("page_render", host=host_of(url)) as call:
+                try:
+                    print(f"Loading page for PDF rendering: {url}")
+                    await asyncio.wait_for(self._render(context, url, output_path), timeout=self.hard_timeout)
+                    print(f"Saved PDF: {output_path}")
+                    return True
+                except asyncio.TimeoutError:
+                    call["result"] = "timeout"
+                    print(f"Failed to save PDF for {url}: gave up after {self.hard_timeout} s")
+                    return False
+                except Exception as e:
+                    call.update(result="failed", error=type(e).__name__)
+                    print(f"Failed to save PDF for {url}: {e}")
+                    return False
+        finally:
+            self.contexts.put_nowait(context)
+
+    """
+    renders (url, output_path) jobs concurrently, at most pool_size at a time;
+    returns one success flag per job
+    """
+    async def render_many(self, jobs):
+        return await asyncio.gather(*(self.render(url, output_path) for url, output_path in jobs))
+
+"""
+synchronous entry point: starts a render service, renders every job and shuts it down
+"""
+def render_pages(jobs, pool_size=RENDER_POOL_SIZE, wait_until=WAIT_UNTIL, wait_timeout=WAIT_TIMEOUT,
+                 hard_timeout=HARD_TIMEOUT):
+    async def run():
+        async with RenderService(pool_size, wait_until, wait_timeout, hard_timeout) as service:
+            return await service.render_many(jobs)
+    return asyncio.run(run())
+
+"""
+synchronous front end to one long-lived RenderService, for callers that render pages
+one at a time (e.g. a queue worker): the browser is launched on a background event loop
+by the first render and kept until close(), so every later page only opens a tab
+use as `with BackgroundRenderer() as renderer: renderer.render(url, output_path)`
+"""
+class BackgroundRenderer:
+    def __init__(self, pool_size=1, wait_until=WAIT_UNTIL, wait_timeout=WAIT_TIMEOUT, hard_timeout=HARD_TIMEOUT):
+        self.service = RenderService(pool_size, wait_until, wait_timeout, hard_timeout)
+        self.lock = threading.Lock()
+        self.loop = None
+        self.thread = None
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def _start(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        try:
+            self._call(self.service.__aenter__())
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def _stop_loop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.loop = None
+
+    # renders one page to output_path, launching the browser first if needed; returns True on success
+    def render(self, url, output_path):
+        with self.lock:
+            if self.loop is None:
+                self._start()
+        return self._call(self.service.render(url, output_path))
+
+    # shuts the browser down, if one was launched
+    def close(self):
+        with self.lock:
+            if self.loop is None:
+                return
+            try:
+                self._call(self.service.__aexit__(None, None, None))
+            finally:
+                self._stop_loop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,77 +1,40 @@
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import os
-from dotenv import load_dotenv
-
-# load OpenAI API key from .env file
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-# keyword mapping for each category to guide document search prompts
-KEYWORD_CATEGORIES = {
-    "Infrastructure": [
-        "Artificial Intelligence", "GenAI", "AI infrastructure", "cloud computing", "data centers",
-        "edge computing", "AI accelerators", "GPU", "high-performance computing", "storage infrastructure",
-        "distributed systems", "scalability", "cybersecurity", "data privacy",
-        "Secure Identity and Access Management", "Data Governance", "Wireless infrastructure",
-        "modernization", "energy infrastructure", "critical infrastructure"
-    ],
-    "Environment": [
-        "Artificial Intelligence", "AI", "sustainable AI", "environmental impact", "green computing",
-        "GHG emissions", "carbon footprint", "greenhouse gas emissions", "public disclosure",
-        "transparency", "reporting requirements", "protocol standards", "verification", "responsible AI",
-        "algorithm transparency", "digital sustainability", "corporate emissions", "measurement"
-    ],
-    "Perception": [
-        "Perception", "Artificial Intelligence", "AI", "trust", "fear", "expectations", "attitudes",
-        "acceptance", "public opinion", "ethics", "transparency", "misconceptions"
-    ],
-    "Security": [
-        "Artificial Intelligence", "AI", "Cybersecurity", "Security", "Privacy", "Data privacy",
-        "Risk Assessment", "Risk Management", "Data protection", "Data breach", "Authentication",
-        "Encryption", "Access control", "Anomaly detection", "Malware detection", "Intrusion detection",
-        "Threat intelligence", "Unauthorized access", "Information safeguarding", "Human oversight"
-    ],
-    "Education": [
-        "Artificial Intelligence", "AI", "Education", "AI education", "AI literacy",
-        "professional development", "workforce", "curriculum", "personalized learning",
-        "adaptive learning", "instructional resources", "critical thinking", "STEM",
-        "educational outcomes", "grant programs", "learning pathways", "postsecondary education",
-        "machine learning"
-    ],
-    "Accessibility": [
-        "Artificial Intelligence", "Accessibility", "AI Protections", "Safeguards",
-        "Accountability", "Underrepresented students", "accessibility", "standards",
-        "Web Content Accessibility Guidelines", "compliance", "Digital Divide", "Digital Inclusion",
-        "Equitable AI", "Universal Access", "Affordability", "Technological Literacy",
-        "Broadband access", "Internet connectivity", "Remote regions"
-    ],
-    "Equity and Diversity": [
-        "Artificial Intelligence", "AI", "Equity", "Diversity", "Bias", "Anti-bias Testing",
-        "Algorithmic Fairness", "Inclusion", "Discrimination", "Fairness", "Ethics",
-        "Algorithmic Bias", "Equity in AI", "Diversity and Inclusion", "Protected Characteristic",
-        "Unlawful Discrimination", "Underrepresented Communities", "Bias Mitigation",
-        "Algorithmic Transparency", "Disparate Impact", "Inclusive Design",
-        "Equitable Outcomes", "Ethical AI"
-    ],
-    "Data": [
-        "Artificial Intelligence", "AI", "Data", "Generative AI", "Training Data", "Datasets",
-        "Synthetic Data", "Data Collection", "Data Processing", "Data Quality", "Data Governance",
-        "Data Privacy", "Data Ownership", "Data Sources", "Transparency", "Compliance",
-        "Machine Learning", "Data Accessibility"
-    ]
-}
-
-# plain-English definitions of each category to help GPT understand the prompt context
-CATEGORY_DEFINITIONS = {
-    "Infrastructure": "Infrastructure refers to the physical and digital systems—such as computing power, data centers, broadband networks, and cloud platforms—required to develop, deploy, and scale AI technologies.",
-    "Environment": "Environment includes the ecological and sustainability impacts of AI development and deployment, including emissions, green computing practices, and regulatory transparency.",
-    "Perception": "Perception refers to how the public and stakeholders view and understand AI, including ethical concerns, transparency, and trust.",
-    "Security": "Security addresses the risks and protections related to AI systems, including cybersecurity, data protection, and risk management.",
-    "Education": "Education concerns the development of AI literacy, educational infrastructure, and workforce readiness in AI-related fields.",
-    "Accessibility": "Accessibility addresses ensuring equitable access to AI benefits, compliance with accessibility standards, and inclusion of underrepresented populations.",
-    "Equity and Diversity": "Equity and Diversity involves ensuring that AI systems are fair, inclusive, and free from bias or discrimination.",
-    "Data": "Data refers to the foundations of AI development, including data collection, processing, governance, and transparency."
-}
+import sys
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.http_cache import FileCache
+from scraperCommon.rate_limit import TokenBucket
+
+from categories import KEYWORD_CATEGORIES, CATEGORY_DEFINITIONS
+
+MODEL = "gpt-4.1"
+SEARCH_CACHE_DIR = "search_cache"  # on-disk cache of model answers
+SEARCH_CACHE_TTL = 7 * 24 * 60 * 60  # seconds before a cached answer is searched again
+SEARCH_CONCURRENCY = 4  # searches in flight at once in batch mode
+SEARCH_REQUESTS_PER_MINUTE = 30  # batch mode rate limit
+
+_client = None
+_client_lock = threading.Lock()
+
+"""
+returns the process-wide OpenAI client, created on first use: openai and the .env
+file are only loaded by runs that actually send a search
+"""
+def get_openai_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            from dotenv import load_dotenv
+            from openai import OpenAI
+
+            # load OpenAI API key from .env file
+            load_dotenv()
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return _client
 
 """
 splits the GPT output into a clean list of non-empty URLs
@@ -79,28 +42,48 @@ splits the GPT output into a clean list of non-empty URLs
 def parse_output(text):
     return [url.strip() for url in text.strip().split('\n') if url.strip()]
 
+"""
+builds the natural language prompt for one category, state and keyword
+"""
+def build_prompt(category, state, keyword):
+    category_definition = CATEGORY_DEFINITIONS[category]
+    return (
+        f"Please provide a list of policy documents from government sources in {state} relating to Artificial Intelligence, {category}, and {keyword}. "
+        f"{category} is defined as follows: {category_definition}. "
+        f"Return only policy documents that are PDF sources from government websites. A policy document is a policy passed by the state Senate or Assembly, "
+        f"or an Executive Order signed by the Governor, or a policy enacted by a state agency. Return only the URLs separated by line. Include no other text. Make sure these documents are from the last 10 years."
+    )
+
+"""
+cache key for a search: hash of the prompt, model and user location
+"""
+def search_cache_key(prompt, model, state):
+    payload = json.dumps({"prompt": prompt, "model": model, "region": state}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
 """
 generates a search prompt and queries GPT-4.1 web search for relevant state policy PDFs
+keyword defaults to the first keyword of the category; with a cache, answers for the
+same prompt, model and location are reused until they expire
 """
-def search_policy_links(category, state):
+def search_policy_links(category, state, keyword=None, openai_client=None, cache=None, model=MODEL):
     keywords = KEYWORD_CATEGORIES.get(category)
     if not keywords:
         raise ValueError(f"Unsupported category: {category}")
 
-    category_definition = CATEGORY_DEFINITIONS[category]
-    keyword = keywords[0]  # selects the first keyword from the category list for specificity
+    keyword = keyword or keywords[0]  # selects the first keyword from the category list for specificity
 
     # builds natural language prompt for policy search
-    prompt = (
-        f"Please provide a list of policy documents from government sources in {state} relating to Artificial Intelligence, {category}, and {keyword}. "
-        f"{category} is defined as follows: {category_definition}. "
-        f"Return only policy documents that are PDF sources from government websites. A policy document is a policy passed by the state Senate or Assembly, "
-        f"or an Executive Order signed by the Governor, or a policy enacted by a state agency. Return only the URLs separated by line. Include no other text. Make sure these documents are from the last 10 years."
-    )
+    prompt = build_prompt(category, state, keyword)
+
+    key = search_cache_key(prompt, model, state)
+    cached = cache.get(key) if cache else None
+    if cached:
+        return parse_output(cached[1].decode("utf-8"))
 
     # sends request to GPT-4.1 with embedded web search
-    response = client.responses.create(
-        model="gpt-4.1",
+    response = (openai_client or get_openai_client()).responses.create(
+        model=model,
         tools=[{
             "type": "web_search_preview",
             "user_location": {
@@ -113,6 +96,60 @@ def search_policy_links(category, state):
     )
 
     response_text = response.output_text.strip()
-    urls = [url.strip() for url in response_text.split('\n') if url.strip()] # cleans and parses result into list
+    if cache:
+        cache.set(key, {"category": category, "state": state, "keyword": keyword, "model": model}, response_text.encode("utf-8"))
+
+    return parse_output(response_text) # cleans and parses result into list
+
+"""
+expands (category, state) pairs into (category, state, keyword) searches:
+"first" keeps today's behaviour, "rotate" gives the i-th search of each category its
+i-th keyword (wider coverage at the same call count), "all" searches every keyword
+"""
+def plan_searches(pairs, keyword_mode="first"):
+    searches = []
+    uses = {}
+    for category, state in pairs:
+        keywords = KEYWORD_CATEGORIES.get(category)
+        if not keywords:
+            raise ValueError(f"Unsupported category: {category}")
+        if keyword_mode == "all":
+            searches.extend((category, state, keyword) for keyword in keywords)
+        elif keyword_mode == "rotate":
+            index = uses.get(category, 0)
+            uses[category] = index + 1
+            searches.append((category, state, keywords[index % len(keywords)]))
+        else:
+            searches.append((category, state, keywords[0]))
+    return searches
+
+"""
+runs many searches concurrently under a concurrency cap and a requests-per-minute
+limit, caching every answer on disk; returns {(category, state): [urls]} with the
+URLs from all of a pair's keywords merged and deduplicated
+"""
+def batch_search(pairs, concurrency=SEARCH_CONCURRENCY, requests_per_minute=SEARCH_REQUESTS_PER_MINUTE,
+                 keyword_mode="first", cache_dir=SEARCH_CACHE_DIR, ttl=SEARCH_CACHE_TTL, openai_client=None):
+    cache = FileCache(cache_dir, ttl=ttl) if cache_dir else None
+    rate_limiter = TokenBucket(requests_per_minute / 60, capacity=concurrency)
+    searches = plan_searches(pairs, keyword_mode)
+
+    def run_search(search):
+        category, state, keyword = search
+        key = search_cache_key(build_prompt(category, state, keyword), MODEL, state)
+        if not (cache and cache.get(key)): # cached answers don't count against the rate limit
+            rate_limiter.acquire()
+        try:
+            return search_policy_links(category, state, keyword, openai_client=openai_client, cache=cache)
+        except Exception as e:
+            print(f"Search failed for {category} / {state} / {keyword}: {e}")
+            return []
+
+    results = {(category, state): {} for category, state in pairs}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for (category, state, keyword), urls in zip(searches, executor.map(run_search, searches)):
+            print(f"{state} / {category} / {keyword}: {len(urls)} URL(s)")
+            for url in urls:
+                results[(category, state)].setdefault(url, None)
 
-    return urls
+    return {pair: list(urls) for pair, urls in results.items()}
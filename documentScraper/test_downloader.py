@@ -0,0 +1,57 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import downloader
+
+# two different documents that share the basename EO.pdf
+DOCUMENTS = {"/a/EO.pdf": b"%PDF-1.4 first document " * 4000, "/b/EO.pdf": b"%PDF-1.4 second document " * 4000}
+
+class DocumentHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = DOCUMENTS.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for start in range(0, len(body), 8192): # slow enough for both downloads to overlap
+            self.wfile.write(body[start:start + 8192])
+            time.sleep(0.001)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DocumentHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_output_filename_keeps_the_basename_and_tells_urls_apart():
+    first = downloader.output_filename("https://example.gov/a/EO.pdf")
+    second = downloader.output_filename("https://example.gov/b/EO.pdf")
+    assert first.startswith("EO_") and first.endswith(".pdf")
+    assert first != second
+    assert first == downloader.output_filename("https://example.gov/a/EO.pdf")
+    assert downloader.output_filename("https://www.nysenate.gov/legislation/bills/2023/S1/download").startswith("download_")
+
+def test_same_named_documents_download_to_separate_files(base_url, tmp_path):
+    urls = [f"{base_url}{path}" for path in DOCUMENTS]
+
+    downloader.download_pdfs(urls, output_dir=tmp_path, workers=2, per_host=2)
+
+    for url, body in zip(urls, DOCUMENTS.values()):
+        assert (tmp_path / downloader.output_filename(url)).read_bytes() == body
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(downloader.output_filename(url) for url in urls)
+
+    # a second run finds each document under its own name instead of skipping one for the other
+    (tmp_path / downloader.output_filename(urls[1])).unlink()
+    downloader.download_pdfs(urls, output_dir=tmp_path, workers=2, per_host=2)
+    assert (tmp_path / downloader.output_filename(urls[1])).read_bytes() == DOCUMENTS["/b/EO.pdf"]
@@ -0,0 +1,87 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import search
+from categories import KEYWORD_CATEGORIES
+
+# stands in for the OpenAI client: answers responses.create with canned text and records each call
+class StubClient:
+    def __init__(self, answer=lambda prompt: "https://example.gov/a.pdf\nhttps://example.gov/b.pdf\n"):
+        self.answer = answer
+        self.calls = []
+        self.lock = threading.Lock()
+        self.responses = self
+
+    def create(self, model, tools, input):
+        with self.lock:
+            self.calls.append({"model": model, "region": tools[0]["user_location"]["region"], "prompt": input})
+        return SimpleNamespace(output_text=self.answer(input))
+
+def run_batch(pairs, client, tmp_path, **options):
+    return search.batch_search(pairs, requests_per_minute=60000, cache_dir=tmp_path / "cache", openai_client=client, **options)
+
+def test_plan_searches_first_rotate_and_all():
+    pairs = [("Data", "New York"), ("Data", "Texas"), ("Security", "Texas")]
+    data, security = KEYWORD_CATEGORIES["Data"], KEYWORD_CATEGORIES["Security"]
+
+    assert search.plan_searches(pairs) == [("Data", "New York", data[0]), ("Data", "Texas", data[0]), ("Security", "Texas", security[0])]
+    # each category's keywords rotate on their own
+    assert search.plan_searches(pairs, "rotate") == [
+        ("Data", "New York", data[0]), ("Data", "Texas", data[1]), ("Security", "Texas", security[0]),
+    ]
+    assert search.plan_searches([("Data", "Ohio")], "all") == [("Data", "Ohio", keyword) for keyword in data]
+    with pytest.raises(ValueError):
+        search.plan_searches([("Nonsense", "Ohio")])
+
+def test_rotation_wraps_around_the_keyword_list():
+    keywords = KEYWORD_CATEGORIES["Perception"]
+    pairs = [("Perception", f"State {i}") for i in range(len(keywords) + 1)]
+    assert [keyword for _, _, keyword in search.plan_searches(pairs, "rotate")] == keywords + keywords[:1]
+
+def test_batch_merges_each_pairs_keywords_without_duplicates(tmp_path):
+    # every keyword's answer shares one URL and adds one of its own
+    client = StubClient(lambda prompt: f"https://example.gov/shared.pdf\nhttps://example.gov/{len(prompt)}.pdf\n\n")
+    pairs = [("Perception", "Ohio"), ("Data", "Ohio")]
+
+    results = run_batch(pairs, client, tmp_path, keyword_mode="all")
+
+    assert len(client.calls) == len(KEYWORD_CATEGORIES["Perception"]) + len(KEYWORD_CATEGORIES["Data"])
+    assert {call["region"] for call in client.calls} == {"Ohio"}
+    assert set(results) == set(pairs)
+    for urls in results.values():
+        assert urls[0] == "https://example.gov/shared.pdf"
+        assert len(urls) == len(set(urls))
+
+def test_cached_answers_are_reused_until_the_search_changes(tmp_path):
+    client = StubClient()
+    first = run_batch([("Data", "Ohio")], client, tmp_path)
+    assert len(client.calls) == 1
+
+    # same prompt, model and location: a cache hit, no call
+    assert run_batch([("Data", "Ohio")], client, tmp_path) == first
+    assert len(client.calls) == 1
+
+    # another keyword or state is a miss
+    run_batch([("Data", "Ohio"), ("Data", "Utah")], client, tmp_path, keyword_mode="rotate")
+    assert len(client.calls) == 2
+    assert client.calls[1]["region"] == "Utah"
+    assert KEYWORD_CATEGORIES["Data"][1] in client.calls[1]["prompt"]
+
+def test_expired_answers_are_searched_again(tmp_path):
+    client = StubClient()
+    run_batch([("Data", "Ohio")], client, tmp_path, ttl=0)
+    run_batch([("Data", "Ohio")], client, tmp_path, ttl=0)
+    assert len(client.calls) == 2
+
+def test_a_failed_search_is_reported_empty_and_not_cached(tmp_path):
+    def answer(prompt):
+        raise RuntimeError("rate limited")
+    assert run_batch([("Data", "Ohio")], StubClient(answer), tmp_path) == {("Data", "Ohio"): []}
+
+    client = StubClient()
+    assert run_batch([("Data", "Ohio")], client, tmp_path)[("Data", "Ohio")] == [
+        "https://example.gov/a.pdf", "https://example.gov/b.pdf",
+    ]
+    assert len(client.calls) == 1
@@ -0,0 +1,143 @@
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.http import make_session, HostLimiter, BROWSER_HEADERS
+from scraperCommon.http_cache import FileCache, cache_key
+from scraperCommon.metrics import host_of, timed
+
+PROBE_WORKERS = 16  # URLs probed at once
+PROBE_PER_HOST = 4  # probes in flight against any single host
+PROBE_TIMEOUT = (3, 5)  # seconds to connect / to wait for the first bytes
+SNIFF_BYTES = 1024  # bytes fetched by a ranged GET; the PDF header must appear within them
+PROBE_CACHE_DIR = "probe_cache"  # on-disk cache of verdicts, one entry per URL
+PROBE_CACHE_TTL = 7 * 24 * 60 * 60  # seconds before a URL is probed again
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'\])]+", re.IGNORECASE)
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid)$", re.IGNORECASE)
+# content types servers use for downloads of unknown type; the bytes have to decide
+GENERIC_TYPES = {"", "application/octet-stream", "binary/octet-stream", "application/download",
+                 "application/x-download", "application/force-download"}
+HTML_TYPES = {"text/html", "application/xhtml+xml"}
+# statuses that say the URL itself is wrong; other failures may pass, so their verdicts aren't cached
+PERMANENT_STATUSES = {400, 404, 410}
+
+"""
+pulls the URL out of one line of model output ("1. <https://...>", markdown links,
+trailing punctuation) and normalizes it: lowercase scheme and host, no default port,
+fragment or tracking parameters; returns None when the line holds no http(s) URL
+"""
+def normalize_url(text):
+    match = URL_PATTERN.search(text or "")
+    if not match:
+        return None
+    parts = urlsplit(match.group(0).rstrip(".,;:!?*"))
+    if not parts.hostname:
+        return None
+    netloc = parts.hostname.lower()
+    if parts.port and parts.port != {"http": 80, "https": 443}.get(parts.scheme.lower()):
+        netloc += f":{parts.port}"
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k)])
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path or "/", query, ""))
+
+# normalized URLs in first-seen order, without duplicates or lines that held no URL
+def normalize_urls(urls):
+    return list(dict.fromkeys(url for url in map(normalize_url, urls) if url))
+
+def media_type(response):
+    return response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+
+"""
+reads the first SNIFF_BYTES of a URL with a ranged GET, for servers that refuse HEAD
+or don't say what they serve; returns (response, first bytes)
+"""
+def sniff(session, url):
+    headers = {"Range": f"bytes=0-{SNIFF_BYTES - 1}"}
+    with session.get(url, headers=headers, stream=True, timeout=PROBE_TIMEOUT, allow_redirects=True) as response:
+        head = b""
+        if response.status_code < 400:
+            for chunk in response.iter_content(chunk_size=SNIFF_BYTES):
+                head += chunk
+                if len(head) >= SNIFF_BYTES:
+                    break
+        return response, head[:SNIFF_BYTES]
+
+"""
+classifies one URL as "pdf" (download directly), "html" (render) or "dead" without
+downloading it: a HEAD request first, then a ranged GET whenever HEAD fails or the
+content type is missing or generic, in which case the %PDF- header decides. a .pdf
+link that answers with a web page counts as dead rather than a page to render
+returns {"url", "kind", "status", "content_type", "final_url", "reason", "permanent"}
+"""
+def probe_url(session, host_limiter, url):
+    verdict = {"url": url, "kind": "dead", "status": None, "content_type": None, "final_url": url, "reason": None,
+               "permanent": False}
+    with host_limiter.limit(url):
+        try:
+            response = session.head(url, timeout=PROBE_TIMEOUT, allow_redirects=True)
+            head = None
+            if response.status_code >= 400 or media_type(response) in GENERIC_TYPES:
+                response, head = sniff(session, url) # many servers answer HEAD with 403/405 or no type
+        except requests.RequestException as e:
+            verdict["reason"] = type(e).__name__
+            verdict["permanent"] = isinstance(e, (requests.exceptions.InvalidURL, requests.exceptions.MissingSchema))
+            return verdict
+
+    content_type = media_type(response)
+    verdict.update(status=response.status_code, content_type=content_type, final_url=response.url)
+    if response.status_code >= 400:
+        verdict["reason"] = f"HTTP {response.status_code}"
+        verdict["permanent"] = response.status_code in PERMANENT_STATUSES
+    elif (b"%PDF-" in head) if head else content_type == "application/pdf": # sniffed bytes outrank the header
+        verdict.update(kind="pdf", permanent=True)
+    elif content_type in HTML_TYPES or (head and head.lstrip()[:15].lower().startswith((b"<!doctype html", b"<html"))):
+        if urlsplit(url).path.lower().endswith(".pdf"): # made-up PDF paths mostly land on error or home pages
+            verdict.update(reason="a .pdf link that serves a web page", permanent=True)
+        else:
+            verdict.update(kind="html", permanent=True)
+    else:
+        verdict.update(reason=f"not a PDF or web page ({content_type or 'no content type'})", permanent=True)
+    return verdict
+
+"""
+normalizes and deduplicates URLs (e.g. raw search output), then probes them concurrently
+on one pooled session with a per-host cap; verdicts are cached per URL, except for
+failures that may be temporary (timeouts, 5xx, 429). returns the verdicts in input order
+"""
+def validate_urls(urls, workers=PROBE_WORKERS, per_host=PROBE_PER_HOST, cache_dir=PROBE_CACHE_DIR, ttl=PROBE_CACHE_TTL):
+    urls = normalize_urls(urls)
+    cache = FileCache(cache_dir, ttl=ttl) if cache_dir else None
+    session = make_session(workers, BROWSER_HEADERS)
+    host_limiter = HostLimiter(per_host)
+
+    def check(url):
+        key = cache_key("PROBE", url)
+        cached = cache.get(key) if cache else None
+        if cached:
+            return cached[0]["verdict"]
+        with timed("url_probe", host=host_of(url)) as call:
+            verdict = probe_url(session, host_limiter, url)
+            call.update(result=verdict["kind"], status=verdict["status"], reason=verdict["reason"])
+        if cache and verdict["permanent"]:
+            cache.set(key, {"verdict": verdict}, b"")
+        return verdict
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        verdicts = list(executor.map(check, urls))
+
+    counts = {kind: sum(1 for verdict in verdicts if verdict["kind"] == kind) for kind in ("pdf", "html", "dead")}
+    print(f"Validated {len(verdicts)} URL(s): {counts['pdf']} PDF, {counts['html']} to render, {counts['dead']} dead")
+    return verdicts
+
+"""
+the viable part of a validation, in download_pdfs' terms: the URLs to fetch and
+{url: "pdf" | "html"} telling it which to stream and which to render
+"""
+def route(verdicts):
+    kinds = {verdict["url"]: verdict["kind"] for verdict in verdicts if verdict["kind"] != "dead"}
+    return list(kinds), kinds
@@ -1,27 +1,35 @@
-import requests
 from bs4 import BeautifulSoup
 import csv
-import json
-from io import StringIO
+import hashlib
+import io
+import os
 import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.http import shared_session
+from scraperCommon.http_cache import cached_get
+from scraperCommon.metrics import timed
+from scraperCommon.output import JsonLinesSink, write_json_atomic
+from scraperCommon.change_detection import (
+    ChangeTracker, RecordDiff, append_changes, changelog_path, fingerprint_path, load_records, summarize_changes,
+)
 
 BASE_URL = "https://www.library.ca.gov"
+# executive orders page linking to the CSV export
+PAGE_URL = f"{BASE_URL}/government-publications/executive-orders/"
+# pooled session (with a browser user agent) shared with the other scrapers in this process
+SESSION = shared_session()
+REQUEST_TIMEOUT = 60  # seconds to connect, and between bytes while the export streams
+# the export spreads an order's tags over up to 14 columns
+TAG_COLUMNS = tuple(f"Tag {i}" for i in range(1, 15))
 
 """
 find the downloadable csv from the main executive orders and proclamations page
 """
 def find_csv_url(page_url):
-    # headers to mimic a real browser
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/114.0.0.0 Safari/537.36"
-        )
-    }
-
     # fetching and parsing the webpage
-    response = requests.get(page_url, headers=headers)
+    response = cached_get(SESSION, page_url, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     soup = BeautifulSoup(response.text, "html.parser")
 
@@ -39,62 +47,141 @@ def find_csv_url(page_url):
 downloads the csv and returns it as decoded text
 """
 def download_csv(csv_url):
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/114.0.0.0 Safari/537.36"
-        )
-    }
-    response = requests.get(csv_url, headers=headers)
+    response = cached_get(SESSION, csv_url, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     return response.content.decode("utf-8")
 
 """
-parses the csv content and extracting executive orders/metadata
+feeds every byte read through it into a hash, so the CSV can be fingerprinted
+while it streams into the parser
 """
-def extract_executive_orders(csv_text):
-    reader = csv.DictReader(StringIO(csv_text))
-    executive_orders = []
+class HashingReader(io.RawIOBase):
+    def __init__(self, raw, digest):
+        self.raw = raw
+        self.digest = digest
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        buffer[:len(data)] = data
+        self.digest.update(data)
+        return len(data)
+
+"""
+opens the csv as a text stream read straight off the HTTP response,
+so the export is never held in memory as a whole
+pass an already-open streaming response to reuse it, and a hashlib digest to hash the raw bytes
+"""
+def open_csv_stream(csv_url, response=None, digest=None):
+    if response is None:
+        response = SESSION.get(csv_url, stream=True, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    response.raw.decode_content = True # undo any gzip transfer encoding
+    response.raw.auto_close = False # let the text wrapper see EOF instead of a closed file
+    if digest is not None:
+        return io.TextIOWrapper(io.BufferedReader(HashingReader(response.raw, digest)), encoding="utf-8", newline="")
+    return io.TextIOWrapper(response.raw, encoding="utf-8", newline="")
+
+"""
+yields executive orders/metadata one row at a time from a csv.DictReader
+"""
+def iter_executive_orders(reader):
+    # the tag columns present in this export are looked up once, not per row
+    tag_columns = [column for column in TAG_COLUMNS if column in (reader.fieldnames or [])]
 
     for row in reader:
+        # only included EOs
+        if "Executive Order" not in (row.get("Type") or ""):
+            continue
+
         # extracting all EO tags into a single field
-        tags = [
-                row.get(f"Tag {i}", "").strip()
-                for i in range(1, 15)
-                if row.get(f"Tag {i}", "").strip()
-            ]
-        combined_tags = ", ".join(tags)
+        tags = [tag for tag in ((row[column] or "").strip() for column in tag_columns) if tag]
 
-        # only included EOs
-        if "Executive Order" in row.get("Type", ""):
-            executive_orders.append({
-                "executive_order_number": row.get("Executive Order Number", "").strip(),
-                "governor": row.get("Last Name", "").strip(),
-                "date_signed": row.get("Date Signed", "").strip(),
-                "date_filed": row.get("Date Filed", "").strip(),
-                "pdf_link": row.get("Link", "").strip(),
-                "tags": combined_tags
-            })
+        yield {
+            "executive_order_number": (row.get("Executive Order Number") or "").strip(),
+            "governor": (row.get("Last Name") or "").strip(),
+            "date_signed": (row.get("Date Signed") or "").strip(),
+            "date_filed": (row.get("Date Filed") or "").strip(),
+            "pdf_link": (row.get("Link") or "").strip(),
+            "tags": ", ".join(tags)
+        }
+
+"""
+parses the csv content and extracting executive orders/metadata
+"""
+def extract_executive_orders(csv_text):
+    return list(iter_executive_orders(csv.DictReader(io.StringIO(csv_text))))
+
+"""
+streams executive orders from the csv URL as they are read off the network
+"""
+def stream_executive_orders(csv_url, response=None, digest=None):
+    with open_csv_stream(csv_url, response, digest) as stream:
+        yield from iter_executive_orders(csv.DictReader(stream))
 
-    return executive_orders
+# identifies an order across runs; one PDF can hold several orders, so the number is part of the key
+def order_key(order):
+    return f"{order['executive_order_number']}|{order['pdf_link']}"
 
 """
 saves data to file
 """
 def save_to_json(data, filename):
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    write_json_atomic(filename, data)
 
 """
 runs the scraping and saving pipeline
+by default rows stream from the network straight into the output sink; stream=False
+downloads the whole csv through the response cache instead (e.g. for offline replays)
+
+once an output exists, the CSV is requested conditionally and hashed as it streams:
+a 304 or an identical export leaves the output untouched; otherwise it is rewritten and
+every added, changed or removed order is appended to the change log
 """
-def run_pipeline():
-    page_url = "https://www.library.ca.gov/government-publications/executive-orders/"
-    csv_url = find_csv_url(page_url)
-    csv_text = download_csv(csv_url)
-    executive_orders = extract_executive_orders(csv_text)
-    save_to_json(executive_orders, "ca_executive_orders.json")
+def run_pipeline(stream=True, output_file="ca_executive_orders.json", full_refresh=False):
+    csv_url = find_csv_url(PAGE_URL)
+
+    previous_orders = load_records(output_file)
+    tracker = ChangeTracker(fingerprint_path(output_file))
+    probe = bool(previous_orders) and not full_refresh
+    digest = hashlib.sha256()
+    response = None
+    if stream:
+        response = tracker.get(SESSION, "csv", csv_url, conditional=probe, stream=True, timeout=REQUEST_TIMEOUT)
+        if probe and tracker.unchanged("csv", response=response):
+            response.close()
+            print(f"CSV export not modified since the last run; keeping {len(previous_orders)} saved orders.")
+            return
+        executive_orders = stream_executive_orders(csv_url, response, digest)
+    else:
+        csv_text = download_csv(csv_url)
+        digest.update(csv_text.encode("utf-8"))
+        executive_orders = extract_executive_orders(csv_text)
+
+    # the CSV is a single download, so there is nothing to resume; the sink just streams the output
+    sink = JsonLinesSink(f"{os.path.splitext(output_file)[0]}.jsonl", resume=False)
+    diff = RecordDiff(previous_orders, order_key)
+    with timed("ca_csv_ingest", mode="stream" if stream else "download") as call:
+        for order in executive_orders:
+            diff.add(order)
+            sink.write(order)
+        call["rows"] = sink.count
+
+    csv_hash = digest.hexdigest()
+    if probe and tracker.unchanged("csv", sha256=csv_hash):
+        sink.discard()
+        print(f"CSV export unchanged since the last run; keeping {len(previous_orders)} saved orders.")
+    else:
+        changes = diff.changes + diff.removed()
+        order_count = sink.count
+        sink.finish(output_file)
+        append_changes(changelog_path(output_file), "ca_eos", changes)
+        print(f"Saved {order_count} executive orders to {output_file} ({summarize_changes(changes)})")
+
+    tracker.update("csv", response, sha256=csv_hash)
+    tracker.save()
 
 def main():
     run_pipeline()
@@ -0,0 +1,38 @@
+import os
+
+import ca_EOs
+import ny_EOs
+import tx_EOs
+from scraperCommon.framework import Scraper, register
+
+@register
+class NewYorkExecutiveOrders(Scraper):
+    name = "ny_eos"
+    description = "New York current executive orders (HTTP listing scraper)"
+
+    def run(self, options):
+        ny_EOs.scrape_current_orders(os.path.join(options.output_dir, ny_EOs.CURRENT_OUTPUT_FILE))
+
+@register
+class NewYorkPastExecutiveOrders(Scraper):
+    name = "ny_past_eos"
+    description = "New York past executive orders (needs Selenium and Chrome)"
+
+    def run(self, options):
+        ny_EOs.scrape_past_orders(os.path.join(options.output_dir, ny_EOs.PAST_OUTPUT_FILE))
+
+@register
+class CaliforniaExecutiveOrders(Scraper):
+    name = "ca_eos"
+    description = "California executive orders from the State Library CSV export"
+
+    def run(self, options):
+        ca_EOs.run_pipeline(output_file=os.path.join(options.output_dir, "ca_executive_orders.json"))
+
+@register
+class TexasExecutiveOrders(Scraper):
+    name = "tx_eos"
+    description = "Texas executive orders for every governor in the LRL archive"
+
+    def run(self, options):
+        tx_EOs.run(os.path.join(options.output_dir, "tx_executive_orders.json"))
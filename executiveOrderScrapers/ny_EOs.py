@@ -1,13 +1,21 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import json
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+import requests
+import os
+import sys
 import time
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.http import shared_session
+from scraperCommon.http_cache import cached_get
+from scraperCommon.metrics import timed
+from scraperCommon.output import JsonLinesSink, write_json_atomic
+from scraperCommon.change_detection import (
+    ChangeTracker, RecordDiff, append_changes, changelog_path, fingerprint_path, load_records, merge_records,
+    summarize_changes,
+)
+
 # URLs
 BASE_URL = "https://www.governor.ny.gov"
 CURRENT_PAGE = f"{BASE_URL}/executiveorders"
@@ -17,26 +25,230 @@ PAST_PAGE = f"{BASE_URL}/past-executive-orders"
 CURRENT_OUTPUT_FILE = "ny_executive_orders.json" #renamed for simpler download script
 PAST_OUTPUT_FILE = "ny_past_executive_orders.json"
 
+FETCH_WORKERS = 6  # listing pages fetched at once in HTTP mode
+REQUEST_TIMEOUT = 30  # seconds
+
+# pooled session shared with the other scrapers in this process
+SESSION = shared_session()
+
 # initializes a headless Chrome browser to run in the background
+# selenium is imported here so HTTP-only runs don't need it installed
 def init_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
     options = Options()
     options.headless = True
     return webdriver.Chrome(options=options)
 
+# the next page to scrape after the listing pages already checkpointed in the sink
+def next_unsaved_page(sink):
+    done_pages = [int(key.split(":")[1]) for key in sink.done if key.startswith("page:")]
+    return max(done_pages) + 1 if done_pages else 0
+
+# xpath test for an element carrying a CSS class, equivalent to the ".name" selector
+def has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# text of an element with whitespace collapsed the way the browser renders it
+def element_text(element):
+    return " ".join(element.text_content().split())
+
+"""
+parses one server-rendered listing page into order records, matching what
+the Selenium scraper extracts from the same .views-row blocks
+"""
+def parse_listing_page(html, page_url):
+    doc = lxml.html.fromstring(html)
+    doc.make_links_absolute(page_url) # selenium's get_attribute("href") returns absolute URLs
+
+    orders = []
+    for block in doc.xpath(f"//*[{has_class('views-row')}]"):
+        title_elems = block.xpath(f".//*[{has_class('content-title')}]//a")
+        if not title_elems:
+            print(" Skipping block due to missing title")
+            continue
+
+        link_elems = block.xpath(f".//*[{has_class('content-document')}]//a")
+        date_elems = block.xpath(f".//*[{has_class('date')}]")
+        orders.append({
+            "title": element_text(title_elems[0]),
+            "pdf_link": link_elems[0].get("href") if link_elems else None,
+            "date": element_text(date_elems[0]) if date_elems else None,
+        })
+    return orders
+
+"""
+reads the last page number from the Drupal pager ("Last" link, or the highest
+?page=N link); returns None when the markup has no pager links to go by
+"""
+def parse_last_page(html):
+    doc = lxml.html.fromstring(html)
+    hrefs = doc.xpath(f"//*[{has_class('pager__item--last')}]//a/@href")
+    if not hrefs:
+        hrefs = doc.xpath(f"//*[{has_class('pager')}]//a/@href")
+    pages = [int(match.group(1)) for href in hrefs for match in [re.search(r"[?&]page=(\d+)", href)] if match]
+    return max(pages) if pages else None
+
+# identifies an order across runs: its PDF link, or the title when there is no link
+def order_key(order):
+    return order.get("pdf_link") or order.get("title")
+
+def listing_url(page):
+    return f"{CURRENT_PAGE}?page={page}"
+
+# the page's text; without a charset in the Content-Type requests assumes ISO-8859-1,
+# which garbles the UTF-8 pages ("State’s" -> "Stateâ€™s"), so the encoding is detected instead
+def response_html(response):
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = response.apparent_encoding
+    return response.text
+
+"""
+downloads one listing page over plain HTTP and returns its HTML
+"""
+def fetch_listing_html(page):
+    url = listing_url(page)
+    print(f" Fetching CURRENT orders page {page}: {url}")
+    response = cached_get(SESSION, url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response_html(response)
+
+"""
+scrapes the current executive orders listing without a browser
+
+page 0 doubles as a change probe: it is requested conditionally and its parsed orders
+are hashed, and when neither differs from the last run the saved output is left alone.
+otherwise the pager gives the last page number; the remaining pages are then fetched
+FETCH_WORKERS at a time over a pooled session and parsed with lxml (without a pager,
+windows are fetched until an empty page turns up)
+
+the listing only grows at the front, so unless full_refresh is set the scrape stops after
+the page where orders saved by the previous run begin, and merges: changed orders replace
+their saved copies and new ones go in front; additions and changes are appended to the
+change log. returns False if nothing could be parsed, so the caller can fall back
+"""
+def scrape_current_orders_http(output_file, full_refresh=False):
+    sink_path = f"{os.path.splitext(output_file)[0]}.jsonl"
+    previous_orders = load_records(output_file)
+    saved_orders = [] if full_refresh else previous_orders
+    saved_keys = {order_key(order) for order in saved_orders}
+    tracker = ChangeTracker(fingerprint_path(output_file))
+    # the probe only applies when there is saved output to keep and no interrupted run to finish
+    probe = bool(saved_orders) and not os.path.exists(sink_path)
+
+    print(f" Fetching CURRENT orders page 0: {listing_url(0)}")
+    first_response = tracker.get(SESSION, "listing", listing_url(0), conditional=probe, timeout=REQUEST_TIMEOUT)
+    if probe and tracker.unchanged("listing", response=first_response):
+        print(f" Listing not modified since the last run; keeping {len(saved_orders)} saved orders.")
+        return True
+    first_response.raise_for_status()
+    first_html = response_html(first_response)
+    first_orders = parse_listing_page(first_html, listing_url(0))
+    if probe and first_orders and tracker.unchanged("listing", content=first_orders):
+        tracker.update("listing", first_response, first_orders)
+        tracker.save()
+        print(f" Listing page 0 unchanged since the last run; keeping {len(saved_orders)} saved orders.")
+        return True
+
+    sink = JsonLinesSink(sink_path)
+    first_page = next_unsaved_page(sink)
+    last_page = parse_last_page(first_html)
+    if last_page is not None:
+        print(f" Pager reports {last_page + 1} listing pages")
+
+    reached_saved = False
+    reached_end = False
+    start = first_page
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        while not (reached_saved or reached_end):
+            # page 0 is already in hand, so it is processed alone before any other page is requested;
+            # an incremental run whose new orders fit on page 0 then makes a single request
+            stop = start + 1 if start == 0 else start + FETCH_WORKERS
+            if last_page is not None:
+                stop = min(stop, last_page + 1)
+            window = range(start, stop)
+            if not window:
+                break
+            orders_by_page = executor.map(
+                lambda page: first_orders if page == 0 else parse_listing_page(fetch_listing_html(page), listing_url(page)),
+                window,
+            )
+
+            for page, orders in zip(window, orders_by_page):
+                if not orders:
+                    if page == 0 and not sink.count:
+                        sink.close() # keep the checkpoint for the Selenium fallback
+                        return False
+                    reached_end = True
+                    break
+
+                print(f" Found {len(orders)} blocks on page {page}")
+                # the whole page is kept even past the first saved order, so edits to saved orders show up
+                for order in orders:
+                    if order_key(order) in saved_keys:
+                        reached_saved = True
+                    else:
+                        print(f" {order['title']} -> {order['pdf_link']}")
+                    sink.write(order)
+                sink.mark_done(f"page:{page}")
+                if reached_saved:
+                    break
+            start = stop
+
+    scraped = list(sink.records())
+    if reached_saved:
+        print(f" Reached orders saved by the previous run; merging into {len(saved_orders)} saved orders.")
+        orders, changes = merge_records(saved_orders, scraped, order_key, prepend=True)
+    else: # the whole listing was scraped, so orders missing from it were removed
+        diff = RecordDiff(previous_orders, order_key)
+        for order in scraped:
+            diff.add(order)
+        orders, changes = scraped, diff.changes + diff.removed()
+
+    write_json_atomic(output_file, orders)
+    sink.discard()
+    append_changes(changelog_path(output_file), "ny_eos", changes)
+    tracker.update("listing", first_response, first_orders)
+    tracker.save()
+
+    print(f"\n Saved {len(orders)} current executive orders to {output_file} ({summarize_changes(changes)})")
+    return True
+
 """
 scrapes pdf links from the current executive orders page
+uses the fast HTTP scraper, and falls back to a real browser if that fails
+"""
+def scrape_current_orders(output_file, use_selenium=False, full_refresh=False):
+    if not use_selenium:
+        try:
+            if scrape_current_orders_http(output_file, full_refresh):
+                return
+            print(" No listing blocks found over HTTP, falling back to Selenium.")
+        except requests.RequestException as e:
+            print(f" HTTP scrape failed ({e}), falling back to Selenium.")
+    scrape_current_orders_selenium(output_file)
+
 """
-def scrape_current_orders(output_file):
+scrapes pdf links from the current executive orders page with a headless browser
+each finished page is checkpointed, so a restarted run continues after the last saved page
+"""
+def scrape_current_orders_selenium(output_file):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+    sink = JsonLinesSink(f"{os.path.splitext(output_file)[0]}.jsonl")
+    page = next_unsaved_page(sink)
     driver = init_driver() # starts a headless Chrome session
-    orders = [] 
-    page = 0
 
     try:
         while True:
             # constructs the current page's URL and tells the browser to navigate to it
             url = f"{CURRENT_PAGE}?page={page}"
             print(f" Loading CURRENT orders page {page}: {url}")
-            driver.get(url)
+            with timed("selenium_page_load", page="current"):
+                driver.get(url)
 
             # waits for page to lowk .view-rows blocks, the format of the page, and stops
             # scraping if not found in 10 secs
@@ -73,7 +285,7 @@ def scrape_current_orders(output_file):
                         date = None
 
                     print(f" {title} -> {pdf_link}")
-                    orders.append({
+                    sink.write({
                         "title": title,
                         "pdf_link": pdf_link,
                         "date": date
@@ -83,28 +295,38 @@ def scrape_current_orders(output_file):
                     print(f" Skipping block due to missing data: {e}")
                     continue
 
+            sink.mark_done(f"page:{page}")
             page += 1
             time.sleep(1)
 
     finally:
         driver.quit()
 
-    with open(output_file, "w") as f:
-        json.dump(orders, f, indent=2)
+    order_count = sink.count
+    sink.finish(output_file)
 
-    print(f"\n Saved {len(orders)} current executive orders to {output_file}")
+    print(f"\n Saved {order_count} current executive orders to {output_file}")
 
 """
 scrapes pdf links from the past executive orders page,
 which has a different format that warrents a separate function
 """
 def scrape_past_orders(output_file):
+    from selenium.webdriver.common.by import By
+
+    sink = JsonLinesSink(f"{os.path.splitext(output_file)[0]}.jsonl")
+    if sink.is_done("past"):
+        order_count = sink.count
+        sink.finish(output_file)
+        print(f" Saved {order_count} past executive orders to {output_file}")
+        return
+
     driver = init_driver() # starting a browser
-    orders = []
 
     try:
         print(f"\n Loading PAST executive orders page: {PAST_PAGE}")
-        driver.get(PAST_PAGE) # navigating to the page
+        with timed("selenium_page_load", page="past"):
+            driver.get(PAST_PAGE) # navigating to the page
         time.sleep(3)
 
         # grabbing all <a> tags in <p> linking to pdfs 
@@ -131,19 +353,20 @@ def scrape_past_orders(output_file):
                     print(f" Could not parse date: {date}")
 
             if include and href and href.endswith(".pdf"):
-                orders.append({
+                sink.write({
                     "title": title,
                     "pdf_link": href,
                     "date": date
                 })
+        sink.mark_done("past")
 
     finally:
         driver.quit()
 
-    with open(output_file, "w") as f:
-        json.dump(orders, f, indent=2)
+    order_count = sink.count
+    sink.finish(output_file)
 
-    print(f" Saved {len(orders)} past executive orders to {output_file}")
+    print(f" Saved {order_count} past executive orders to {output_file}")
 
 def main():
     scrape_current_orders(CURRENT_OUTPUT_FILE)
@@ -1,51 +1,221 @@
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+import os
+import re
 import requests
-from bs4 import BeautifulSoup
-import json
+import sys
 
-# currently scrapes only greg abbott's EOs, need to make it scrape all governor's EOs
-URL = "https://lrl.texas.gov/legeLeaders/governors/searchproc.cfm?govdoctypeID=5&governorID=45"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.http import shared_session
+from scraperCommon.http_cache import cached_get
+from scraperCommon.metrics import timed
+from scraperCommon.output import JsonLinesSink, write_json_atomic
+from scraperCommon.change_detection import (
+    ChangeTracker, RecordDiff, append_changes, changelog_path, fingerprint_path, load_records, merge_records,
+    summarize_changes,
+)
+
+BASE_URL = "https://lrl.texas.gov"
+# search form whose governor dropdown lists every governor ID
+SEARCH_FORM_URL = f"{BASE_URL}/legeLeaders/governors/search.cfm"
+# result page for one governor's executive orders (govdoctypeID=5)
+SEARCH_URL = f"{BASE_URL}/legeLeaders/governors/searchproc.cfm?govdoctypeID=5&governorID={{governor_id}}"
 OUTPUT_FILE = "executiveOrders/downloads/tx_executive_orders.json" #changed name for consistency with other states
+FETCH_WORKERS = 6  # governor result pages fetched at once
+REQUEST_TIMEOUT = 60  # seconds; the larger result pages are slow to generate
+# what a result page says instead of showing a table, e.g. "No documents found."
+NO_RESULTS_PATTERN = re.compile(r"\bno (?:documents|records|results|matches)\b[^.<]{0,60}\bfound\b", re.IGNORECASE)
+
+# pooled session shared by every governor page fetch and the other scrapers in this process
+SESSION = shared_session()
 
+# element text the way BeautifulSoup's get_text(strip=True) builds it:
+# every text node stripped, empty ones dropped, the rest joined without a separator
+def strip_text(element):
+    return "".join(text.strip() for text in element.itertext() if text.strip())
 
 """
-scrapes all executive orders/metadata from the input page
+reads every (governor_id, name) pair from the governor dropdown on the LRL search form
 """
-def scrape_executive_orders(url):
-    # sending a get request to the webpage and parsing the HTML content of the response
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, "html.parser")
+def get_governors(form_url=None):
+    response = cached_get(SESSION, form_url or SEARCH_FORM_URL, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return parse_governors(response.content)
+
+def parse_governors(html):
+    doc = lxml.html.fromstring(html)
+    options = doc.xpath("//select[@name='governorID']/option[normalize-space(@value) != '']")
+    if not options:
+        raise ValueError("Could not find the governor list on the search form.")
+    return [(option.get("value").strip(), strip_text(option)) for option in options]
+
+# True for a page that is a result table or says there are no results; anything else
+# (an error or maintenance page served with a 200) is not cached
+def is_result_page(response):
+    text = response.content.decode("utf-8", "replace")
+    return response.status_code == 200 and ("<table" in text.lower() or bool(NO_RESULTS_PATTERN.search(text)))
+
+"""
+parses the executive orders/metadata out of one governor's result page; a page
+without a results table is only taken as "no orders" when it says so, and otherwise
+raises ValueError so a failed page is never mistaken for a governor without orders
+"""
+def parse_executive_orders(html):
+    doc = lxml.html.fromstring(html)
 
     # finding the first table on the page and getting all table rows besides the header row
-    table = soup.find("table")
-    rows = table.find_all("tr")[1:]  
+    tables = doc.xpath("//table")
+    if not tables:
+        if NO_RESULTS_PATTERN.search(doc.text_content()):
+            return [] # governors without any executive orders get an empty result page
+        raise ValueError("Could not find the results table on the page.")
+    rows = tables[0].xpath(".//tr")[1:]
 
     results = []
     # iterating through table rows extracting metadata
     for row in rows:
-        cols = row.find_all("td")
-        if len(cols) < 6: 
+        cols = row.xpath("./td")
+        if len(cols) < 6:
             continue   # skipping rows that don't have all expected columns
-        
+
         #finding pdf link from third column
-        title_link = cols[2].find("a")
+        title_links = cols[2].xpath(".//a")
+        title_link = title_links[0] if title_links else None
+        href = title_link.get("href", "") if title_link is not None else ""
 
         # extracting metadata
         results.append({
-            "date": cols[0].get_text(strip=True),
-            "session": cols[1].get_text(strip=True),
-            "title": title_link.get_text(strip=True) if title_link else cols[2].get_text(strip=True),
-            "pdf_url": f"https://lrl.texas.gov{title_link['href']}" if not title_link['href'].startswith("http") else f"{title_link['href'].replace('http://www.lrl.state.tx.us', 'https://lrl.texas.gov')}",
-            "author": cols[3].get_text(strip=True),
-            "type": cols[4].get_text(strip=True),
-            "document_number": cols[5].get_text(strip=True),
+            "date": strip_text(cols[0]),
+            "session": strip_text(cols[1]),
+            "title": strip_text(title_link) if title_link is not None else strip_text(cols[2]),
+            "pdf_url": f"https://lrl.texas.gov{href}" if not href.startswith("http") else f"{href.replace('http://www.lrl.state.tx.us', 'https://lrl.texas.gov')}",
+            "author": strip_text(cols[3]),
+            "type": strip_text(cols[4]),
+            "document_number": strip_text(cols[5]),
         })
 
     return results
 
-def run():
-    orders = scrape_executive_orders(URL)
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(orders, f, indent=2)
+"""
+scrapes all executive orders/metadata from the input page; raises on an HTTP error
+or a page that is not a result page
+"""
+def scrape_executive_orders(url):
+    with timed("tx_governor_page") as call:
+        # sending a get request to the webpage and parsing the HTML content of the response
+        response = cached_get(SESSION, url, cacheable=is_result_page, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        orders = parse_executive_orders(response.content)
+        call.update(url=url, orders=len(orders), from_cache=getattr(response, "from_cache", False))
+    return orders
+
+# governor IDs are handed out in order of office, so the sitting governor has the highest
+def current_governor(governors):
+    return max(governors, key=lambda governor: int(governor[0]) if governor[0].isdigit() else -1)
+
+# orders are deduplicated by document number, or by PDF URL when a row has none
+def order_key(order):
+    return order["document_number"] or order["pdf_url"]
+
+"""
+checks the sitting governor's result table, the only one that still grows, against the
+last run: a 304 or an identical table leaves the output alone, and otherwise the table
+is merged into the saved orders (changed ones replaced, new ones in front) and the
+changes logged. the governor dropdown is read first, and the sitting governor taken
+from it; returns False, for a full scrape, when there is no saved output or the
+governors differ from the ones the last full scrape covered (a new governor took office)
+"""
+def update_current_governor(output_file=OUTPUT_FILE):
+    previous_orders = load_records(output_file)
+    if not previous_orders:
+        return False
+    tracker = ChangeTracker(fingerprint_path(output_file))
+
+    response = tracker.get(SESSION, "governors", SEARCH_FORM_URL, conditional=False, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    governors = parse_governors(response.content)
+    if not tracker.unchanged("governors", content=governors):
+        print("The governor list is not the one the last full scrape covered; scraping every governor.")
+        return False
+    governor_id, name = current_governor(governors)
+
+    url = SEARCH_URL.format(governor_id=governor_id)
+    response = tracker.get(SESSION, "current_governor", url, timeout=REQUEST_TIMEOUT)
+    if tracker.unchanged("current_governor", response=response):
+        print("Current governor's orders not modified since the last run.")
+        return True
+    response.raise_for_status()
+    orders = parse_executive_orders(response.content)
+    if tracker.unchanged("current_governor", content=orders):
+        print("Current governor's orders unchanged since the last run.")
+    else:
+        merged, changes = merge_records(previous_orders, orders, order_key, prepend=True)
+        if changes: # a table never fingerprinted before may still match the saved orders
+            write_json_atomic(output_file, merged)
+            append_changes(changelog_path(output_file), "tx_eos", changes)
+        print(f"Checked {name}'s {len(orders)} orders ({summarize_changes(changes)})")
+    tracker.update("current_governor", response, orders)
+    tracker.save()
+    return True
+
+"""
+scrapes every governor's executive orders: result pages are fetched concurrently over
+the shared session and merged, in dropdown order, into one output deduplicated by
+document_number; each governor is checkpointed so an interrupted run resumes, and a
+governor whose page fails is left unchecked and the output untouched until a rerun gets it
+once an output exists, later runs only re-check the sitting governor's table, as long as
+the governor dropdown still matches the last full scrape, unless full_refresh is set;
+a full scrape logs every difference from the previous output
+"""
+def run(output_file=OUTPUT_FILE, full_refresh=False):
+    sink_path = f"{os.path.splitext(output_file)[0]}.jsonl"
+    if not full_refresh and not os.path.exists(sink_path) and update_current_governor(output_file):
+        return
+
+    governors = get_governors()
+    print(f"Found {len(governors)} governors.")
+
+    previous_orders = load_records(output_file)
+    sink = JsonLinesSink(sink_path)
+    seen = {order_key(order) for order in sink.records()}
+    pending = [(governor_id, name) for governor_id, name in governors if not sink.is_done(governor_id)]
+    urls = [SEARCH_URL.format(governor_id=governor_id) for governor_id, _ in pending]
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = [executor.submit(scrape_executive_orders, url) for url in urls]
+        for (governor_id, name), future in zip(pending, futures):
+            try:
+                orders = future.result()
+            except (requests.RequestException, ValueError) as e:
+                failed.append(name)
+                print(f"{name}: failed to fetch executive orders: {e}")
+                continue
+            new_orders = [order for order in orders if order_key(order) not in seen]
+            for order in new_orders:
+                seen.add(order_key(order))
+                sink.write(order)
+            sink.mark_done(governor_id)
+            print(f"{name}: {len(orders)} executive orders ({len(orders) - len(new_orders)} duplicates skipped)")
+
+    if failed: # a partial scrape would drop the missing governors' orders from the output
+        sink.close()
+        print(f"\nCould not fetch {len(failed)} governor(s) ({', '.join(failed)}); {output_file} left unchanged, "
+              f"rerun to retry them")
+        return
+
+    diff = RecordDiff(previous_orders, order_key)
+    for order in sink.records():
+        diff.add(order)
+    changes = diff.changes + diff.removed()
+
+    order_count = sink.count
+    sink.finish(output_file)
+    append_changes(changelog_path(output_file), "tx_eos", changes)
+    tracker = ChangeTracker(fingerprint_path(output_file)) # the governors this output covers
+    tracker.update("governors", content=governors)
+    tracker.save()
+    print(f"\nSaved {order_count} executive orders to {output_file} ({summarize_changes(changes)})")
 
 def main():
     run()
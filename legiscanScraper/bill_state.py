@@ -0,0 +1,65 @@
+import json
+import sqlite3
+
+"""
+persistent per-bill sync state for LegiScan, keyed by bill_id
+stores the last seen masterlist change_hash and the extracted document record
+(record is NULL for bills that have not passed, so they are not refetched either)
+"""
+class BillStateStore:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=30) # several states may sync into one file at once
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bills (
+                bill_id INTEGER PRIMARY KEY,
+                state TEXT,
+                session_id INTEGER,
+                change_hash TEXT,
+                record TEXT
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS bills_session ON bills (session_id)")
+        self.conn.commit()
+
+    # returns {bill_id: change_hash} for every bill already synced in the session
+    def get_hashes(self, session_id):
+        rows = self.conn.execute(
+            "SELECT bill_id, change_hash FROM bills WHERE session_id = ?", (session_id,)
+        )
+        return dict(rows)
+
+    # records the latest hash and extracted record for a bill, committing right away
+    # so an interrupted sync keeps everything fetched so far
+    def save(self, bill_id, state, session_id, change_hash, record):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO bills (bill_id, state, session_id, change_hash, record) VALUES (?, ?, ?, ?, ?)",
+            (bill_id, state, session_id, change_hash, json.dumps(record) if record else None),
+        )
+        self.conn.commit()
+
+    # returns stored document records for the given bill ids, in the same order, skipping unpassed bills
+    def records(self, bill_ids):
+        bill_ids = list(bill_ids)
+        stored = {}
+        for start in range(0, len(bill_ids), 500): # stays under SQLite's bound-parameter limit
+            chunk = bill_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT bill_id, record FROM bills WHERE record IS NOT NULL AND bill_id IN ({placeholders})", chunk
+            )
+            stored.update(rows)
+        return [json.loads(stored[bill_id]) for bill_id in bill_ids if bill_id in stored]
+
+    # returns every stored document record of a session, e.g. when its masterlist can't be fetched
+    def records_for_session(self, session_id):
+        rows = self.conn.execute(
+            "SELECT record FROM bills WHERE session_id = ? AND record IS NOT NULL ORDER BY bill_id", (session_id,)
+        )
+        return [json.loads(record) for (record,) in rows]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,88 @@
+import base64
+import io
+import json
+import os
+import zipfile
+
+import legiscan_scraper
+from legiscan_scraper import extract_document_urls
+from scraperCommon.output import JsonLinesSink
+
+"""
+lists the bulk session datasets LegiScan publishes for a state, or None when the call fails
+each entry carries session_id, year_start, dataset_hash and the access_key getDataset needs
+"""
+def get_dataset_list(state):
+    params = {"key": legiscan_scraper.API_KEY, "op": "getDatasetList", "state": state}
+    data = legiscan_scraper.get_json(legiscan_scraper.BASE_URL, params)
+    return data["datasetlist"] if data else None
+
+"""
+downloads one session dataset and returns the raw ZIP archive bytes
+"""
+def get_dataset_archive(session_id, access_key):
+    params = {"key": legiscan_scraper.API_KEY, "op": "getDataset", "id": session_id, "access_key": access_key}
+    data = legiscan_scraper.get_json(legiscan_scraper.BASE_URL, params)
+    return base64.b64decode(data["dataset"]["zip"]) if data else None
+
+"""
+yields bill objects straight out of a dataset archive, one member at a time,
+without extracting anything to disk; bill files live under <STATE>/<session>/bill/
+"""
+def iter_archive_bills(archive_bytes):
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+        for name in archive.namelist():
+            if "/bill/" not in name or not name.endswith(".json"):
+                continue
+            with archive.open(name) as member:
+                yield json.load(member)["bill"]
+
+"""
+builds the same {state}_legiscan_documents.json output as collect_bills,
+using one getDataset call per session instead of one getBill call per bill
+like collect_bills, a failed dataset list raises and a dataset that can't be downloaded
+leaves the output untouched for a rerun to resume; the checkpoint file is this path's own,
+so an interrupted run never resumes inside collect_bills or the other way round
+returns the number of documents saved, or None when the run is left unfinished
+"""
+def collect_bills_from_datasets(state, start_year, output_dir="."):
+    output_file = os.path.join(output_dir, f"{state}_legiscan_documents.json")
+
+    datasets = get_dataset_list(state)
+    if not datasets: # every state has session datasets, so this is a failed call
+        raise RuntimeError(f"getDatasetList returned no datasets for {state}")
+    sink = JsonLinesSink(os.path.join(output_dir, f"{state}_legiscan_datasets.jsonl"))
+    failed_datasets = []
+    recent_datasets = [d for d in datasets if d.get("year_start", 0) >= start_year]
+    print(f"Found {len(recent_datasets)} datasets for {state} from {start_year} onward.")
+
+    for dataset in recent_datasets:
+        session_id = dataset["session_id"]
+        if sink.is_done(f"session:{session_id}"):
+            continue
+        print(f"Downloading dataset: {dataset.get('session_name')} (ID {session_id})")
+
+        archive_bytes = get_dataset_archive(session_id, dataset["access_key"])
+        if not archive_bytes:
+            print("  Could not download the dataset; it is retried on the next run.")
+            failed_datasets.append(dataset.get("session_name") or str(session_id))
+            continue
+
+        bill_count = 0
+        for bill in iter_archive_bills(archive_bytes):
+            bill_count += 1
+            if bill.get("passed") == 1: # only include passed bills
+                sink.write(extract_document_urls(bill))
+        sink.mark_done(f"session:{session_id}")
+        print(f"  Read {bill_count} bills from archive.")
+
+    document_count = sink.count
+    if failed_datasets: # finishing would drop those sessions' bills from the output
+        sink.close()
+        print(f"\nCould not download {len(failed_datasets)} dataset(s) ({', '.join(failed_datasets)}); "
+              f"{output_file} left unchanged, rerun to resume")
+        return None
+    sink.finish(output_file)
+
+    print(f"\nSaved {document_count} passed bill documents to {output_file}")
+    return document_count
@@ -0,0 +1,23 @@
+import time
+
+from multi_state import ALL_STATES, run_states, print_summary, parse_years
+from scraperCommon.framework import Scraper, register
+
+@register
+class LegiScanBills(Scraper):
+    name = "legiscan"
+    description = "passed bills and their documents from the LegiScan API, for --states"
+
+    def run(self, options):
+        states = [state.upper() for state in options.states]
+        if states == ["ALL"]:
+            states = ALL_STATES
+        start_year, end_year = parse_years(options.years)
+
+        started = time.monotonic()
+        summaries = run_states(
+            states, start_year, end_year, parallel_states=options.parallel_states,
+            workers=options.workers, requests_per_second=options.rps,
+            output_dir=options.output_dir, state_db=options.state_db or None,
+        )
+        print_summary(summaries, time.monotonic() - started)
@@ -1,23 +1,60 @@
-import requests
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import os
+import sys
+from bill_state import BillStateStore
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # repo root, for scraperCommon
+from scraperCommon.http import shared_session
+from scraperCommon.http_cache import cached_get
+from scraperCommon.metrics import count, timed
+from scraperCommon.output import JsonLinesSink
+from scraperCommon.rate_limit import TokenBucket
 
 # load API key from .env file
 load_dotenv()
 API_KEY = os.getenv("API_KEY") # legiscan API key from env
 BASE_URL = "https://api.legiscan.com/"
 REQUEST_DELAY = 1  # seconds between API calls to avoid rate-limiting
+REQUESTS_PER_SECOND = 1  # API budget for concurrent mode, same rate as the serial REQUEST_DELAY
+MAX_WORKERS = 8  # upper bound on concurrent getBill calls
+STATE_DB = "legiscan_state.sqlite"  # change_hash store used for incremental syncs
+
+# one pooled session reused by every API call (and shared with the other scrapers in this process)
+SESSION = shared_session()
+
+"""
+only successful API answers are cached; LegiScan reports errors with HTTP 200
+"""
+def is_ok_response(response):
+    try:
+        return response.status_code == 200 and response.json().get("status") == "OK"
+    except ValueError:
+        return False
 
 """
 sends a GET request to the LegiScan API and returns JSON if successful
+goes through the shared response cache when one is configured, and waits on
+the rate limiter before any request that actually reaches the network
+each call is timed per API op, with cache hits and API-level errors counted
 """
-def get_json(url, params):
+def get_json(url, params, rate_limiter=None):
+    op = params.get("op")
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        with timed("legiscan_request", op=op) as call:
+            response = cached_get(
+                SESSION, url, params=params,
+                on_miss=rate_limiter.acquire if rate_limiter else None, # cache hits cost no API budget
+                cacheable=is_ok_response,
+            )
+            call["from_cache"] = getattr(response, "from_cache", False)
+            response.raise_for_status()
+            data = response.json()
+            if data["status"] != "OK":
+                call["result"] = "api_error"
+                call["message"] = data.get("alert", {}).get("message")
+                count("legiscan_api_errors_total", op=op)
         if data["status"] == "OK":
             return data
         else:
@@ -30,27 +67,49 @@ def get_json(url, params):
 """
 fetches all legislative sessions for the given state
 """
-def get_sessions(state):
+def get_sessions(state, rate_limiter=None):
     params = {"key": API_KEY, "op": "getSessionList", "state": state}
-    data = get_json(BASE_URL, params)
+    data = get_json(BASE_URL, params, rate_limiter)
     return data["sessions"] if data else []
 
 """
-retrieves all bills for a given session
+retrieves all bills for a given session; None when the call fails, so a failure is not
+mistaken for a session that has no bills yet
 """
-def get_bills(session_id):
+def get_bills(session_id, rate_limiter=None):
     params = {"key": API_KEY, "op": "getMasterList", "id": session_id}
-    data = get_json(BASE_URL, params)
-    return list(data["masterlist"].values())[1:] if data else [] # skips the summary metadata at index 0
+    data = get_json(BASE_URL, params, rate_limiter)
+    return list(data["masterlist"].values())[1:] if data else None # skips the summary metadata at index 0
 
 """
 fetches detailed info for an individual bill
 """
-def get_bill_details(bill_id):
+def get_bill_details(bill_id, rate_limiter=None):
     params = {"key": API_KEY, "op": "getBill", "id": bill_id}
-    data = get_json(BASE_URL, params)
+    data = get_json(BASE_URL, params, rate_limiter)
     return data["bill"] if data else None
 
+"""
+fetches bill details concurrently on a bounded thread pool, yielding results
+in the same order as bill_ids; the shared token bucket replaces the fixed sleep
+"""
+def fetch_bill_details(bill_ids, rate_limiter, workers=MAX_WORKERS):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(lambda bill_id: get_bill_details(bill_id, rate_limiter), bill_ids)
+
+"""
+yields (bill_id, bill_detail) pairs, concurrently when a rate limiter is given,
+otherwise one call at a time with the fixed REQUEST_DELAY between calls
+"""
+def iter_bill_details(bill_ids, rate_limiter=None, workers=1):
+    if rate_limiter:
+        yield from zip(bill_ids, fetch_bill_details(bill_ids, rate_limiter, workers))
+        return
+
+    for bill_id in bill_ids:
+        yield bill_id, get_bill_details(bill_id)
+        time.sleep(REQUEST_DELAY) # to avoid hitting API rate limits
+
 """
 extracts document URLs (text, amendments, supplements) from a bill object
 """
@@ -66,37 +125,121 @@ def extract_document_urls(bill):
 
 """
 filters sessions by year, finds passed bills, and saves relevant document URLs
+with workers > 1, bill details are fetched concurrently under a requests_per_second budget;
+a rate_limiter passed in (e.g. one shared by several states) takes precedence over that budget
+with state_db set, only bills whose masterlist change_hash differs from the last sync
+are fetched, and the output is merged from the stored records (all of a session's
+stored records when its masterlist can't be fetched)
+records are streamed to a checkpointed .jsonl file as they are found, so a crashed
+run picks up where it stopped; returns a summary of the run for progress reporting
+a failed session list raises before anything is written, and without state_db a session
+whose masterlist or any of whose bills can't be fetched is left unfinished: the output is
+not replaced and a rerun resumes it (with state_db, failed bills are retried next sync)
 """
-def collect_bills(state, start_year):
-    output_file = f"{state}_legiscan_documents.json"
-    all_documents = []
-
-    sessions = get_sessions(state)
-    recent_sessions = [s for s in sessions if s.get("year_start", 0) >= start_year]
+def collect_bills(state, start_year, workers=1, requests_per_second=REQUESTS_PER_SECOND, state_db=None,
+                  end_year=None, output_dir=".", rate_limiter=None):
+    started = time.monotonic()
+    output_file = os.path.join(output_dir, f"{state}_legiscan_documents.json")
+    if rate_limiter is None and workers > 1:
+        rate_limiter = TokenBucket(requests_per_second)
+
+    sessions = get_sessions(state, rate_limiter)
+    if not sessions: # every state has sessions, so this is a failed call; the last output stays as it is
+        raise RuntimeError(f"getSessionList returned no sessions for {state}")
+    sink = JsonLinesSink(f"{output_file[:-len('.json')]}.jsonl")
+    store = BillStateStore(state_db) if state_db else None
+    bills_seen = 0
+    bills_fetched = 0
+    bills_failed = 0
+    failed_sessions = []
+
+    recent_sessions = [
+        s for s in sessions
+        if s.get("year_start", 0) >= start_year and (end_year is None or s.get("year_start", 0) <= end_year)
+    ]
     print(f"Found {len(recent_sessions)} sessions for {state} from {start_year} onward.")
 
     for session in recent_sessions:
         session_id = session["session_id"]
         session_name = session["session_name"]
+        if sink.is_done(f"session:{session_id}"):
+            print(f"Skipping session already saved: {session_name} (ID {session_id})")
+            continue
         print(f"Processing session: {session_name} (ID {session_id})")
 
-        bills = get_bills(session_id)
+        bills = get_bills(session_id, rate_limiter)
+        if bills is None:
+            if store: # keep what the last sync stored; the session is checked again on the next sync
+                stored = store.records_for_session(session_id)
+                for doc_urls in stored:
+                    sink.write(doc_urls)
+                sink.mark_done(f"session:{session_id}")
+                print(f"  Could not fetch the bill list; kept {len(stored)} stored records from the last sync.")
+                continue
+            print(f"  Could not fetch the bill list for {session_name}; it is retried on the next run.")
+            failed_sessions.append(session_name)
+            continue
+        bills_seen += len(bills)
         print(f"  Found {len(bills)} bills.")
 
-        for bill in bills:
-            bill_id = bill.get("bill_id")
-            bill_detail = get_bill_details(bill_id)
-
+        to_fetch = [b for b in bills if not sink.is_done(b.get("bill_id"))]
+        if store:
+            known = store.get_hashes(session_id)
+            to_fetch = [
+                b for b in bills
+                if b.get("bill_id") not in known or known[b.get("bill_id")] != b.get("change_hash")
+            ]
+            print(f"  {len(to_fetch)} new or changed since last sync.")
+        change_hashes = {b.get("bill_id"): b.get("change_hash") for b in to_fetch}
+
+        session_failures = 0
+        for bill_id, bill_detail in iter_bill_details(list(change_hashes), rate_limiter, workers):
+            if not bill_detail:
+                session_failures += 1
+            doc_urls = None
             if bill_detail and bill_detail.get("passed") == 1: # only include passed bills
                 doc_urls = extract_document_urls(bill_detail)
-                all_documents.append(doc_urls)
 
-            time.sleep(REQUEST_DELAY) # to avoid hitting API rate limits
-
-    with open(output_file, "w") as f:
-        json.dump(all_documents, f, indent=2)
+            if store:
+                if bill_detail: # failed fetches keep their old hash and are retried next sync
+                    store.save(bill_id, state, session_id, change_hashes[bill_id], doc_urls)
+            elif bill_detail:
+                if doc_urls:
+                    sink.write(doc_urls)
+                sink.mark_done(bill_id)
+
+        bills_fetched += len(change_hashes) - session_failures
+        bills_failed += session_failures
+        if session_failures and not store: # the session stays unfinished, so a resumed run retries those bills
+            print(f"  Could not fetch {session_failures} bills; they are retried on the next run.")
+            failed_sessions.append(session_name)
+            continue
+        if store: # the store already checkpoints each bill, so the session's records are written in one go
+            for doc_urls in store.records(b.get("bill_id") for b in bills):
+                sink.write(doc_urls)
+        sink.mark_done(f"session:{session_id}")
+
+    if store:
+        store.close()
+
+    document_count = sink.count
+    summary = {
+        "state": state,
+        "sessions": len(recent_sessions),
+        "bills_seen": bills_seen,
+        "bills_fetched": bills_fetched,
+        "bills_failed": bills_failed,
+        "documents": document_count,
+        "elapsed": time.monotonic() - started,
+    }
+    if failed_sessions: # finishing would drop those sessions' bills from the output
+        sink.close()
+        print(f"\nCould not finish {len(failed_sessions)} session(s); {output_file} left unchanged, rerun to resume")
+        return {**summary, "error": f"failed API calls in {', '.join(failed_sessions)}"}
+    sink.finish(output_file)
 
-    print(f"\nSaved {len(all_documents)} passed bill documents to {output_file}")
+    print(f"\nSaved {document_count} passed bill documents to {output_file}")
+    return summary
 
 """
 entry point to collect documents for a given state and year
@@ -104,7 +247,7 @@ entry point to collect documents for a given state and year
 def main():
     state = "NY" # state abbreviation for LegiScan API
     start_year = 2023 # filter sessions starting in this year or later
-    collect_bills(state, start_year)
+    collect_bills(state, start_year, state_db=STATE_DB)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from legiscan_scraper import collect_bills, MAX_WORKERS, REQUESTS_PER_SECOND, STATE_DB
+from scraperCommon.rate_limit import TokenBucket
+
+# every jurisdiction LegiScan tracks, used when --states ALL is given
+ALL_STATES = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC", "US",
+]
+
+"""
+parses a year range such as "2019-2024" or a single year "2023" into (start, end);
+an open range like "2023-" has no end year
+"""
+def parse_years(value):
+    start, sep, end = value.partition("-")
+    if not sep:
+        return int(start), int(start)
+    return int(start), int(end) if end else None
+
+"""
+runs collect_bills for several states in parallel, all drawing from one
+global token bucket so the combined request rate stays within the API budget
+returns the per-state summaries in the order the states were given
+"""
+def run_states(states, start_year, end_year=None, parallel_states=4, workers=MAX_WORKERS,
+               requests_per_second=REQUESTS_PER_SECOND, output_dir=".", state_db=None):
+    os.makedirs(output_dir, exist_ok=True)
+    rate_limiter = TokenBucket(requests_per_second)
+    summaries = {}
+
+    with ThreadPoolExecutor(max_workers=parallel_states) as executor:
+        futures = {
+            executor.submit(
+                collect_bills, state, start_year, workers=workers, state_db=state_db,
+                end_year=end_year, output_dir=output_dir, rate_limiter=rate_limiter,
+            ): state
+            for state in states
+        }
+        for future in as_completed(futures):
+            state = futures[future]
+            try:
+                summaries[state] = future.result()
+            except Exception as e:
+                print(f"State {state} failed: {e}")
+                summaries[state] = {"state": state, "error": str(e)}
+            print(f"Finished {state} ({len(summaries)}/{len(states)})")
+
+    return [summaries[state] for state in states]
+
+"""
+prints one line per state with bill counts and throughput
+"""
+def print_summary(summaries, elapsed):
+    print(f"\n{'state':<6}{'sessions':>9}{'bills':>8}{'fetched':>9}{'failed':>8}{'docs':>7}{'secs':>9}{'bills/s':>9}")
+    for s in summaries:
+        if "error" in s:
+            print(f"{s['state']:<6}  failed: {s['error']}")
+            continue
+        rate = s["bills_fetched"] / s["elapsed"] if s["elapsed"] else 0
+        print(f"{s['state']:<6}{s['sessions']:>9}{s['bills_seen']:>8}{s['bills_fetched']:>9}{s['bills_failed']:>8}"
+              f"{s['documents']:>7}{s['elapsed']:>9.1f}{rate:>9.1f}")
+    fetched = sum(s.get("bills_fetched", 0) for s in summaries)
+    print(f"\nTotal: {fetched} bills fetched in {elapsed:.1f} s ({fetched / elapsed if elapsed else 0:.1f} bills/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect passed LegiScan bills for several states in parallel")
+    parser.add_argument("--states", nargs="+", default=["NY"], help="state abbreviations, or ALL")
+    parser.add_argument("--years", default="2023-", help='session start years, e.g. "2023", "2019-2024" or "2023-"')
+    parser.add_argument("--parallel-states", type=int, default=4, help="states processed at the same time")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="concurrent getBill calls per state")
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND, help="global API budget in requests per second")
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--state-db", default=STATE_DB, help='incremental sync store, or "" to refetch everything')
+    args = parser.parse_args()
+
+    states = ALL_STATES if [s.upper() for s in args.states] == ["ALL"] else [s.upper() for s in args.states]
+    start_year, end_year = parse_years(args.years)
+
+    started = time.monotonic()
+    summaries = run_states(
+        states, start_year, end_year, parallel_states=args.parallel_states, workers=args.workers,
+        requests_per_second=args.rps, output_dir=args.output_dir, state_db=args.state_db or None,
+    )
+    print_summary(summaries, time.monotonic() - started)
+
+if __name__ == "__main__":
+    main()
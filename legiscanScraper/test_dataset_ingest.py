@@ -0,0 +1,80 @@
+import base64
+import io
+import json
+import zipfile
+
+import pytest
+
+import dataset_ingest
+import legiscan_scraper
+
+SESSION = {"session_id": 2100, "session_name": "2025-2026 Regular Session", "year_start": 2025}
+
+def bill(bill_id, passed):
+    return {
+        "bill_id": bill_id,
+        "bill_number": f"HB{bill_id}",
+        "passed": passed,
+        "session": {"session_id": SESSION["session_id"], "session_name": SESSION["session_name"]},
+        "texts": [{"url": f"https://legiscan.com/WA/text/HB{bill_id}"}],
+        "amendments": [],
+        "supplements": [],
+    }
+
+# a dataset archive laid out like LegiScan's: <STATE>/<session>/bill/<number>.json, plus other members
+def dataset_zip(bills):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for b in bills:
+            archive.writestr(f"WA/2025-2026_Regular_Session/bill/{b['bill_number']}.json", json.dumps({"bill": b}))
+        archive.writestr("WA/2025-2026_Regular_Session/people/1.json", json.dumps({"person": {"people_id": 1}}))
+    return buffer.getvalue()
+
+# answers get_json from a dataset list and an archive; None for either simulates a failed call
+def stub_api(monkeypatch, archive, datasets=(SESSION,)):
+    def get_json(url, params, rate_limiter=None):
+        if params["op"] == "getDatasetList":
+            return None if datasets is None else {"status": "OK", "datasetlist": [dict(d, access_key="key") for d in datasets]}
+        if params["op"] == "getDataset":
+            return None if archive is None else {"status": "OK", "dataset": {"zip": base64.b64encode(archive).decode()}}
+        raise AssertionError(f"unexpected call {params['op']}")
+    monkeypatch.setattr(legiscan_scraper, "get_json", get_json)
+
+def read_output(tmp_path):
+    with open(tmp_path / "WA_legiscan_documents.json") as f:
+        return json.load(f)
+
+def test_only_passed_bills_are_saved(monkeypatch, tmp_path):
+    stub_api(monkeypatch, dataset_zip([bill(1, 1), bill(2, 0), bill(3, 1)]))
+
+    assert dataset_ingest.collect_bills_from_datasets("WA", 2025, output_dir=tmp_path) == 2
+    records = read_output(tmp_path)
+    assert [r["bill_number"] for r in records] == ["HB1", "HB3"]
+    assert records[0]["texts"] == ["https://legiscan.com/WA/text/HB1"]
+    assert records[0]["session"] == SESSION["session_name"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["WA_legiscan_documents.json"]
+
+def test_failed_download_keeps_the_previous_output_and_resumes(monkeypatch, tmp_path):
+    previous = [{"bill_number": "HB9"}]
+    (tmp_path / "WA_legiscan_documents.json").write_text(json.dumps(previous))
+    stub_api(monkeypatch, None)
+
+    assert dataset_ingest.collect_bills_from_datasets("WA", 2025, output_dir=tmp_path) is None
+    assert read_output(tmp_path) == previous
+    # the checkpoint is the dataset path's own, never collect_bills' WA_legiscan_documents.jsonl
+    assert not (tmp_path / "WA_legiscan_documents.jsonl").exists()
+    assert (tmp_path / "WA_legiscan_datasets.jsonl").exists()
+
+    stub_api(monkeypatch, dataset_zip([bill(1, 1)]))
+    assert dataset_ingest.collect_bills_from_datasets("WA", 2025, output_dir=tmp_path) == 1
+    assert [r["bill_number"] for r in read_output(tmp_path)] == ["HB1"]
+
+def test_failed_dataset_list_raises_without_touching_the_output(monkeypatch, tmp_path):
+    previous = [{"bill_number": "HB9"}]
+    (tmp_path / "WA_legiscan_documents.json").write_text(json.dumps(previous))
+    stub_api(monkeypatch, dataset_zip([bill(1, 1)]), datasets=None)
+
+    with pytest.raises(RuntimeError):
+        dataset_ingest.collect_bills_from_datasets("WA", 2025, output_dir=tmp_path)
+    assert read_output(tmp_path) == previous
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["WA_legiscan_documents.json"]
@@ -0,0 +1,248 @@
+import argparse
+import multiprocessing
+import os
+import sys
+
+# the scraper folders are plain script directories, so their modules are imported by file name
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [
+    os.path.join(ROOT, "executiveOrderScrapers"), os.path.join(ROOT, "legiscanScraper"), os.path.join(ROOT, "documentScraper"),
+]
+
+import downloader
+import legiscan_scraper
+import ny_EOs
+import render_service
+import tx_EOs
+from multi_state import ALL_STATES, parse_years
+from scraperCommon.doc_store import DocumentStore
+from scraperCommon.http import HostLimiter, make_session
+from scraperCommon.output import write_json_atomic
+from scraperCommon.rate_limit import SharedTokenBucket
+from scraperCommon.sources import document_urls, load_document_urls
+from scraperCommon.work_queue import WorkQueue, default_worker_id, run_worker
+
+QUEUE_DB = "work_queue.sqlite"
+
+"""
+task handlers for one worker process, keyed by task kind
+
+legiscan_state -> legiscan_session (one per session in the year range) -> legiscan_bill
+(one per bill, keyed by bill_id and masterlist change_hash, so re-seeding only refetches
+changed bills); ny_page 0 (re)queues the other listing pages; tx_governors enqueues one
+tx_governor per result table; with documents set in a payload, the document URLs found
+are enqueued as document tasks. every handler is idempotent, so a task that runs twice
+after a lapsed lease does no harm, and raises on a failed fetch (an HTTP error, an empty
+session list, a TX page without its results table) so the queue retries it with backoff.
+LegiScan calls from all workers share one requests-per-second budget through the queue file.
+document pages are rendered on the worker's renderer, whose browser outlives the task
+"""
+def make_handlers(queue, options, renderer):
+    rate_limiter = SharedTokenBucket(options.queue, "legiscan", options.rps)
+    store = DocumentStore(options.store) if options.store else None
+    download_session = make_session(downloader.MAX_WORKERS, downloader.HEADERS)
+    host_limiter = HostLimiter(downloader.PER_HOST_LIMIT)
+
+    def enqueue_documents(records, payload):
+        if payload.get("documents"):
+            queue.enqueue_many("document", ((url, {"url": url}) for url in document_urls(records)))
+
+    def legiscan_state(payload):
+        sessions = legiscan_scraper.get_sessions(payload["state"], rate_limiter)
+        if not sessions: # every state has sessions, so this is a failed call
+            raise RuntimeError("getSessionList returned no sessions")
+        start_year, end_year = payload["start_year"], payload.get("end_year")
+        recent = [
+            s for s in sessions
+            if s.get("year_start", 0) >= start_year and (end_year is None or s.get("year_start", 0) <= end_year)
+        ]
+        for session in recent: # masterlists change between runs, so they are re-read whenever the state is
+            queue.enqueue("legiscan_session", session["session_id"], {**payload, "session_id": session["session_id"]}, reset=True)
+        return {"sessions": len(recent)}
+
+    def legiscan_session(payload):
+        bills = legiscan_scraper.get_bills(payload["session_id"], rate_limiter)
+        if bills is None:
+            raise RuntimeError("getMasterList returned no bills")
+        added = queue.enqueue_many("legiscan_bill", (
+            (f"{bill['bill_id']}:{bill.get('change_hash')}", {**payload, "bill_id": bill["bill_id"]}) for bill in bills
+        ))
+        return {"bills": len(bills), "new_or_changed": added}
+
+    def legiscan_bill(payload):
+        bill = legiscan_scraper.get_bill_details(payload["bill_id"], rate_limiter)
+        if not bill:
+            raise RuntimeError("getBill failed")
+        if bill.get("passed") != 1: # only passed bills are kept
+            return None
+        record = legiscan_scraper.extract_document_urls(bill)
+        enqueue_documents([record], payload)
+        return record
+
+    def ny_page(payload):
+        page = payload["page"]
+        html = ny_EOs.fetch_listing_html(page)
+        orders = ny_EOs.parse_listing_page(html, ny_EOs.listing_url(page))
+        last_page = ny_EOs.parse_last_page(html) if page == 0 else None
+        if last_page is not None:
+            # pages from earlier runs are re-read too: orders shift down the listing as new ones appear
+            queue.enqueue_many("ny_page", ((n, {**payload, "page": n}) for n in range(1, last_page + 1)), reset=True)
+        elif page == 0 or payload.get("chained"): # no pager: walk on until an empty page
+            if orders:
+                queue.enqueue("ny_page", page + 1, {**payload, "page": page + 1, "chained": True}, reset=True)
+        enqueue_documents(orders, payload)
+        return orders
+
+    def tx_governors(payload):
+        for governor_id, name in tx_EOs.get_governors():
+            queue.enqueue("tx_governor", governor_id, {**payload, "governor_id": governor_id, "name": name}, reset=True)
+
+    def tx_governor(payload):
+        orders = tx_EOs.scrape_executive_orders(tx_EOs.SEARCH_URL.format(governor_id=payload["governor_id"]))
+        enqueue_documents(orders, payload)
+        return orders
+
+    def document(payload):
+        url = payload["url"]
+        # named after the whole URL, so NY Senate /download pages or EO.pdf files from different
+        # URLs neither pass for each other's earlier render nor share a .part file across workers
+        output_path = os.path.join(options.output_dir, downloader.output_filename(url))
+        if url.lower().endswith(".pdf"):
+            ok = downloader.download_file(download_session, host_limiter, url, output_path, store)
+        elif store.path_for(url) if store else os.path.exists(output_path):
+            ok = True # rendered by an earlier run
+        else:
+            ok = downloader.render_document(renderer, url, output_path, store)
+        if not ok:
+            raise RuntimeError(f"could not fetch {url}")
+        return {"path": store.path_for(url) if store else output_path}
+
+    return {
+        "legiscan_state": legiscan_state,
+        "legiscan_session": legiscan_session,
+        "legiscan_bill": legiscan_bill,
+        "ny_page": ny_page,
+        "tx_governors": tx_governors,
+        "tx_governor": tx_governor,
+        "document": document,
+    }
+
+"""
+one worker process: drains the queue until nothing it can run is left; its browser is
+only launched if a page needs rendering, and then reused for every page after it
+"""
+def work(options, worker_number):
+    os.makedirs(options.output_dir, exist_ok=True)
+    worker_id = f"{default_worker_id()}/{worker_number}"
+    with WorkQueue(options.queue) as queue, render_service.BackgroundRenderer() as renderer:
+        handlers = make_handlers(queue, options, renderer)
+        stats = run_worker(queue, handlers, kinds=options.kinds, worker_id=worker_id, wait=options.wait)
+    print(f"[{worker_id}] {stats['done']} done, {stats['retried']} retried, {stats['failed']} failed, "
+          f"{stats['duplicate']} already done elsewhere")
+
+def seed(queue, options):
+    if options.source == "legiscan":
+        states = ALL_STATES if [state.upper() for state in options.states] == ["ALL"] else [state.upper() for state in options.states]
+        start_year, end_year = parse_years(options.years)
+        for state in states:
+            payload = {"state": state, "start_year": start_year, "end_year": end_year, "documents": options.documents}
+            queue.enqueue("legiscan_state", f"{state}:{options.years}", payload, reset=True)
+        print(f"Queued {len(states)} LegiScan state(s)")
+    elif options.source == "ny_eos":
+        queue.enqueue("ny_page", 0, {"page": 0, "documents": options.documents}, reset=True)
+        print("Queued the NY listing")
+    elif options.source == "tx_eos":
+        queue.enqueue("tx_governors", "search", {"documents": options.documents}, reset=True)
+        print("Queued the TX governor list")
+    else:
+        urls = load_document_urls(options.outputs)
+        print(f"Queued {queue.enqueue_many('document', ((url, {'url': url}) for url in urls))} of {len(urls)} document URLs")
+
+"""
+writes the usual scraper output files from the completed tasks: one
+<STATE>_legiscan_documents.json per state, ny_executive_orders.json and tx_executive_orders.json
+"""
+def export(queue, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    bills = {}
+    for _, payload, record in queue.results("legiscan_bill"):
+        if record: # a bill's latest change_hash comes last and replaces earlier versions
+            bills.setdefault(payload["state"], {})[payload["bill_id"]] = record
+    outputs = {f"{state}_legiscan_documents.json": list(records.values()) for state, records in bills.items()}
+
+    for kind, output_file, order_key in (
+        ("ny_page", ny_EOs.CURRENT_OUTPUT_FILE, ny_EOs.order_key),
+        ("tx_governor", "tx_executive_orders.json", tx_EOs.order_key),
+    ):
+        orders = {}
+        for _, _, page_orders in queue.results(kind):
+            for order in page_orders:
+                orders.setdefault(order_key(order), order)
+        if orders:
+            outputs[output_file] = list(orders.values())
+
+    for output_file, records in outputs.items():
+        write_json_atomic(os.path.join(output_dir, output_file), records)
+        print(f"Wrote {len(records)} records to {os.path.join(output_dir, output_file)}")
+
+"""
+work-queue mode: seed tasks into a shared SQLite queue, then drain it with any number of
+worker processes, on this machine or on others sharing the queue file, e.g.
+  python run_queue.py seed legiscan --states ALL --years 2023- --documents
+  python run_queue.py work --processes 8
+  python run_queue.py status
+  python run_queue.py export --output-dir downloads
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Run scrapers and downloads from a shared work queue")
+    parser.add_argument("--queue", default=QUEUE_DB, help="queue database shared by every worker")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = subparsers.add_parser("seed", help="queue the root tasks of a source")
+    seed_parser.add_argument("source", choices=["legiscan", "ny_eos", "tx_eos", "documents"])
+    seed_parser.add_argument("outputs", nargs="*", help="for documents: scraper output JSON files")
+    seed_parser.add_argument("--states", nargs="+", default=["NY"], help="state abbreviations, or ALL")
+    seed_parser.add_argument("--years", default="2023-", help='session start years, e.g. "2023", "2019-2024" or "2023-"')
+    seed_parser.add_argument("--documents", action="store_true", help="also queue every document URL found")
+
+    work_parser = subparsers.add_parser("work", help="drain the queue with worker processes")
+    work_parser.add_argument("--processes", type=int, default=1)
+    work_parser.add_argument("--kinds", nargs="+", help="only run these task kinds")
+    work_parser.add_argument("--wait", action="store_true", help="keep polling for new tasks instead of exiting when idle")
+    work_parser.add_argument("--rps", type=float, default=legiscan_scraper.REQUESTS_PER_SECOND,
+                             help="LegiScan API budget in requests per second, shared by every worker on the queue")
+    work_parser.add_argument("--output-dir", default="downloads", help="where documents are downloaded")
+    work_parser.add_argument("--store", help="document store directory, instead of files in --output-dir")
+
+    subparsers.add_parser("status", help="print task counts and failures")
+    retry_parser = subparsers.add_parser("retry", help="queue failed tasks again")
+    retry_parser.add_argument("--kind")
+    export_parser = subparsers.add_parser("export", help="write scraper outputs from the completed tasks")
+    export_parser.add_argument("--output-dir", default="downloads")
+    args = parser.parse_args()
+
+    if args.command == "work":
+        WorkQueue(args.queue).close() # creates the schema before the workers race for it
+        context = multiprocessing.get_context("spawn") # fresh interpreters: no shared sockets or SQLite handles
+        processes = [context.Process(target=work, args=(args, number)) for number in range(args.processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return
+
+    with WorkQueue(args.queue) as queue:
+        if args.command == "seed":
+            seed(queue, args)
+        elif args.command == "retry":
+            print(f"Queued {queue.retry_failed(args.kind)} failed task(s) again")
+        elif args.command == "export":
+            export(queue, args.output_dir)
+        else:
+            for kind, status, count in queue.counts():
+                print(f"{kind:<18}{status:<9}{count:>8}")
+            for kind, key, error in queue.failures()[:20]:
+                print(f"failed: {kind} {key}: {error}")
+
+if __name__ == "__main__":
+    main()
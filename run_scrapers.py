@@ -0,0 +1,67 @@
+import argparse
+import glob
+import os
+import sys
+
+# the scraper folders are plain script directories, so their modules are imported by file name
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(ROOT, "executiveOrderScrapers"), os.path.join(ROOT, "legiscanScraper")]
+
+import eo_plugins  # noqa: F401  registers ny_eos, ny_past_eos, ca_eos, tx_eos
+import legiscan_plugin  # noqa: F401  registers legiscan
+from legiscan_scraper import MAX_WORKERS, REQUESTS_PER_SECOND, STATE_DB
+from scraperCommon.framework import REGISTRY, run_scrapers
+from scraperCommon.http import DEFAULT_MAX_CONNECTIONS, DEFAULT_PER_HOST
+from scraperCommon import metrics
+from scraperCommon.columnar import FORMATS, export_file
+
+"""
+runs any set of registered scrapers concurrently on one event loop, sharing one
+connection pool under global and per-host limits, and prints how each one went
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Run policy scrapers concurrently")
+    parser.add_argument("scrapers", nargs="*", help="scrapers to run (default: all but ny_past_eos); see --list")
+    parser.add_argument("--list", action="store_true", help="list the registered scrapers and exit")
+    parser.add_argument("--output-dir", default="downloads")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS, help="requests in flight overall")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="requests in flight per host")
+    parser.add_argument("--log-json", help='write structured JSON logs to this file ("-" for stderr)')
+    parser.add_argument("--metrics-file", help="write metrics here at exit (Prometheus text, or JSON for a .json path)")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port while running")
+    parser.add_argument("--export-dir", help="also export the outputs to a partitioned Parquet/Arrow dataset here")
+    parser.add_argument("--export-format", choices=sorted(FORMATS), default="parquet")
+
+    legiscan = parser.add_argument_group("legiscan")
+    legiscan.add_argument("--states", nargs="+", default=["NY"], help="state abbreviations, or ALL")
+    legiscan.add_argument("--years", default="2023-", help='session start years, e.g. "2023", "2019-2024" or "2023-"')
+    legiscan.add_argument("--parallel-states", type=int, default=4)
+    legiscan.add_argument("--workers", type=int, default=MAX_WORKERS, help="concurrent getBill calls per state")
+    legiscan.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND, help="LegiScan API budget in requests per second")
+    legiscan.add_argument("--state-db", default=STATE_DB, help='incremental sync store, or "" to refetch everything')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, scraper in sorted(REGISTRY.items()):
+            print(f"{name:<14}{scraper.description}")
+        return
+
+    metrics.configure(args.log_json, args.metrics_file, args.metrics_port)
+    names = args.scrapers or [name for name in REGISTRY if name != "ny_past_eos"]
+    os.makedirs(args.output_dir, exist_ok=True)
+    results = run_scrapers(names, args, max_connections=args.max_connections, per_host=args.per_host)
+
+    print("\nScraper summary:")
+    for result in results:
+        status = "ok" if result["ok"] else f"failed: {result['error']}"
+        print(f"  {result['name']:<14}{result['elapsed']:>8.1f} s  {status}")
+    if args.export_dir:
+        for path in sorted(glob.glob(os.path.join(args.output_dir, "*.json"))):
+            rows = export_file(path, args.export_dir, args.export_format)
+            if rows is not None:
+                print(f"Exported {rows} rows from {path} to {args.export_dir}")
+    if not all(result["ok"] for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
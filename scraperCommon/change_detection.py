@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+from scraperCommon.output import write_json_atomic
+
+"""
+cheap "has this source changed?" checks for scrapers that are polled often
+
+a fingerprint file next to each output keeps, per named probe (a listing page, a
+result table, a CSV export), the ETag / Last-Modified validators and a content hash
+from the last successful run. a probe is unchanged when the server answers a
+conditional GET with 304, or when the hash of what it returns matches. fingerprints
+are staged with update() and only written by save(), once the output is safely on disk
+"""
+class ChangeTracker:
+    def __init__(self, path):
+        self.path = path
+        self.fingerprints = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.fingerprints = json.load(f)
+
+    def conditional_headers(self, name):
+        fingerprint = self.fingerprints.get(name, {})
+        headers = {}
+        if fingerprint.get("etag"):
+            headers["If-None-Match"] = fingerprint["etag"]
+        if fingerprint.get("last_modified"):
+            headers["If-Modified-Since"] = fingerprint["last_modified"]
+        return headers
+
+    """
+    GETs a probe URL, conditionally on its stored validators unless conditional is False;
+    deliberately bypasses the response cache, which would hide changes
+    """
+    def get(self, session, name, url, conditional=True, **kwargs):
+        headers = dict(kwargs.pop("headers", None) or {})
+        if conditional:
+            headers.update(self.conditional_headers(name))
+        return session.get(url, headers=headers, **kwargs)
+
+    # True when a probe's response is a 304 or its content (or a hash computed while
+    # streaming it) matches the last run
+    def unchanged(self, name, response=None, content=None, sha256=None):
+        if response is not None and response.status_code == 304:
+            return True
+        if content is not None:
+            sha256 = content_hash(content)
+        stored = self.fingerprints.get(name, {}).get("sha256")
+        return sha256 is not None and stored == sha256
+
+    def update(self, name, response=None, content=None, sha256=None):
+        fingerprint = dict(self.fingerprints.get(name, {}))
+        if response is not None and response.status_code != 304:
+            fingerprint["etag"] = response.headers.get("ETag")
+            fingerprint["last_modified"] = response.headers.get("Last-Modified")
+        if content is not None:
+            sha256 = content_hash(content)
+        if sha256 is not None:
+            fingerprint["sha256"] = sha256
+        fingerprint["checked_at"] = timestamp()
+        self.fingerprints[name] = fingerprint
+
+    def save(self):
+        write_json_atomic(self.path, self.fingerprints)
+
+"""
+sha256 of raw bytes or text, or of any JSON-serializable value (records, lists of records)
+"""
+def content_hash(content):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    elif not isinstance(content, bytes):
+        content = json.dumps(content, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+def timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+# fingerprint and change log locations for a scraper output file
+def fingerprint_path(output_file):
+    return f"{os.path.splitext(output_file)[0]}.fingerprint.json"
+
+def changelog_path(output_file):
+    return os.path.join(os.path.dirname(output_file) or ".", "changes.jsonl")
+
+# records from a previous run's output, or [] if there is none
+def load_records(output_file):
+    if not os.path.exists(output_file):
+        return []
+    with open(output_file) as f:
+        return json.load(f)
+
+"""
+diffs a fresh scrape against the previous output one record at a time
+
+only a hash per previous record is kept, so a large source can be streamed through
+add(); changes lists {"change": "added" | "changed", "key", "record"} entries and
+removed() reports previous keys the scrape never produced (meaningful for full scrapes)
+"""
+class RecordDiff:
+    def __init__(self, previous, key):
+        self.key = key
+        self.previous = {}
+        for record in previous:
+            self.previous.setdefault(key(record), content_hash(record))
+        self.seen = set()
+        self.changes = []
+
+    # returns the change recorded for this record, or None if it is unchanged (or a repeat)
+    def add(self, record):
+        key = self.key(record)
+        if key in self.seen:
+            return None
+        self.seen.add(key)
+        if key not in self.previous:
+            change = "added"
+        elif self.previous[key] != content_hash(record):
+            change = "changed"
+        else:
+            return None
+        self.changes.append({"change": change, "key": key, "record": record})
+        return change
+
+    def removed(self):
+        return [{"change": "removed", "key": key} for key in self.previous if key not in self.seen]
+
+"""
+merges a partial scrape (e.g. only the newest listing page) into the previous output:
+changed records are replaced in place and added ones go before (prepend) or after
+the previous records; returns (merged records, changes)
+"""
+def merge_records(previous, scraped, key, prepend=False):
+    diff = RecordDiff(previous, key)
+    replaced = {}
+    added = []
+    for record in scraped:
+        change = diff.add(record)
+        if change == "changed":
+            replaced[key(record)] = record
+        elif change == "added":
+            added.append(record)
+
+    kept = [replaced.get(key(record), record) for record in previous]
+    merged = added + kept if prepend else kept + added
+    return merged, diff.changes
+
+_changelog_lock = threading.Lock() # scrapers may log from several threads of one run
+
+"""
+appends one line per change to the shared change log, stamped with the source and time
+"""
+def append_changes(path, source, changes):
+    if not changes:
+        return
+    detected_at = timestamp()
+    lines = "".join(json.dumps({"detected_at": detected_at, "source": source, **change}) + "\n" for change in changes)
+    with _changelog_lock:
+        with open(path, "a") as f:
+            f.write(lines)
+
+# one-line summary like "2 added, 1 changed"
+def summarize_changes(changes):
+    counts = {}
+    for change in changes:
+        counts[change["change"]] = counts.get(change["change"], 0) + 1
+    return ", ".join(f"{count} {kind}" for kind, count in counts.items()) or "no changes"
@@ -0,0 +1,197 @@
+import argparse
+import glob
+import os
+import time
+from collections import Counter
+from datetime import date
+
+from scraperCommon.change_detection import load_records
+from scraperCommon.policy_index import identify_source, normalize_record
+
+"""
+columnar export of the scraper outputs, as Parquet or Arrow IPC datasets
+
+every output (LegiScan bills, NY/CA/TX executive orders) is mapped through the
+policy index normalizers into one table: state, source, doc_type, session and
+author are dictionary-encoded, so a session name repeated over thousands of bills
+is stored once per file, and the texts / amendments / supplements / tags are list
+columns instead of nested JSON. datasets are hive-partitioned by state and session
+(state=WA/session=2025-2026%20Regular%20Session/legiscan-0.parquet), so filters on
+either only open the matching files, and reads go through memory-mapped files
+
+pyarrow is optional: it is only imported when a dataset is written or read
+"""
+
+# --format name -> (pyarrow dataset format, file extension)
+FORMATS = {"parquet": ("parquet", "parquet"), "arrow": ("ipc", "arrow")}
+PARQUET_COMPRESSION = "zstd"  # Arrow IPC files stay uncompressed so memory-mapped reads are zero-copy
+PARTITION_COLUMNS = ("state", "session")
+DATASET_DIR = "policy_dataset"
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.dataset  # noqa: F401
+        import pyarrow.fs  # noqa: F401
+    except ImportError:
+        raise RuntimeError("Columnar exports need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+def table_schema(pa):
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    strings = pa.list_(pa.string())
+    return pa.schema([
+        ("state", dictionary),
+        ("source", dictionary),
+        ("doc_type", dictionary),
+        ("session", dictionary),
+        ("key", pa.string()),
+        ("number", pa.string()),
+        ("title", pa.string()),
+        ("date", pa.date32()),
+        ("author", dictionary),
+        ("passed", pa.bool_()),
+        ("url", pa.string()),
+        ("texts", strings),
+        ("amendments", strings),
+        ("supplements", strings),
+        ("tags", strings),
+    ])
+
+"""
+builds an Arrow table from one output's raw records; bills keep their texts,
+amendments and supplements lists, executive orders have their PDF link as the one text
+"""
+def records_table(records, source, state):
+    pa = import_pyarrow()
+    schema = table_schema(pa)
+    columns = {name: [] for name in schema.names}
+    seen = set()
+    for record in records:
+        doc = normalize_record(record, source, state)
+        if not doc["key"] or doc["key"] in seen: # same rule as the policy index
+            continue
+        seen.add(doc["key"])
+        for name in ("state", "source", "doc_type", "session", "key", "number", "title", "author", "url", "tags"):
+            columns[name].append(doc[name])
+        columns["date"].append(date.fromisoformat(doc["date"]) if doc["date"] else None)
+        columns["passed"].append(None if doc["passed"] is None else bool(doc["passed"]))
+        if source == "legiscan":
+            for name in ("texts", "amendments", "supplements"):
+                columns[name].append([url for url in record.get(name) or [] if url])
+        else:
+            columns["texts"].append(doc["urls"])
+            columns["amendments"].append([])
+            columns["supplements"].append([])
+    return pa.Table.from_pydict(columns, schema=schema)
+
+def partitioning(pa):
+    return pa.dataset.partitioning(pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]), flavor="hive")
+
+# deletes a previous export of one output, and any partition folders that leaves empty
+def remove_output_files(dataset_dir, source, state, extension):
+    state_dir = os.path.join(dataset_dir, f"state={state}")
+    for path in glob.glob(os.path.join(state_dir, "*", f"{source}-*.{extension}")):
+        os.remove(path)
+    for folder in glob.glob(os.path.join(state_dir, "*")):
+        if os.path.isdir(folder) and not os.listdir(folder):
+            os.rmdir(folder)
+
+"""
+writes one output's records into the dataset, replacing that output's previous export
+but leaving other sources in the same partitions alone; returns the number of rows
+"""
+def export_records(records, source, state, dataset_dir=DATASET_DIR, format="parquet"):
+    pa = import_pyarrow()
+    dataset_format, extension = FORMATS[format]
+    table = records_table(records, source, state)
+    remove_output_files(dataset_dir, source, state, extension)
+    if dataset_format == "parquet":
+        file_options = pa.dataset.ParquetFileFormat().make_write_options(compression=PARQUET_COMPRESSION)
+    else:
+        file_options = pa.dataset.IpcFileFormat().make_write_options(compression=None)
+    pa.dataset.write_dataset(
+        table, dataset_dir, format=dataset_format, partitioning=partitioning(pa), file_options=file_options,
+        basename_template=f"{source}-{{i}}.{extension}", existing_data_behavior="overwrite_or_ignore",
+    )
+    return table.num_rows
+
+"""
+exports one scraper output file; returns the number of rows, or None for files that
+aren't scraper outputs (fingerprints, checkpoints, ...)
+"""
+def export_file(path, dataset_dir=DATASET_DIR, format="parquet"):
+    source, state = identify_source(path)
+    if not source:
+        return None
+    return export_records(load_records(path), source, state, dataset_dir, format)
+
+"""
+opens an exported dataset lazily over memory-mapped files; partition columns come
+back dictionary-encoded like the rest
+"""
+def open_dataset(dataset_dir=DATASET_DIR, format="parquet"):
+    pa = import_pyarrow()
+    return pa.dataset.dataset(
+        dataset_dir, format=FORMATS[format][0],
+        partitioning=pa.dataset.HivePartitioning.discover(infer_dictionary=True),
+        filesystem=pa.fs.LocalFileSystem(use_mmap=True),
+    )
+
+"""
+reads the selected columns of the matching rows into an Arrow table; state and
+session filters prune whole partitions before any file is opened
+"""
+def read_table(dataset_dir=DATASET_DIR, format="parquet", columns=None, state=None, session=None, source=None, doc_type=None):
+    pa = import_pyarrow()
+    expression = None
+    for column, value in (("state", state), ("session", session), ("source", source), ("doc_type", doc_type)):
+        if value is not None:
+            condition = pa.dataset.field(column) == value
+            expression = condition if expression is None else expression & condition
+    return open_dataset(dataset_dir, format).to_table(columns=columns, filter=expression)
+
+# [(state, session, source, row count)], from the partition and source columns alone
+def summarize(table):
+    counts = Counter(zip(*(table[column].to_pylist() for column in ("state", "session", "source"))))
+    return sorted(
+        ((state, session, source, count) for (state, session, source), count in counts.items()),
+        key=lambda row: tuple(value or "" for value in row[:3]),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Export scraper outputs to a partitioned Parquet/Arrow dataset.")
+    parser.add_argument("--dataset", default=DATASET_DIR, help="dataset directory")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="parquet")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="write scraper output JSON files into the dataset")
+    export.add_argument("outputs", nargs="+", help="scraper output JSON files")
+
+    summary = subparsers.add_parser("summary", help="print row counts per state, session and source")
+    summary.add_argument("--state")
+    summary.add_argument("--session")
+    summary.add_argument("--source")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        for path in args.outputs:
+            rows = export_file(path, args.dataset, args.format)
+            if rows is None:
+                print(f"Skipping {path}: not a scraper output")
+            else:
+                print(f"Exported {rows} rows from {path}")
+        return
+
+    started = time.perf_counter()
+    table = read_table(args.dataset, args.format, columns=["state", "session", "source"],
+                       state=args.state, session=args.session, source=args.source)
+    elapsed = (time.perf_counter() - started) * 1000
+    for state, session, source, count in summarize(table):
+        print(f"{state:<4}{source:<12}{session or '-':<32}{count:>7}")
+    print(f"{table.num_rows} rows in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+"""
+content-addressed document store shared by all scrapers
+
+blobs live at <root>/blobs/<first two hex chars>/<sha256>.pdf, so identical bytes
+reached through different URLs are stored once. an SQLite index maps each URL to
+its blob hash along with the ETag / Last-Modified validators from the last fetch,
+which lets repeat runs send conditional GETs and skip unchanged documents.
+"""
+class DocumentStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        os.makedirs(os.path.join(root, "partial"), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                size INTEGER,
+                fetched_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS urls_sha256 ON urls (sha256)")
+        self.conn.commit()
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, "blobs", sha256[:2], f"{sha256}.pdf")
+
+    # stable per-URL location for an in-progress download, so partial files can be resumed
+    def partial_path(self, url):
+        return os.path.join(self.root, "partial", hashlib.sha1(url.encode()).hexdigest() + ".part")
+
+    # returns the index entry for a URL as a dict, or None if it was never stored
+    def lookup(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT sha256, etag, last_modified, content_type, size, fetched_at FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        keys = ("sha256", "etag", "last_modified", "content_type", "size", "fetched_at")
+        return dict(zip(keys, row))
+
+    # returns the blob path holding a URL's current content, or None
+    def path_for(self, url):
+        entry = self.lookup(url)
+        if entry and os.path.exists(self.blob_path(entry["sha256"])):
+            return self.blob_path(entry["sha256"])
+        return None
+
+    # If-None-Match / If-Modified-Since headers for a URL we already hold
+    def conditional_headers(self, url):
+        entry = self.lookup(url)
+        if not entry or not os.path.exists(self.blob_path(entry["sha256"])):
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    # moves a finished file into the store under its SHA-256 (dropping it if those bytes
+    # are already stored) and points the URL at it; returns the hash
+    def add_file(self, url, path, etag=None, last_modified=None, content_type=None):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        size = os.path.getsize(path)
+
+        blob_path = self.blob_path(sha256)
+        if os.path.exists(blob_path):
+            os.remove(path) # same bytes already stored under another URL or an earlier fetch
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(path, blob_path)
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO urls (url, sha256, etag, last_modified, content_type, size, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, sha256, etag, last_modified, content_type, size, time.time()),
+            )
+            self.conn.commit()
+        return sha256
+
+    # records that a conditional GET confirmed the stored copy is still current
+    def mark_unchanged(self, url):
+        with self.lock:
+            self.conn.execute("UPDATE urls SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scraperCommon.http import configure_limits, DEFAULT_MAX_CONNECTIONS, DEFAULT_PER_HOST
+
+"""
+base class for scraper plugins
+
+subclasses set a unique `name` and a one-line `description`, and implement
+run(options), where options is the parsed command line (output_dir plus any
+scraper-specific settings). run is ordinary blocking code: its requests go
+through the process-wide shared session, and the runtime executes every
+plugin on a worker thread of one asyncio event loop.
+"""
+class Scraper:
+    name = None
+    description = ""
+
+    def run(self, options):
+        raise NotImplementedError
+
+# plugin name -> Scraper subclass, filled in by @register
+REGISTRY = {}
+
+"""
+class decorator that adds a Scraper subclass to the registry
+"""
+def register(cls):
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} needs a name to be registered")
+    if cls.name in REGISTRY and REGISTRY[cls.name] is not cls:
+        raise ValueError(f"Duplicate scraper name: {cls.name}")
+    REGISTRY[cls.name] = cls
+    return cls
+
+"""
+runs one plugin on the event loop's thread pool and reports how it went
+"""
+async def run_plugin(name, options):
+    started = time.monotonic()
+    try:
+        await asyncio.to_thread(REGISTRY[name]().run, options)
+        return {"name": name, "ok": True, "elapsed": time.monotonic() - started}
+    except Exception as e:
+        print(f"Scraper {name} failed: {e!r}")
+        return {"name": name, "ok": False, "error": repr(e), "elapsed": time.monotonic() - started}
+
+"""
+runs the named plugins concurrently on the running event loop; a failing plugin
+does not stop the others
+"""
+async def run_plugins(names, options):
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max(1, len(names)), thread_name_prefix="scraper"))
+    return await asyncio.gather(*(run_plugin(name, options) for name in names))
+
+"""
+entry point for running several scrapers at once under shared limits:
+max_connections requests in flight overall and per_host against any one site
+"""
+def run_scrapers(names, options, max_connections=DEFAULT_MAX_CONNECTIONS, per_host=DEFAULT_PER_HOST):
+    unknown = [name for name in names if name not in REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown scrapers: {', '.join(unknown)}")
+    configure_limits(max_connections, per_host)
+    return asyncio.run(run_plugins(names, options))
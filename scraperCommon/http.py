@@ -0,0 +1,106 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scraperCommon.metrics import record_http
+
+# browser identity sent by every scraper, since several state sites block the default python-requests agent
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/115.0.0.0 Safari/537.36"
+)
+
+# full header set used for HTTP requests to mimic a browser and avoid bot blocking
+BROWSER_HEADERS = {
+    "User-Agent": BROWSER_USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept": "text/html,application/pdf,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Referer": "https://www.google.com/"
+}
+
+DEFAULT_MAX_CONNECTIONS = 32  # requests in flight across all scrapers sharing a session
+DEFAULT_PER_HOST = 8  # requests in flight against any single host
+
+"""
+creates a requests session whose connection pool is large enough for every worker
+"""
+def make_session(pool_size=8, headers=None):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+"""
+caps how many requests may be in flight to any single host at once;
+use as `with host_limiter.limit(url): ...`
+"""
+class HostLimiter:
+    def __init__(self, per_host=2):
+        self.per_host = per_host
+        self.semaphores = {}
+        self.lock = threading.Lock()
+
+    def limit(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self.semaphores[host]
+
+"""
+requests session that enforces a global and a per-host cap on requests in flight,
+however many threads share it (for streamed responses the cap covers the request
+up to the response headers); every request's latency, status and size is recorded in
+the shared metrics
+"""
+class LimitedSession(requests.Session):
+    def __init__(self, max_connections=DEFAULT_MAX_CONNECTIONS, per_host=DEFAULT_PER_HOST):
+        super().__init__()
+        self.headers["User-Agent"] = BROWSER_USER_AGENT
+        self.set_limits(max_connections, per_host)
+
+    # resizes the limits and the connection pool; meant to be called before a run starts
+    def set_limits(self, max_connections, per_host):
+        self.global_limit = threading.BoundedSemaphore(max_connections)
+        self.host_limiter = HostLimiter(per_host)
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        with self.global_limit, self.host_limiter.limit(url):
+            start = time.perf_counter()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.RequestException as e:
+                record_http(method, url, time.perf_counter() - start, error=e)
+                raise
+            record_http(method, url, time.perf_counter() - start, response)
+            return response
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+"""
+returns the process-wide LimitedSession; every scraper module fetches through it,
+so scrapers running side by side share one connection pool and one set of limits
+"""
+def shared_session():
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = LimitedSession()
+        return _shared_session
+
+"""
+sets the global and per-host limits on the shared session
+"""
+def configure_limits(max_connections=DEFAULT_MAX_CONNECTIONS, per_host=DEFAULT_PER_HOST):
+    shared_session().set_limits(max_connections, per_host)
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from scraperCommon.metrics import count, host_of
+
+# query parameters left out of cache keys so secrets never end up in them
+EXCLUDED_PARAMS = {"key", "api_key", "apikey"}
+
+DEFAULT_TTL = 24 * 60 * 60  # seconds a cached response stays fresh
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # cache size before least recently used entries are evicted
+
+"""
+raised in offline mode when a request has no cached response; subclasses
+ConnectionError so callers' existing network error handling applies
+"""
+class OfflineCacheMiss(requests.ConnectionError):
+    pass
+
+"""
+builds a cache key from the method, URL and normalized params: query parameters
+from the URL and from params are merged and sorted, and the API key is dropped
+"""
+def cache_key(method, url, params=None):
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(k, str(v)) for k, v in (params or {}).items() if v is not None]
+    query = sorted((k, v) for k, v in query if k.lower() not in EXCLUDED_PARAMS)
+    normalized = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+    return hashlib.sha256(f"{method.upper()} {normalized}".encode()).hexdigest()
+
+"""
+on-disk cache backend: one file per entry (a JSON metadata line followed by the body)
+entries older than ttl are stale; when the cache grows past max_bytes the least
+recently used entries (by file mtime, refreshed on every hit) are evicted
+any object with the same get/set methods can be plugged in instead
+"""
+class FileCache:
+    def __init__(self, root, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self.size = sum(os.path.getsize(path) for path in self._entry_paths())
+
+    def _entry_paths(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".entry"):
+                    yield os.path.join(dirpath, filename)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.entry")
+
+    # returns (meta, body) for a key, or None if missing or older than ttl;
+    # ignore_ttl serves stale entries, which offline replay relies on
+    def get(self, key, ignore_ttl=False):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if not ignore_ttl and time.time() - meta["stored_at"] > self.ttl:
+            return None
+        try:
+            os.utime(path) # marks the entry as recently used for LRU eviction
+        except OSError:
+            pass
+        return meta, body
+
+    def set(self, key, meta, body):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = dict(meta, stored_at=time.time())
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n" + body)
+
+        with self.lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.size += os.path.getsize(path) - old_size
+            if self.size > self.max_bytes:
+                self._evict()
+
+    # deletes least recently used entries until the cache is back under max_bytes
+    def _evict(self):
+        entries = sorted((os.path.getmtime(path), os.path.getsize(path), path) for path in self._entry_paths())
+        for _, size, path in entries:
+            if self.size <= self.max_bytes:
+                break
+            os.remove(path)
+            self.size -= size
+
+_default_cache = None
+_default_cache_loaded = False
+
+"""
+returns the process-wide cache configured from the environment, or None when
+SCRAPER_CACHE_DIR is unset; read lazily so values from .env files are picked up
+"""
+def default_cache():
+    global _default_cache, _default_cache_loaded
+    if not _default_cache_loaded:
+        cache_dir = os.getenv("SCRAPER_CACHE_DIR")
+        if cache_dir:
+            _default_cache = FileCache(
+                cache_dir,
+                ttl=float(os.getenv("SCRAPER_CACHE_TTL", DEFAULT_TTL)),
+                max_bytes=int(os.getenv("SCRAPER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            )
+        _default_cache_loaded = True
+    return _default_cache
+
+"""
+cache mode from SCRAPER_CACHE_MODE:
+  "on" (default) serves fresh entries and fetches on a miss,
+  "offline" replays cached responses regardless of age and never touches the network,
+  "refresh" always fetches and overwrites the cache
+"""
+def cache_mode():
+    return os.getenv("SCRAPER_CACHE_MODE", "on").lower()
+
+# rebuilds a requests.Response from a cache entry so callers can treat it like a live one
+def _to_response(meta, body):
+    response = requests.Response()
+    response.status_code = meta["status_code"]
+    response.headers = CaseInsensitiveDict(meta["headers"])
+    response.url = meta["url"]
+    response.reason = "OK"
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response.from_cache = True
+    return response
+
+"""
+GET through the response cache; behaves like session.get(url, params=params, **kwargs)
+on_miss runs before any network request (e.g. a rate limiter's acquire), so cache hits
+cost no API budget; cacheable decides whether a fetched response is stored
+(by default any 200 response)
+"""
+def cached_get(session, url, params=None, cache=None, on_miss=None, cacheable=None, **kwargs):
+    cache = cache or default_cache()
+    mode = cache_mode()
+    if cache is None:
+        if on_miss:
+            on_miss()
+        return session.get(url, params=params, **kwargs)
+
+    key = cache_key("GET", url, params)
+    if mode != "refresh":
+        entry = cache.get(key, ignore_ttl=(mode == "offline"))
+        if entry:
+            count("http_cache_requests_total", result="hit", host=host_of(url))
+            return _to_response(*entry)
+    if mode == "offline":
+        count("http_cache_requests_total", result="offline_miss", host=host_of(url))
+        raise OfflineCacheMiss(f"No cached response for {url} (offline mode)")
+    count("http_cache_requests_total", result="miss", host=host_of(url))
+
+    if on_miss:
+        on_miss()
+    response = session.get(url, params=params, **kwargs)
+    response.from_cache = False
+    if cacheable(response) if cacheable else response.status_code == 200:
+        meta = {"status_code": response.status_code, "headers": dict(response.headers), "url": response.url}
+        cache.set(key, meta, response.content)
+    return response
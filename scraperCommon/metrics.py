@@ -0,0 +1,223 @@
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+# latency histogram bucket bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# query parameters masked in log lines, since request errors quote the full URL
+SECRET_PARAMS = re.compile(r"([?&](?:key|api_key|apikey)=)[^&\s\"']+", re.IGNORECASE)
+
+"""
+process-wide metrics shared by every scraper
+
+counters and latency histograms are keyed by name plus a sorted set of labels
+(host, op, result, error class, ...). everything is thread-safe, since fetches run
+on worker threads; snapshot() returns plain data and prometheus_text() renders it
+in the Prometheus text exposition format
+"""
+class Registry:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "counters": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self.counters.items())],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), "sum": round(h["sum"], 6), "count": h["count"],
+                     "buckets": dict(zip(map(str, self.buckets), h["buckets"]))}
+                    for (name, labels), h in sorted(self.histograms.items())
+                ],
+            }
+
+    def prometheus_text(self):
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{format_labels(labels)} {value}")
+            for (name, labels), h in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                for bound, cumulative in zip(self.buckets, h["buckets"]):
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {h['count']}")
+                lines.append(f"{name}_sum{format_labels(labels)} {h['sum']:.6f}")
+                lines.append(f"{name}_count{format_labels(labels)} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+METRICS = Registry()
+
+_log_file = None
+_log_lock = threading.Lock()
+
+"""
+writes one structured JSON log line per event when JSON logging is on
+(SCRAPER_LOG_JSON=<path>, or "-" for stderr) with API keys masked; a no-op otherwise
+"""
+def log_event(event, **fields):
+    if _log_file is None:
+        return
+    line = json.dumps({"ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), "event": event, **fields}, default=str)
+    line = SECRET_PARAMS.sub(r"\1***", line)
+    with _log_lock:
+        _log_file.write(line + "\n")
+        _log_file.flush()
+
+def count(name, value=1, **labels):
+    METRICS.count(name, value, **labels)
+
+def observe(name, seconds, **labels):
+    METRICS.observe(name, seconds, **labels)
+
+# error class label for an exception, e.g. "ConnectionError" or "HTTPError"
+def error_class(error):
+    return type(error).__name__
+
+def host_of(url):
+    return urlparse(url).netloc.lower() or "unknown"
+
+"""
+times a block: records <name>_seconds with the given labels, counts <name>_total by
+result ("ok" or "error") and <name>_errors_total by error class, and logs the call;
+extra fields set on the yielded dict (bytes, status, retries, ...) go into the log line
+use as `with timed("legiscan_request", op="getBill") as call: ...`
+"""
+@contextmanager
+def timed(name, **labels):
+    call = {}
+    start = time.perf_counter()
+    try:
+        yield call
+    except BaseException as e:
+        elapsed = time.perf_counter() - start
+        METRICS.observe(f"{name}_seconds", elapsed, **labels)
+        METRICS.count(f"{name}_total", result="error", **labels)
+        METRICS.count(f"{name}_errors_total", error=error_class(e), **labels)
+        log_event(name, seconds=round(elapsed, 6), result="error", error=error_class(e), message=str(e), **labels, **call)
+        raise
+    elapsed = time.perf_counter() - start
+    result = call.pop("result", "ok")
+    METRICS.observe(f"{name}_seconds", elapsed, **labels)
+    METRICS.count(f"{name}_total", result=result, **labels)
+    log_event(name, seconds=round(elapsed, 6), result=result, **labels, **call)
+
+"""
+records one HTTP exchange made through a shared session: latency by host and status
+class, response bytes, and error classes for requests that never got a response
+"""
+def record_http(method, url, seconds, response=None, error=None):
+    host = host_of(url)
+    if error is not None:
+        METRICS.observe("http_request_seconds", seconds, host=host, status="error")
+        METRICS.count("http_errors_total", host=host, error=error_class(error))
+        log_event("http_request", method=method, url=url, host=host, seconds=round(seconds, 6), error=error_class(error), message=str(error))
+        return
+    status = f"{response.status_code // 100}xx"
+    METRICS.observe("http_request_seconds", seconds, host=host, status=status)
+    METRICS.count("http_responses_total", host=host, code=response.status_code)
+    if response.status_code == 429:
+        METRICS.count("http_rate_limited_total", host=host)
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit():
+        METRICS.count("http_response_bytes_total", int(length), host=host)
+    log_event("http_request", method=method, url=url, host=host, seconds=round(seconds, 6), status=response.status_code,
+              bytes=int(length) if length and length.isdigit() else None)
+
+def write_json(path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(METRICS.snapshot(), f, indent=2)
+    os.replace(tmp_path, path)
+
+# writes the Prometheus text format, e.g. for node_exporter's textfile collector
+def write_prometheus(path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(METRICS.prometheus_text())
+    os.replace(tmp_path, path)
+
+"""
+serves /metrics in the Prometheus text format on a background thread; returns the server
+"""
+def start_exporter(port, host="127.0.0.1"):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # only needed when exporting
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = METRICS.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+"""
+turns on the outputs: JSON logs to log_json ("-" for stderr), a metrics file written
+at exit (Prometheus text, or a JSON snapshot for a .json path) and a /metrics exporter
+"""
+def configure(log_json=None, metrics_file=None, exporter_port=None):
+    global _log_file
+    if log_json:
+        _log_file = sys.stderr if log_json == "-" else open(log_json, "a")
+    if metrics_file:
+        atexit.register(write_json if metrics_file.endswith(".json") else write_prometheus, metrics_file)
+    if exporter_port:
+        start_exporter(int(exporter_port))
+
+# the same outputs from SCRAPER_LOG_JSON, SCRAPER_METRICS_FILE and SCRAPER_METRICS_PORT,
+# so the standalone scripts can be instrumented without code changes
+configure(os.getenv("SCRAPER_LOG_JSON"), os.getenv("SCRAPER_METRICS_FILE"), os.getenv("SCRAPER_METRICS_PORT"))
@@ -0,0 +1,131 @@
+import json
+import os
+
+"""
+writes JSON to a temp file next to the target and renames it into place,
+so readers never see a half-written output file
+"""
+def write_json_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+"""
+crash-safe streaming output shared by all scrapers
+
+records are appended to a JSON Lines file as soon as they are produced, so memory
+stays flat and a crash loses at most the unit of work in progress. scrapers call
+mark_done(key) after finishing a unit of work (a bill, a listing page, ...); the
+checkpoint file remembers each key with the data file's size at that moment.
+
+if a previous run died, opening the sink again resumes it: records written after
+the last checkpoint are truncated away and is_done() reports the finished keys so
+the scraper can skip them. finish() writes the usual pretty-printed JSON array
+and removes the JSON Lines and checkpoint files, so the next run starts fresh.
+"""
+class JsonLinesSink:
+    def __init__(self, path, resume=True):
+        self.path = path
+        self.checkpoint_path = f"{path}.done"
+        self.done = set()
+        self.count = 0
+
+        if not resume:
+            self._remove_files()
+        offset = self._load_checkpoint()
+        if offset or self.done:
+            print(f"Resuming from {self.path}: {len(self.done)} units of work already done.")
+
+        self.file = open(self.path, "ab")
+        self.file.truncate(offset) # drops records from work that never reached a checkpoint
+        self.file.seek(offset)
+        self.count = self._count_lines(offset)
+        self.checkpoint = open(self.checkpoint_path, "a")
+
+    # reads finished keys and returns the data-file offset of the last complete checkpoint
+    def _load_checkpoint(self):
+        offset = 0
+        if not os.path.exists(self.checkpoint_path):
+            return offset
+        with open(self.checkpoint_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break # partial line from a crash mid-write
+                self.done.add(entry["key"])
+                offset = entry["offset"]
+        return offset
+
+    def _count_lines(self, offset):
+        if not offset:
+            return 0
+        with open(self.path, "rb") as f:
+            return f.read(offset).count(b"\n")
+
+    def _remove_files(self):
+        for path in (self.path, self.checkpoint_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # appends one record and flushes it to the OS right away
+    def write(self, record):
+        self.file.write(json.dumps(record).encode("utf-8") + b"\n")
+        self.file.flush()
+        self.count += 1
+
+    # records that every record for `key` has been written
+    def mark_done(self, key):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.checkpoint.write(json.dumps({"key": key, "offset": self.file.tell()}) + "\n")
+        self.checkpoint.flush()
+        self.done.add(key)
+
+    def is_done(self, key):
+        return key in self.done
+
+    # yields the records written so far, one at a time
+    def records(self):
+        self.file.flush()
+        with open(self.path, "rb") as f:
+            for line in f:
+                yield json.loads(line)
+
+    # streams the records into a pretty-printed JSON array identical to json.dump(..., indent=2)
+    def export_json(self, json_path):
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, "w") as out:
+            out.write("[")
+            for i, record in enumerate(self.records()):
+                body = json.dumps(record, indent=2).replace("\n", "\n  ")
+                out.write(("," if i else "") + "\n  " + body)
+            out.write("\n]" if self.count else "]")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, json_path)
+
+    # exports the final JSON file and clears the resume state
+    def finish(self, json_path):
+        self.export_json(json_path)
+        self.discard()
+
+    # closes the sink and clears the resume state without exporting anything
+    def discard(self):
+        self.close()
+        self._remove_files()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            self.checkpoint.close()
+
+    def __enter__(self):
+        return self
+
+    # on errors the files are kept so the next run can resume
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
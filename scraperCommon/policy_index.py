@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+"""
+normalized, queryable index over every scraper output
+
+each output file (LegiScan bills, NY/CA/TX executive orders) is mapped into one
+compact record schema and loaded into SQLite with indexes on state, source, date
+and tag plus an FTS5 table over title and tags, so filters like
+"CA executive orders tagged Sales tax since 2020" don't need to load any JSON
+"""
+
+# output file name -> (source, state); LegiScan outputs carry the state in the name
+SOURCE_PATTERNS = (
+    (re.compile(r"^ny_past_executive_orders\.json$"), "ny_past_eo", "NY"),
+    (re.compile(r"^ny_executive_orders\.json$"), "ny_eo", "NY"),
+    (re.compile(r"^ca_executive_orders\.json$"), "ca_eo", "CA"),
+    (re.compile(r"^tx_executive_orders\.json$"), "tx_eo", "TX"),
+    (re.compile(r"^([A-Z]{2})_legiscan_documents\.json$"), "legiscan", None),
+)
+
+# CA "4/14/1966", TX "01/31/2025(89th R.S.)", NY "July 8, 2015"
+SLASH_DATE = re.compile(r"^\s*(\d{1,2})/(\d{1,2})/(\d{4})")
+NY_NUMBER = re.compile(r"(?:No\.?\s*|^)(\d+(?:\.\d+)*)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    source TEXT NOT NULL,
+    doc_type TEXT NOT NULL,
+    number TEXT,
+    title TEXT,
+    date TEXT,
+    session TEXT,
+    author TEXT,
+    passed INTEGER,
+    url TEXT,
+    urls TEXT NOT NULL,
+    UNIQUE (source, state, key)
+);
+CREATE INDEX IF NOT EXISTS documents_state_source_date ON documents (state, source, date);
+CREATE INDEX IF NOT EXISTS documents_source_date ON documents (source, date);
+CREATE INDEX IF NOT EXISTS documents_date ON documents (date);
+CREATE TABLE IF NOT EXISTS tags (
+    doc_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (tag, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_doc ON tags (doc_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (title, tags);
+"""
+
+COLUMNS = ("id", "state", "source", "doc_type", "number", "title", "date", "session", "author", "passed", "url", "urls")
+
+"""
+parses the date formats used across the sources into an ISO YYYY-MM-DD string, or None
+"""
+def normalize_date(value):
+    if not value:
+        return None
+    match = SLASH_DATE.match(value)
+    if match:
+        month, day, year = (int(part) for part in match.groups())
+        try:
+            return datetime(year, month, day).date().isoformat()
+        except ValueError:
+            return None
+    try:
+        return datetime.strptime(value.strip(), "%B %d, %Y").date().isoformat()
+    except ValueError:
+        return None
+
+# returns (source, state) for a scraper output file, or (None, None) if the name isn't recognized
+def identify_source(path):
+    name = os.path.basename(path)
+    for pattern, source, state in SOURCE_PATTERNS:
+        match = pattern.match(name)
+        if match:
+            return source, state or match.group(1)
+    return None, None
+
+def split_tags(tags):
+    return [tag.strip() for tag in (tags or "").split(",") if tag.strip()]
+
+def normalize_ny(record):
+    title = record.get("title") or ""
+    match = NY_NUMBER.search(title)
+    return {
+        "doc_type": "executive_order",
+        "number": match.group(1) if match else None,
+        "title": title,
+        "date": normalize_date(record.get("date")),
+        "url": record.get("pdf_link"),
+    }
+
+def normalize_ca(record):
+    return {
+        "doc_type": "executive_order",
+        "number": record.get("executive_order_number") or None,
+        "title": None,
+        "date": normalize_date(record.get("date_signed")) or normalize_date(record.get("date_filed")),
+        "author": record.get("governor") or None,
+        "url": record.get("pdf_link") or None,
+        "tags": split_tags(record.get("tags")),
+    }
+
+def normalize_tx(record):
+    return {
+        "doc_type": "executive_order",
+        "number": record.get("document_number") or None,
+        "title": record.get("title"),
+        "date": normalize_date(record.get("date")),
+        "session": record.get("session") or None,
+        "author": record.get("author") or None,
+        "url": record.get("pdf_url") or None,
+    }
+
+def normalize_legiscan(record):
+    urls = [url for field in ("texts", "amendments", "supplements") for url in record.get(field) or [] if url]
+    return {
+        "doc_type": "bill",
+        "number": record.get("bill_number"),
+        "title": record.get("title"),
+        "session": record.get("session"),
+        "passed": record.get("passed"),
+        "url": urls[0] if urls else None,
+        "urls": urls,
+    }
+
+NORMALIZERS = {
+    "ny_eo": normalize_ny,
+    "ny_past_eo": normalize_ny,
+    "ca_eo": normalize_ca,
+    "tx_eo": normalize_tx,
+    "legiscan": normalize_legiscan,
+}
+
+"""
+maps one raw scraper record into the shared schema
+"""
+def normalize_record(record, source, state):
+    doc = dict.fromkeys(("number", "title", "date", "session", "author", "passed", "url"))
+    doc.update({"tags": [], "urls": []})
+    doc.update(NORMALIZERS[source](record))
+    if not doc["urls"] and doc["url"]:
+        doc["urls"] = [doc["url"]]
+    if doc["passed"] is not None:
+        doc["passed"] = 1 if doc["passed"] else 0
+    doc["state"] = state
+    doc["source"] = source
+    # bills are unique per session, executive orders by their link (or number when there is none)
+    if source == "legiscan":
+        doc["key"] = f"{doc['session']}|{doc['number']}"
+    else:
+        doc["key"] = doc["url"] or doc["number"] or doc["title"]
+    return doc
+
+"""
+SQLite-backed index of normalized policy documents
+"""
+class PolicyIndex:
+    def __init__(self, path="policy_index.sqlite"):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    """
+    replaces every document from one scraper output file; returns the number indexed
+    """
+    def load_file(self, path):
+        source, state = identify_source(path)
+        if not source:
+            raise ValueError(f"Unrecognized scraper output: {path}")
+        with open(path) as f:
+            records = json.load(f)
+
+        with self.conn:
+            stale = [row[0] for row in self.conn.execute(
+                "SELECT id FROM documents WHERE source = ? AND state = ?", (source, state)
+            )]
+            self.conn.executemany("DELETE FROM documents_fts WHERE rowid = ?", ((doc_id,) for doc_id in stale))
+            self.conn.execute("DELETE FROM documents WHERE source = ? AND state = ?", (source, state))
+
+            count = 0
+            for record in records:
+                doc = normalize_record(record, source, state)
+                if not doc["key"]:
+                    continue
+                cursor = self.conn.execute(
+                    """
+                    INSERT OR IGNORE INTO documents
+                        (key, state, source, doc_type, number, title, date, session, author, passed, url, urls)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (doc["key"], state, source, doc["doc_type"], doc["number"], doc["title"], doc["date"],
+                     doc["session"], doc["author"], doc["passed"], doc["url"], json.dumps(doc["urls"])),
+                )
+                if not cursor.rowcount: # duplicate of a record already loaded from this file
+                    continue
+                doc_id = cursor.lastrowid
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO tags (doc_id, tag) VALUES (?, ?)", ((doc_id, tag) for tag in doc["tags"])
+                )
+                self.conn.execute(
+                    "INSERT INTO documents_fts (rowid, title, tags) VALUES (?, ?, ?)",
+                    (doc_id, doc["title"] or "", " ".join(doc["tags"])),
+                )
+                count += 1
+        return count
+
+    """
+    returns matching documents as dicts, newest first
+    filters: state / source / doc_type exact, tag (case-insensitive, exact tag), since / until
+    as ISO dates (inclusive), passed, and text as an FTS5 query over title and tags
+    """
+    def query(self, state=None, source=None, doc_type=None, tag=None, since=None, until=None,
+              passed=None, text=None, limit=None):
+        clauses = []
+        params = []
+        for column, value in (("state", state), ("source", source), ("doc_type", doc_type)):
+            if value is not None:
+                clauses.append(f"d.{column} = ?")
+                params.append(value)
+        if tag is not None:
+            clauses.append("d.id IN (SELECT doc_id FROM tags WHERE tag = ?)")
+            params.append(tag)
+        if since is not None:
+            clauses.append("d.date >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("d.date <= ?")
+            params.append(until)
+        if passed is not None:
+            clauses.append("d.passed = ?")
+            params.append(1 if passed else 0)
+        if text is not None:
+            clauses.append("d.id IN (SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?)")
+            params.append(text)
+
+        sql = f"SELECT {', '.join('d.' + column for column in COLUMNS)} FROM documents d"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY d.date IS NULL, d.date DESC, d.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self.conn.execute(sql, params).fetchall()
+        results = []
+        for row in rows:
+            doc = dict(row)
+            doc["urls"] = json.loads(doc["urls"])
+            doc["tags"] = self.tags_for(doc["id"])
+            results.append(doc)
+        return results
+
+    def tags_for(self, doc_id):
+        return [row[0] for row in self.conn.execute("SELECT tag FROM tags WHERE doc_id = ? ORDER BY tag", (doc_id,))]
+
+    # document counts per (state, source)
+    def stats(self):
+        return self.conn.execute(
+            "SELECT state, source, COUNT(*) FROM documents GROUP BY state, source ORDER BY state, source"
+        ).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the normalized policy index.")
+    parser.add_argument("--db", default="policy_index.sqlite", help="index database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="load scraper output JSON files into the index")
+    build.add_argument("outputs", nargs="+", help="scraper output JSON files")
+
+    query = subparsers.add_parser("query", help="print documents matching the filters")
+    query.add_argument("--state")
+    query.add_argument("--source", choices=sorted(NORMALIZERS))
+    query.add_argument("--doc-type", choices=("bill", "executive_order"))
+    query.add_argument("--tag")
+    query.add_argument("--since", help="ISO date, e.g. 2020-01-01")
+    query.add_argument("--until", help="ISO date")
+    query.add_argument("--text", help="full-text query over titles and tags")
+    query.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    with PolicyIndex(args.db) as index:
+        if args.command == "build":
+            for path in args.outputs:
+                print(f"Indexed {index.load_file(path)} documents from {path}")
+            for state, source, count in index.stats():
+                print(f"  {state} {source}: {count}")
+            return
+
+        started = time.perf_counter()
+        results = index.query(args.state, args.source, args.doc_type, args.tag, args.since, args.until,
+                              text=args.text, limit=args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        for doc in results:
+            print(json.dumps(doc))
+        print(f"{len(results)} documents in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+import time
+
+"""
+token bucket shared by all worker threads so the combined request rate
+never exceeds `rate` calls per second, while allowing short bursts of `capacity`
+"""
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    # blocks until a token is available, then consumes it
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+"""
+token bucket shared by every process that opens the same SQLite file (for example
+the workers draining one work queue), so an API budget holds however many workers
+run; the bucket is kept as the time its next token is free, and processes reserve
+tokens under SQLite's write lock
+"""
+class SharedTokenBucket:
+    def __init__(self, path, name, rate, capacity=None):
+        self.name = name
+        self.interval = 1 / float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, rate))
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (name TEXT PRIMARY KEY, next_free REAL NOT NULL)")
+
+    # reserves a token if one is free; returns 0, or the seconds to wait before trying again
+    def _reserve(self):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self.conn.execute("SELECT next_free FROM rate_limits WHERE name = ?", (self.name,)).fetchone()
+                # an idle bucket refills to capacity, i.e. next_free never lags more than a full burst behind now
+                next_free = max(row[0] if row else now, now - (self.capacity - 1) * self.interval)
+                wait = next_free - now
+                if wait <= 0:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO rate_limits (name, next_free) VALUES (?, ?)", (self.name, next_free + self.interval)
+                    )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return max(0, wait)
+
+    # blocks until a token is available, then consumes it
+    def acquire(self):
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            time.sleep(wait)
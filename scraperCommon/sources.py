@@ -0,0 +1,28 @@
+import json
+
+# fields holding document URLs across the scraper outputs:
+# LegiScan records keep lists of URLs, the executive order scrapers a single link
+URL_LIST_FIELDS = ("texts", "amendments", "supplements")
+URL_FIELDS = ("pdf_link", "pdf_url")
+
+"""
+yields every document URL referenced by a list of scraper records
+"""
+def document_urls(records):
+    for record in records:
+        for field in URL_LIST_FIELDS:
+            yield from (url for url in record.get(field) or [] if url)
+        for field in URL_FIELDS:
+            if record.get(field):
+                yield record[field]
+
+"""
+reads scraper output JSON files and returns their document URLs, deduplicated in first-seen order
+"""
+def load_document_urls(json_paths):
+    urls = {}
+    for path in json_paths:
+        with open(path) as f:
+            for url in document_urls(json.load(f)):
+                urls.setdefault(url, None)
+    return list(urls)
@@ -0,0 +1,304 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+LEASE_SECONDS = 300  # a task whose worker stops renewing its lease for this long is handed out again
+MAX_ATTEMPTS = 5  # leases per task before it is marked failed
+RETRY_BACKOFF = 10  # seconds before the first retry, doubled after each further failure
+POLL_INTERVAL = 2  # seconds an idle worker waits before looking for work again
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, kind, available_at);
+"""
+INSERT_TASK = "INSERT OR IGNORE INTO tasks (kind, key, payload, available_at, updated_at) VALUES (?, ?, ?, ?, ?)"
+# queues a finished task again from scratch; pending and leased ones are left alone
+RESET_TASK = """
+UPDATE tasks SET status = 'pending', attempts = 0, available_at = ?, payload = ?,
+    lease_owner = NULL, lease_expires = NULL, result = NULL, error = NULL, updated_at = ?
+WHERE kind = ? AND key = ? AND status IN ('done', 'failed')
+"""
+
+"""
+shared task queue in one SQLite file, for spreading a run over many worker processes
+
+tasks are (kind, key) pairs with a JSON payload; enqueueing the same pair again is a
+no-op, so seeding and handlers that discover work (sessions -> bills, page 0 -> pages)
+can re-enqueue freely. lease() hands each ready task to exactly one worker for
+lease_seconds; a worker that dies simply lets its lease run out and the task is handed
+out again. failures are retried with exponential backoff up to max_attempts. complete()
+is idempotent: the first completion wins and later ones (say, from a worker whose lease
+had expired) report False
+
+every worker opens its own WorkQueue on the same file; any number of processes on one
+machine can share it (or machines, over a file system with working POSIX locks)
+"""
+class WorkQueue:
+    def __init__(self, path, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS, retry_backoff=RETRY_BACKOFF):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lock = threading.Lock() # the heartbeat thread shares the worker's connection
+        # autocommit mode, so lease() can take the write lock up front with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    """
+    adds a task unless (kind, key) is already queued; with reset, a finished (done or
+    failed) task is queued again from scratch, e.g. listing pages that must be re-read
+    on every run. returns True if the task is (again) pending
+    """
+    def enqueue(self, kind, key, payload=None, reset=False):
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(INSERT_TASK, (kind, str(key), json.dumps(payload or {}), now, now))
+            if cursor.rowcount or not reset:
+                return bool(cursor.rowcount)
+            cursor = self.conn.execute(RESET_TASK, (now, json.dumps(payload or {}), now, kind, str(key)))
+            return bool(cursor.rowcount)
+
+    # enqueues (key, payload) pairs of one kind in a single transaction, with reset as in
+    # enqueue(); returns how many were new (or queued again)
+    def enqueue_many(self, kind, items, reset=False):
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for key, payload in items:
+                    cursor = self.conn.execute(INSERT_TASK, (kind, str(key), json.dumps(payload or {}), now, now))
+                    if not cursor.rowcount and reset:
+                        cursor = self.conn.execute(RESET_TASK, (now, json.dumps(payload or {}), now, kind, str(key)))
+                    added += cursor.rowcount
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return added
+
+    """
+    claims up to limit ready tasks (pending and due, or leased with an expired lease)
+    for owner, oldest first, optionally only of the given kinds; returns them as dicts
+    with id, kind, key, payload and attempts. tasks whose expired lease was their last
+    attempt are marked failed instead
+    """
+    def lease(self, owner, kinds=None, limit=1):
+        now = time.time()
+        kind_filter = f"AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    f"""
+                    UPDATE tasks SET status = 'failed', error = 'lease expired', lease_owner = NULL, updated_at = ?
+                    WHERE status = 'leased' AND lease_expires < ? AND attempts >= ? {kind_filter}
+                    """,
+                    (now, now, self.max_attempts, *(kinds or ())),
+                )
+                rows = self.conn.execute(
+                    f"""
+                    SELECT id, kind, key, payload, attempts FROM tasks
+                    WHERE ((status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?))
+                        {kind_filter}
+                    ORDER BY id LIMIT ?
+                    """,
+                    (now, now, *(kinds or ()), limit),
+                ).fetchall()
+                self.conn.executemany(
+                    """
+                    UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ?,
+                        updated_at = ?
+                    WHERE id = ?
+                    """,
+                    ((owner, now + self.lease_seconds, now, row["id"]) for row in rows),
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return [
+            {"id": row["id"], "kind": row["kind"], "key": row["key"], "payload": json.loads(row["payload"]),
+             "attempts": row["attempts"] + 1, "owner": owner}
+            for row in rows
+        ]
+
+    # renews the lease on a task still being worked on; False if it is no longer ours
+    def extend(self, task):
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, now, task["id"], task["owner"]),
+            )
+        return bool(cursor.rowcount)
+
+    # marks a task done with its (JSON-serializable) result; False if it was already completed
+    def complete(self, task, result=None):
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                """
+                UPDATE tasks SET status = 'done', result = ?, error = NULL, lease_owner = NULL, lease_expires = NULL,
+                    updated_at = ?
+                WHERE id = ? AND status != 'done'
+                """,
+                (json.dumps(result), now, task["id"]),
+            )
+        return bool(cursor.rowcount)
+
+    """
+    records a failed attempt: the task goes back to pending after a backoff, or is marked
+    failed once it has used up max_attempts; ignored if another worker holds it by now
+    """
+    def fail(self, task, error):
+        now = time.time()
+        if task["attempts"] >= self.max_attempts:
+            status, available_at = "failed", now
+        else:
+            status, available_at = "pending", now + self.retry_backoff * 2 ** (task["attempts"] - 1)
+        with self.lock:
+            self.conn.execute(
+                """
+                UPDATE tasks SET status = ?, available_at = ?, error = ?, lease_owner = NULL, lease_expires = NULL,
+                    updated_at = ?
+                WHERE id = ? AND status = 'leased' AND lease_owner = ?
+                """,
+                (status, available_at, str(error), now, task["id"], task["owner"]),
+            )
+        return status
+
+    # queues failed tasks (of one kind, or all) for another max_attempts tries; returns how many
+    def retry_failed(self, kind=None):
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                f"""
+                UPDATE tasks SET status = 'pending', attempts = 0, available_at = ?, updated_at = ?
+                WHERE status = 'failed' {'AND kind = ?' if kind else ''}
+                """,
+                (now, now, *([kind] if kind else [])),
+            )
+        return cursor.rowcount
+
+    # True while any task (of the given kinds) is pending or leased
+    def has_open_tasks(self, kinds=None):
+        kind_filter = f"AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT 1 FROM tasks WHERE status IN ('pending', 'leased') {kind_filter} LIMIT 1", tuple(kinds or ())
+            ).fetchone()
+        return row is not None
+
+    # task counts per (kind, status)
+    def counts(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status ORDER BY kind, status"
+            ).fetchall()
+
+    # yields (key, payload, result) for every completed task of a kind, in the order they were enqueued
+    def results(self, kind):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, payload, result FROM tasks WHERE kind = ? AND status = 'done' ORDER BY id", (kind,)
+            ).fetchall()
+        for row in rows:
+            yield row["key"], json.loads(row["payload"]), json.loads(row["result"])
+
+    # (kind, key, error) for every task that gave up
+    def failures(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT kind, key, error FROM tasks WHERE status = 'failed' ORDER BY kind, id"
+            ).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+"""
+keeps renewing a task's lease on a background thread while its handler runs, so
+slow tasks (a large download, a page render) are not handed to a second worker
+"""
+class LeaseHeartbeat:
+    def __init__(self, queue, task):
+        self.queue = queue
+        self.task = task
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self.stopped.wait(self.queue.lease_seconds / 3):
+            if not self.queue.extend(self.task):
+                return
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stopped.set()
+        self.thread.join()
+
+"""
+drains the queue: leases tasks of the given kinds (all kinds with a handler by default),
+runs handlers[kind](payload) and completes the task with its return value, or records
+the exception as a failed attempt. exits once no task it could run is pending or
+leased, unless wait is set, in which case it keeps polling for new work
+returns {"done": n, "retried": n, "failed": n, "duplicate": n} for this worker
+"""
+def run_worker(queue, handlers, kinds=None, worker_id=None, wait=False, poll_interval=POLL_INTERVAL):
+    kinds = list(kinds or handlers)
+    worker_id = worker_id or default_worker_id()
+    stats = {"done": 0, "retried": 0, "failed": 0, "duplicate": 0}
+
+    while True:
+        tasks = queue.lease(worker_id, kinds)
+        if not tasks:
+            if not wait and not queue.has_open_tasks(kinds):
+                return stats
+            time.sleep(poll_interval) # the rest is leased elsewhere or backing off
+            continue
+
+        task = tasks[0]
+        try:
+            with LeaseHeartbeat(queue, task):
+                result = handlers[task["kind"]](task["payload"])
+        except Exception as e:
+            status = queue.fail(task, f"{type(e).__name__}: {e}")
+            stats["failed" if status == "failed" else "retried"] += 1
+            print(f"[{worker_id}] {task['kind']} {task['key']} failed (attempt {task['attempts']}): {e}")
+            continue
+
+        if queue.complete(task, result):
+            stats["done"] += 1
+        else: # another worker finished it after our lease lapsed; handlers are idempotent, so nothing to undo
+            stats["duplicate"] += 1
@@ -0,0 +1,31 @@
+import argparse
+
+import run_queue
+from scraperCommon.work_queue import WorkQueue
+
+# stands in for render_service.BackgroundRenderer, writing the page URL instead of a PDF
+class FakeRenderer:
+    def __init__(self):
+        self.rendered = []
+
+    def render(self, url, output_path):
+        self.rendered.append(url)
+        with open(output_path, "w") as f:
+            f.write(url)
+        return True
+
+def test_same_named_pages_are_rendered_separately(tmp_path):
+    options = argparse.Namespace(queue=str(tmp_path / "queue.sqlite"), rps=100, store=None, output_dir=str(tmp_path))
+    urls = [
+        "https://www.nysenate.gov/legislation/bills/2023/S1/download",
+        "https://www.nysenate.gov/legislation/bills/2023/S2/download",
+    ]
+    renderer = FakeRenderer()
+    with WorkQueue(options.queue) as queue:
+        document = run_queue.make_handlers(queue, options, renderer)["document"]
+        paths = [document({"url": url})["path"] for url in urls]
+        assert document({"url": urls[0]})["path"] == paths[0] # already rendered: not rendered again
+
+    assert paths[0] != paths[1]
+    assert renderer.rendered == [url[:-len("/download")] for url in urls]
+    assert [open(path).read() for path in paths] == renderer.rendered